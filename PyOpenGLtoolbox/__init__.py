@@ -34,37 +34,52 @@ from PyOpenGLtoolbox.geometry import draw_vertex_list, draw_vertex_list_create_n
     draw_vertex_list_textured
 
 # noinspection PyUnresolvedReferences
-from PyOpenGLtoolbox.figures import VBObject, load_obj_model, load_gmsh_model, load_gmsh_model, create_circle, \
-    create_cone, create_cube, create_cube_solid, create_cube_textured, create_diamond, create_dodecahedron, \
-    create_icosahedron, create_octahedron, create_pyramid, create_pyramid_textured, create_pyramid_vbo, create_sphere, \
-    create_teapot, create_teapot_textured, create_tetrahedron, create_tetrahedron_vbo, create_torus
+from PyOpenGLtoolbox.figures import VBObject, VertexFormat, create_interleaved_vbo, load_obj_model, iter_obj_model, \
+    load_gmsh_model, weld_vertices, create_circle, create_cone, create_cube, create_cube_solid, create_cube_textured, \
+    create_diamond, create_dodecahedron, create_icosahedron, create_octahedron, create_pyramid, \
+    create_pyramid_textured, create_pyramid_vbo, create_sphere, create_teapot, create_teapot_textured, \
+    create_tetrahedron, create_tetrahedron_vbo, create_torus, FIGURES_NORMAL_WEIGHT_ANGLE, FIGURES_NORMAL_WEIGHT_AREA, \
+    FIGURES_NORMAL_WEIGHT_UNIFORM, InstancedRenderer
 
 # noinspection PyUnresolvedReferences
 from PyOpenGLtoolbox.materials import material_black_plastic, material_black_rubber, material_brass, material_bronze, \
     material_chrome, material_copper, material_cyan_plastic, material_cyan_rubber, material_emerald, material_gold, \
     material_green_plastic, material_green_rubber, material_jade, material_natural_white, material_obsidian, \
     material_pearl, material_red_plastic, material_red_rubber, material_ruby, material_silver, material_turquoise, \
-    material_white_plastic, material_white_rubber, material_yellow_plastic, material_yellow_rubber
+    material_white_plastic, material_white_rubber, material_yellow_plastic, material_yellow_rubber, get_material
 
 # noinspection PyUnresolvedReferences
-from PyOpenGLtoolbox.mathlib import Point3, Point2, Vector3
+from PyOpenGLtoolbox.mathlib import Point3, Point2, Vector3, Vector3Array, Point3Array, Matrix4, Quaternion, \
+    MatrixStack, trs_matrices, compose_matrices, invert_matrices, transpose_matrices, transform_points, \
+    slerp_quaternions
 
 # noinspection PyUnresolvedReferences
-from PyOpenGLtoolbox.opengl import init_gl, init_light, clear_buffer, reshape_window_perspective, is_light_enabled
+from PyOpenGLtoolbox.opengl import init_gl, init_light, clear_buffer, reshape_window_perspective, is_light_enabled, \
+    Projection
 
 # noinspection PyUnresolvedReferences
 from PyOpenGLtoolbox.particles import Particle, PARTICLES_OPERATOR_ADD, PARTICLES_OPERATOR_AND, \
     PARTICLES_OPERATOR_DIFF, PARTICLES_OPERATOR_DIV, PARTICLES_OPERATOR_MOD, PARTICLES_OPERATOR_MULT, \
-    PARTICLES_OPERATOR_OR, PARTICLES_OPERATOR_POW, PARTICLES_OPERATOR_XOR
+    PARTICLES_OPERATOR_OR, PARTICLES_OPERATOR_POW, PARTICLES_OPERATOR_XOR, ParticleSystem, ParticleView
 
 # noinspection PyUnresolvedReferences
 from PyOpenGLtoolbox.pyopengl import init_pygame, load_image
 
 # noinspection PyUnresolvedReferences
-from PyOpenGLtoolbox.shader import load_shader, Shader, ShaderProgram
+from PyOpenGLtoolbox.shader import load_shader, Shader, ShaderProgram, ShaderCache, get_shader_cache, \
+    set_shader_cache, preprocess, get_source_hash, ShaderVariantCache, ShaderWatcher, get_shader_watcher, \
+    reload_shaders, compile_programs
 
 # noinspection PyUnresolvedReferences
-from PyOpenGLtoolbox.textures import load_texture
+from PyOpenGLtoolbox.textures import load_texture, create_mipmaps, TEXTURES_FILTER_ANISOTROPIC, \
+    TEXTURES_FILTER_BILINEAR, TEXTURES_FILTER_LINEAR, TEXTURES_FILTER_TRILINEAR, TEXTURES_MIPMAP_BOX, \
+    TEXTURES_MIPMAP_GPU, TEXTURES_MIPMAP_LANCZOS, TEXTURES_MIPMAP_NONE, TextureHandle, TextureManager, TextureLoader, \
+    load_textures_async, get_texture_loader, upload_textures, StreamingTexture, AtlasRegion, TextureAtlas, \
+    save_texture, convert_texture, TEXTURES_COMPRESSION_BC1, TEXTURES_COMPRESSION_BC3, TEXTURES_COMPRESSION_NONE
+
+# noinspection PyUnresolvedReferences
+from PyOpenGLtoolbox.uniforms import std140_dtype, std140_glsl, UniformBuffer, CameraBuffer, LightBuffer, \
+    MaterialBuffer, bind_uniform_buffers
 
 # noinspection PyUnresolvedReferences
 from PyOpenGLtoolbox.utils import create_axes, draw_text
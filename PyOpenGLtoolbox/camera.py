@@ -26,9 +26,9 @@ SOFTWARE.
 """
 
 # Library imports
-from OpenGL.GL import glLoadIdentity as _glLoadIdentity
-from OpenGL.GLU import gluLookAt as _gluLookAt
+from OpenGL.GL import glLoadMatrixf as _glLoadMatrixf
 from PyOpenGLtoolbox.mathlib import _cos, _sin, _xyz_to_spr, _spr_to_xyz
+from PyOpenGLtoolbox.mathlib import Matrix4 as _Matrix4
 from PyOpenGLtoolbox.mathlib import Point3 as _Point3
 from PyOpenGLtoolbox.mathlib import Vector3 as _Vector3
 import math as _math
@@ -54,15 +54,26 @@ class _Camera(object):
 
     def __init__(self):
         """
-        Void constructor.
+        Constructor.
         """
-        pass
+        self._projection = None
+        self._version = 0
+        self._view = None
+        self._view_gl = None
+
+    def _set_dirty(self):
+        """
+        Invalidate the cached view matrix, must be called by every camera mutator.
+        """
+        self._view = None
+        self._version += 1
 
     def place(self):
         """
-        Place camera in world.
+        Place camera in world, loads the cached view matrix.
         """
-        pass
+        self.get_view_matrix()
+        _glLoadMatrixf(self._view_gl)
 
     def get_view(self):
         """
@@ -71,11 +82,63 @@ class _Camera(object):
         :return:
         :rtype: array
         """
-        return self._look_at(
-            _np.array([self.get_pos_x(), self.get_pos_y(), self.get_pos_z()]),
-            _np.array([self.get_center_x(), self.get_center_y(), self.get_center_z()]),
-            _np.array([self.get_up_x(), self.get_up_y(), self.get_up_z()])
-        )
+        return self.get_view_matrix()
+
+    def get_view_matrix(self):
+        """
+        Return the read-only row-major float32 (4,4) view matrix, it is only computed
+        again if the camera has changed.
+
+        :return: View matrix
+        :rtype: numpy.ndarray
+        """
+        if self._view is None:
+            view = _Matrix4.look_at(self.convert_to_xyz(),
+                                    (self.get_center_x(), self.get_center_y(), self.get_center_z()),
+                                    (self.get_up_x(), self.get_up_y(), self.get_up_z()))
+            self._view_gl = view.export_to_gl()
+            self._view = view.get_array().astype(_np.float32)
+            self._view.setflags(write=False)
+        return self._view
+
+    def get_version(self):
+        """
+        Return the camera version, it changes every time the view matrix changes.
+
+        :return: Version
+        :rtype: int
+        """
+        return self._version
+
+    def set_projection(self, projection):
+        """
+        Set the camera projection.
+
+        :param projection: Projection
+        :type projection: PyOpenGLtoolbox.opengl.Projection
+        """
+        self._projection = projection
+
+    def get_projection(self):
+        """
+        Return the camera projection.
+
+        :return: Projection
+        :rtype: PyOpenGLtoolbox.opengl.Projection
+        """
+        return self._projection
+
+    def get_projection_matrix(self):
+        """
+        Return the read-only row-major float32 (4,4) projection matrix of the camera
+        projection, see Projection.get_version to track its changes.
+
+        :return: Projection matrix
+        :rtype: numpy.ndarray
+        """
+        if self._projection is None:
+            raise Exception('Camera has no projection, use set_projection')
+        return self._projection.get_projection_matrix()
 
     def get_pos_x(self):
         """
@@ -316,21 +379,7 @@ class _Camera(object):
         :param _up:
         :return:
         """
-        forward = (_at - _eye)
-        forward /= _np.linalg.norm(forward)
-
-        side = _np.cross(forward, _up)
-        side /= _np.linalg.norm(side)
-
-        new_up = _np.cross(side, forward)
-        new_up /= _np.linalg.norm(new_up)
-
-        return _np.array([
-            [side[0], side[1], side[2], -_np.dot(side, _eye)],
-            [new_up[0], new_up[1], new_up[2], -_np.dot(new_up, _eye)],
-            [-forward[0], -forward[1], -forward[2], _np.dot(forward, _eye)],
-            [0, 0, 0, 1]
-        ], dtype=_np.float32)
+        return _Matrix4.look_at(_eye, _at, _up).get_array().astype(_np.float32)
 
 
 class CameraXYZ(_Camera):
@@ -366,16 +415,6 @@ class CameraXYZ(_Camera):
         # Normalize vector
         self._up.normalize()
 
-    def place(self):
-        """
-        Place camera in world.
-        """
-        _glLoadIdentity()
-        _gluLookAt(self._pos.get_x(), self._pos.get_y(), self._pos.get_z(),
-                   self._center.get_x(), self._center.get_y(),
-                   self._center.get_z(), self._up.get_x(), self._up.get_y(),
-                   self._up.get_z())
-
     def get_pos_x(self):
         """
         Return x position.
@@ -464,6 +503,7 @@ class CameraXYZ(_Camera):
         :type direction: float, int
         """
         self._pos.set_x(self._pos.get_x() + self._cameraVel.get_x() * direction)
+        self._set_dirty()
 
     def move_y(self, direction=_CAMERA_POSITIVE):
         """
@@ -473,6 +513,7 @@ class CameraXYZ(_Camera):
         :type direction: float, int
         """
         self._pos.set_y(self._pos.get_y() + self._cameraVel.get_y() * direction)
+        self._set_dirty()
 
     def move_z(self, direction=_CAMERA_POSITIVE):
         """
@@ -482,6 +523,7 @@ class CameraXYZ(_Camera):
         :type direction: float, int
         """
         self._pos.set_z(self._pos.get_z() + self._cameraVel.get_z() * direction)
+        self._set_dirty()
 
     def set_vel_move_x(self, vel):
         """
@@ -531,6 +573,7 @@ class CameraXYZ(_Camera):
         self._pos.set_x(x)
         self._pos.set_y(y)
         self._pos.set_z(z)
+        self._set_dirty()
 
     def rotate_y(self, angle):
         """
@@ -545,6 +588,7 @@ class CameraXYZ(_Camera):
         self._pos.set_x(x)
         self._pos.set_y(y)
         self._pos.set_z(z)
+        self._set_dirty()
 
     def rotate_z(self, angle):
         """
@@ -559,6 +603,7 @@ class CameraXYZ(_Camera):
         self._pos.set_x(x)
         self._pos.set_y(y)
         self._pos.set_z(z)
+        self._set_dirty()
 
     def move_center_x(self, dist):
         """
@@ -568,6 +613,7 @@ class CameraXYZ(_Camera):
         :type dist: float, int
         """
         self._center.set_x(self._center.get_x() + dist)
+        self._set_dirty()
 
     def move_center_y(self, dist):
         """
@@ -577,6 +623,7 @@ class CameraXYZ(_Camera):
         :type dist: float, int
         """
         self._center.set_y(self._center.get_y() + dist)
+        self._set_dirty()
 
     def move_center_z(self, dist):
         """
@@ -588,6 +635,7 @@ class CameraXYZ(_Camera):
         if (_CAMERA_CENTER_LIMIT_Z_DOWN <= self._center.get_z() and dist < 0) or \
                 (self._center.get_z() <= _CAMERA_CENTER_LIMIT_Z_UP and dist > 0):
             self._center.set_z(self._center.get_z() + dist)
+            self._set_dirty()
 
     def rotate_center_z(self, angle):
         """
@@ -599,30 +647,35 @@ class CameraXYZ(_Camera):
         rad = _math.sqrt(self._pos.get_x() ** 2 + self._pos.get_y() ** 2)
         self._pos.set_x(rad * _cos(self._angle))
         self._pos.set_y(rad * _sin(self._angle))
+        self._set_dirty()
 
     def far(self):
         """
         Camera zoom-out.
         """
-        (rad, phi, theta) = _xyz_to_spr(*self._pos.export_to_list())
-        rad += self._radVel
-        (x, y, z) = _spr_to_xyz(rad, phi, theta)
-        self._pos.set_x(x)
-        self._pos.set_y(y)
-        self._pos.set_z(z)
+        self._zoom(self._radVel)
 
     def close(self):
         """
         Camera zoom-in.
         """
-        (rad, phi, theta) = _xyz_to_spr(*self._pos.export_to_list())
-        rad -= self._radVel
-        if rad < 0:  # Radius cannot be less than zero
+        self._zoom(-self._radVel)
+
+    def _zoom(self, dist):
+        """
+        Move the camera position along its radius.
+
+        :param dist: Radial distance
+        :type dist: float, int
+        """
+        rad = self._pos.get_module()
+        if rad + dist < 0:  # Radius cannot be less than zero
             return
-        (x, y, z) = _spr_to_xyz(rad, phi, theta)
-        self._pos.set_x(x)
-        self._pos.set_y(y)
-        self._pos.set_z(z)
+        if rad == 0:
+            self._pos.set_x(dist)
+        else:
+            self._pos *= (rad + dist) / rad
+        self._set_dirty()
 
     def get_name(self):
         """
@@ -685,13 +738,13 @@ class CameraR(_Camera):
             if isinstance(up, _Vector3):
                 if r > 0:
                     if 0 <= phi <= 360 and 0 <= theta <= 180:
-                        self._center = center
+                        self._center = _Point3(center.get_x(), center.get_y(), center.get_z())
                         self._name = 'unnamed'
                         self._phi = phi
                         self._r = r
                         self._rvel = _CAMERA_DEFAULT_RVEL
                         self._theta = theta
-                        self._up = up
+                        self._up = up.clone()
                     else:
                         raise Exception('Phi angle must be between 0 and 360 degrees, theta must be between 0 and 180')
                 else:
@@ -713,18 +766,6 @@ class CameraR(_Camera):
         else:
             raise Exception('Velocity must be greater than zero')
 
-    def place(self):
-        """
-        Place camera in world.
-        """
-        _glLoadIdentity()
-        _gluLookAt(self._r * _sin(self._theta) * _cos(self._phi),
-                   self._r * _sin(self._theta) * _sin(self._phi),
-                   self._r * _cos(self._theta),
-                   self._center.get_x(), self._center.get_y(), self._center.get_z(),
-                   self._up.get_x(), self._up.get_y(),
-                   self._up.get_z())
-
     def get_pos_x(self):
         """
         Return x position.
@@ -830,6 +871,7 @@ class CameraR(_Camera):
         Camera zoom-out.
         """
         self._r += self._rvel
+        self._set_dirty()
 
     def close(self):
         """
@@ -839,6 +881,7 @@ class CameraR(_Camera):
         if r < 0:  # Radius cannot be less than zero
             return
         self._r = r
+        self._set_dirty()
 
     def rotate_phi(self, angle):
         """
@@ -848,6 +891,7 @@ class CameraR(_Camera):
         :type angle: float, int
         """
         self._phi = (self._phi + angle) % 360
+        self._set_dirty()
 
     def rotate_theta(self, angle):
         """
@@ -857,6 +901,7 @@ class CameraR(_Camera):
         :type angle: float, int
         """
         self._theta = min(max(self._theta + angle, _CAMERA_MIN_THETA_VALUE), 180)
+        self._set_dirty()
 
     def convert_to_xyz(self):
         """
@@ -884,6 +929,7 @@ class CameraR(_Camera):
         :type dist: float, int
         """
         self._center.set_x(self._center.get_x() + dist)
+        self._set_dirty()
 
     def move_center_y(self, dist):
         """
@@ -893,6 +939,7 @@ class CameraR(_Camera):
         :type dist: float, int
         """
         self._center.set_y(self._center.get_y() + dist)
+        self._set_dirty()
 
     def move_center_z(self, dist):
         """
@@ -904,6 +951,7 @@ class CameraR(_Camera):
         if (_CAMERA_CENTER_LIMIT_Z_DOWN <= self._center.get_z() and dist < 0) or \
                 (self._center.get_z() <= _CAMERA_CENTER_LIMIT_Z_UP and dist > 0):
             self._center.set_z(self._center.get_z() + dist)
+            self._set_dirty()
 
     def get_name(self):
         """
@@ -940,6 +988,7 @@ class CameraR(_Camera):
         :type r: float, int
         """
         self._r = r
+        self._set_dirty()
 
     def get_phi(self):
         """
@@ -958,6 +1007,7 @@ class CameraR(_Camera):
         :type phi: float, int
         """
         self._phi = phi
+        self._set_dirty()
 
     def get_theta(self):
         """
@@ -976,3 +1026,4 @@ class CameraR(_Camera):
         :type theta: float, int
         """
         self._theta = theta
+        self._set_dirty()
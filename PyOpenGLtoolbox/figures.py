@@ -26,43 +26,199 @@ SOFTWARE.
 """
 
 # Library imports
-from math import sqrt as _sqrt
 from math import pi as _pi
 from numpy import array as _array
 from OpenGL.arrays import vbo as _vbo
 from PyOpenGLtoolbox.utils import print_gl_error as _print_gl_error
+from PyOpenGLtoolbox.utils import _get_cache_path, _load_arrays, _save_arrays
 from PyOpenGLtoolbox.geometry import _normal_3_points, draw_vertex_list_create_normal, \
     draw_vertex_list_create_normal_textured
-from PyOpenGLtoolbox.mathlib import Point3, _cos, _sin, Point2
+from PyOpenGLtoolbox.mathlib import Point3, _cos, _sin, Point2, trs_matrices
 
 # noinspection PyPep8Naming
 import OpenGL.GL as _gl
 # noinspection PyPep8Naming
 import OpenGL.GLUT as _glut
+import numpy as _np
+import os as _os
 
 # Constants
+FIGURES_NORMAL_WEIGHT_ANGLE = 0xfa12
+FIGURES_NORMAL_WEIGHT_AREA = 0xfa11
+FIGURES_NORMAL_WEIGHT_UNIFORM = 0xfa10
+_FIGURES_ATTRIBUTE_COLOR = 'color'
+_FIGURES_ATTRIBUTE_NORMAL = 'normal'
+_FIGURES_ATTRIBUTE_POSITION = 'position'
+_FIGURES_ATTRIBUTE_UV = 'uv'
+_FIGURES_ATTRIBUTE_ARRAYS = {
+    _FIGURES_ATTRIBUTE_COLOR: _gl.GL_COLOR_ARRAY,
+    _FIGURES_ATTRIBUTE_NORMAL: _gl.GL_NORMAL_ARRAY,
+    _FIGURES_ATTRIBUTE_POSITION: _gl.GL_VERTEX_ARRAY,
+    _FIGURES_ATTRIBUTE_UV: _gl.GL_TEXTURE_COORD_ARRAY
+}
+_FIGURES_CACHE_VERSION = 1
 _FIGURES_FIGURE_LIST = 0xfa01
 _FIGURES_FIGURE_VBO = 0xfa02
+_FIGURES_INSTANCE_COLOR_LOCATION = 14
+_FIGURES_INSTANCE_DTYPE = _np.dtype([('matrix', _np.float32, (4, 4)), ('color', _np.float32, (4,))])
+_FIGURES_INSTANCE_MATRIX_LOCATION = 10
+_FIGURES_OBJ_CHUNK_SIZE = 4 * 1024 * 1024
+_FIGURES_OBJ_Y_OFFSET = 0.1  # Vertex y-coordinates are moved down when loaded
+_FIGURES_TANGENT_LOCATION = 6
 _FIGURES_ERRS = []
 for i in range(10):
     _FIGURES_ERRS.append(False)
 
 
+class VertexFormat(object):
+    """
+    Layout of the vertex of an interleaved VBO. Each attribute is a float vector stored
+    consecutively in each vertex. The attributes position, normal, uv and color are bound
+    to the fixed-function arrays (gl_Vertex, gl_Normal, gl_MultiTexCoord0, gl_Color), any
+    other attribute (e.g. tangent) is a generic attribute bound to a shader location.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self._attributes = []
+        self._dtype = None
+
+    def add_attribute(self, name, size, location=None):
+        """
+        Add an attribute to the format.
+
+        :param name: Attribute name
+        :param size: Number of components (1-4)
+        :param location: Shader attribute location, required if the attribute is not position, normal, uv or color
+        :type name: basestring
+        :type size: int
+        :type location: int, None
+        """
+        if name in self.get_names():
+            raise Exception('Attribute {0} already exists'.format(name))
+        if size not in (1, 2, 3, 4) or (name == _FIGURES_ATTRIBUTE_NORMAL and size != 3):
+            raise Exception('Invalid size of attribute {0}'.format(name))
+        if name not in _FIGURES_ATTRIBUTE_ARRAYS and location is None:
+            raise Exception('Generic attribute {0} must define a shader location'.format(name))
+        self._attributes.append((name, size, location))
+        self._dtype = None
+
+    def get_names(self):
+        """
+        Return the attribute names.
+
+        :return: Names
+        :rtype: list
+        """
+        return [attr[0] for attr in self._attributes]
+
+    def get_dtype(self):
+        """
+        Return the numpy structured type of a vertex.
+
+        :return: Vertex type
+        :rtype: numpy.dtype
+        """
+        if self._dtype is None:
+            self._dtype = _np.dtype([(name, _np.float32, (size,)) for name, size, _ in self._attributes])
+        return self._dtype
+
+    def get_stride(self):
+        """
+        Return the size of a vertex in bytes.
+
+        :return: Stride
+        :rtype: int
+        """
+        return self.get_dtype().itemsize
+
+    def pack(self, arrays):
+        """
+        Interleave the attribute arrays into a single structured array.
+
+        :param arrays: Attribute arrays by name, each (n,size)
+        :type arrays: dict
+        :return: Interleaved array (n,)
+        :rtype: numpy.ndarray
+        """
+        dtype = self.get_dtype()
+        total = None
+        for name in self.get_names():
+            if name not in arrays:
+                raise Exception('Attribute {0} array is not defined'.format(name))
+            if total is None:
+                total = len(arrays[name])
+            elif len(arrays[name]) != total:
+                raise Exception('Attribute {0} array has an invalid length'.format(name))
+        data = _np.empty(total or 0, dtype=dtype)
+        for name, size, _ in self._attributes:
+            data[name] = _np.asarray(arrays[name], dtype=_np.float32).reshape(-1, size)
+        return data
+
+    def bind(self, buffer):
+        """
+        Enable the attributes and point them to the buffer, the buffer must be bound.
+
+        :param buffer: Interleaved VBO
+        :type buffer: OpenGL.arrays.vbo.VBO
+        """
+        dtype = self.get_dtype()
+        stride = dtype.itemsize
+        for name, size, location in self._attributes:
+            pointer = buffer + dtype.fields[name][1]
+            if name == _FIGURES_ATTRIBUTE_POSITION:
+                _gl.glEnableClientState(_gl.GL_VERTEX_ARRAY)
+                _gl.glVertexPointer(size, _gl.GL_FLOAT, stride, pointer)
+            elif name == _FIGURES_ATTRIBUTE_NORMAL:
+                _gl.glEnableClientState(_gl.GL_NORMAL_ARRAY)
+                _gl.glNormalPointer(_gl.GL_FLOAT, stride, pointer)
+            elif name == _FIGURES_ATTRIBUTE_UV:
+                _gl.glEnableClientState(_gl.GL_TEXTURE_COORD_ARRAY)
+                _gl.glTexCoordPointer(size, _gl.GL_FLOAT, stride, pointer)
+            elif name == _FIGURES_ATTRIBUTE_COLOR:
+                _gl.glEnableClientState(_gl.GL_COLOR_ARRAY)
+                _gl.glColorPointer(size, _gl.GL_FLOAT, stride, pointer)
+            else:
+                _gl.glEnableVertexAttribArray(location)
+                _gl.glVertexAttribPointer(location, size, _gl.GL_FLOAT, _gl.GL_FALSE, stride, pointer)
+
+    def unbind(self):
+        """
+        Disable the attributes.
+        """
+        for name, _, location in self._attributes:
+            if name in _FIGURES_ATTRIBUTE_ARRAYS:
+                _gl.glDisableClientState(_FIGURES_ATTRIBUTE_ARRAYS[name])
+            else:
+                _gl.glDisableVertexAttribArray(location)
+
+
 class VBObject(object):
     """
     VBO object that can load and draw elements using shaders.
     """
 
-    def __init__(self, vertex, fragment, total_vertex, texture=None):
+    def __init__(self, vertex, fragment, total_vertex, texture=None, index=None, vertex_format=None):
         """
         Constructor.
 
+        The object stores positions and normals in two VBOs (vertex and fragment), or, if
+        vertex_format is defined, all the attributes in a single interleaved VBO (vertex),
+        in that case fragment must be None. See create_interleaved_vbo.
+
         :param vertex: Vertex shader
         :param fragment: Fragment shader
         :param total_vertex: Total vertex (int)
         :param texture: Texture list
+        :param index: Triangle index list, if defined the object is drawn with glDrawElements
+        :param vertex_format: Vertex format of an interleaved vertex VBO
+        :type index: list, numpy.ndarray, None
+        :type vertex_format: VertexFormat, None
         """
-        if isinstance(vertex, _vbo.VBO) and isinstance(fragment, _vbo.VBO):
+        if isinstance(vertex, _vbo.VBO) and (isinstance(fragment, _vbo.VBO) or
+                                             (fragment is None and isinstance(vertex_format, VertexFormat))):
             if type(total_vertex) is int:
                 self.vertex = vertex
                 self.fragment = fragment
@@ -72,11 +228,89 @@ class VBObject(object):
                     self.texlen = 0
                 else:
                     self.texlen = len(self.texture)
+                self.index = None
+                self.indexType = None
+                self.totalIndex = 0
+                if index is not None:
+                    index = _get_index_array(index, total_vertex)
+                    self.index = _vbo.VBO(index, target=_gl.GL_ELEMENT_ARRAY_BUFFER)
+                    if index.dtype == _np.uint16:
+                        self.indexType = _gl.GL_UNSIGNED_SHORT
+                    else:
+                        self.indexType = _gl.GL_UNSIGNED_INT
+                    self.totalIndex = len(index)
+                self.vertexFormat = vertex_format
+                self._vao = None
             else:
                 raise Exception('total_vertex must be int type')
         else:
             raise Exception('vertex and fragment must be VBO type (OpenGL.arrays.vbo)')
 
+    def _bind(self):
+        """
+        Bind the buffers and enable the vertex arrays.
+        """
+        if self.vertexFormat is None:
+            self.vertex.bind()
+            _gl.glVertexPointerf(self.vertex)
+            self.fragment.bind()
+            _gl.glNormalPointerf(self.fragment)
+            _gl.glEnableClientState(_gl.GL_VERTEX_ARRAY)
+            _gl.glEnableClientState(_gl.GL_NORMAL_ARRAY)
+        else:
+            self.vertex.bind()
+            self.vertexFormat.bind(self.vertex)
+        if self.index is not None:
+            self.index.bind()
+
+    def _unbind(self):
+        """
+        Disable the vertex arrays and unbind the buffers.
+        """
+        if self.vertexFormat is None:
+            _gl.glDisableClientState(_gl.GL_VERTEX_ARRAY)
+            _gl.glDisableClientState(_gl.GL_NORMAL_ARRAY)
+        else:
+            self.vertexFormat.unbind()
+        if self.index is not None:
+            self.index.unbind()
+        self.vertex.unbind()
+
+    def _get_vao(self):
+        """
+        Return the vertex array object that stores the binding state of the buffers, it is
+        created on the first call. Returns 0 if the context does not support VAOs.
+
+        :return: VAO
+        :rtype: int
+        """
+        if self._vao is None:
+            self._vao = 0
+            if bool(_gl.glGenVertexArrays):
+                # noinspection PyBroadException
+                try:
+                    vao = _gl.glGenVertexArrays(1)
+                    _gl.glBindVertexArray(vao)
+                    self._bind()
+                    _gl.glBindVertexArray(0)
+                    _gl.glBindBuffer(_gl.GL_ARRAY_BUFFER, 0)
+                    _gl.glBindBuffer(_gl.GL_ELEMENT_ARRAY_BUFFER, 0)
+                    self._vao = vao
+                except:
+                    if not _FIGURES_ERRS[9]:
+                        _print_gl_error('OpenGL actual version does not support vertex array objects')
+                    _FIGURES_ERRS[9] = True
+        return self._vao
+
+    def _draw_elements(self):
+        """
+        Draw the triangles of the bound buffers.
+        """
+        if self.index is None:
+            _gl.glDrawArrays(_gl.GL_TRIANGLES, 0, self.totalVertex)
+        else:
+            _gl.glDrawElements(_gl.GL_TRIANGLES, self.totalIndex, self.indexType, None)
+
     def draw(self, pos=None, rgb=None):
         """
         Draw the object.
@@ -86,28 +320,14 @@ class VBObject(object):
         :type pos: list
         :type rgb: list
         """
-
-        if pos is None:
-            pos = [0.0, 0.0, 0.0]
         try:
 
-            # Create new matrix
-            _gl.glPushMatrix()
-
-            # Make bind between vbos and shader program
-            self.vertex.bind()
-            _gl.glVertexPointerf(self.vertex)
-            self.fragment.bind()
-            _gl.glNormalPointerf(self.fragment)
-
-            # Enable vbos
-            _gl.glEnableClientState(_gl.GL_VERTEX_ARRAY)
-            _gl.glEnableClientState(_gl.GL_NORMAL_ARRAY)
-
             # Enable transform
+            if pos is not None:
+                _gl.glPushMatrix()
+                _gl.glTranslate(pos[0], pos[1], pos[2])
             if rgb is not None:
                 _gl.glColor4fv(rgb)
-            _gl.glTranslate(pos[0], pos[1], pos[2])
 
             # Enable textures
             for _i in range(self.texlen):
@@ -115,70 +335,784 @@ class VBObject(object):
                 _gl.glEnable(_gl.GL_TEXTURE_2D)
                 _gl.glBindTexture(_gl.GL_TEXTURE_2D, self.texture[_i])
 
-            # Draw triangles each 3 elements of vbo
-            _gl.glDrawArrays(_gl.GL_TRIANGLES, 0, self.totalVertex)
+            # Draw triangles each 3 elements of vbo, or each 3 indices. The binding state is
+            # stored in a vertex array object if supported
+            vao = self._get_vao()
+            if vao:
+                _gl.glBindVertexArray(vao)
+                self._draw_elements()
+                _gl.glBindVertexArray(0)
+            else:
+                self._bind()
+                self._draw_elements()
+                self._unbind()
 
-            # Dsiable textures
+            # Disable textures
             for _i in range(self.texlen):
                 _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
                 _gl.glDisable(_gl.GL_TEXTURE_2D)
 
-            # Disable vbox
-            _gl.glDisableClientState(_gl.GL_VERTEX_ARRAY)
-            _gl.glDisableClientState(_gl.GL_NORMAL_ARRAY)
-
             # Pop matrix
-            _gl.glPopMatrix()
+            if pos is not None:
+                _gl.glPopMatrix()
 
         except:
             raise Exception('VBO draw error')
 
 
-def load_obj_model(file_name):
+def create_interleaved_vbo(position, normal=None, uv=None, color=None, tangent=None, index=None, texture=None,
+                           attributes=None, tangent_location=_FIGURES_TANGENT_LOCATION):
+    """
+    Create a VBObject that stores all the vertex attributes in a single interleaved VBO.
+
+    :param position: Position array (n,2..3)
+    :param normal: Normal array (n,3)
+    :param uv: Texture coordinates array (n,2)
+    :param color: Color array (n,3..4)
+    :param tangent: Tangent array (n,3), generic attribute
+    :param index: Triangle index list
+    :param texture: Texture list
+    :param attributes: Custom generic attributes, dict of name: (location, array)
+    :param tangent_location: Tangent shader location
+    :type position: numpy.ndarray, list
+    :type normal: numpy.ndarray, list, None
+    :type uv: numpy.ndarray, list, None
+    :type color: numpy.ndarray, list, None
+    :type tangent: numpy.ndarray, list, None
+    :type index: numpy.ndarray, list, None
+    :type texture: list, None
+    :type attributes: dict, None
+    :type tangent_location: int
+    :return: VBO Object
+    :rtype: VBObject
+    """
+    vertex_format = VertexFormat()
+    arrays = {}
+    standard = ((_FIGURES_ATTRIBUTE_POSITION, position, None), (_FIGURES_ATTRIBUTE_NORMAL, normal, None),
+                (_FIGURES_ATTRIBUTE_UV, uv, None), (_FIGURES_ATTRIBUTE_COLOR, color, None),
+                ('tangent', tangent, tangent_location))
+    custom = [(name, attributes[name][1], attributes[name][0]) for name in sorted(attributes or {})]
+    for name, data, location in list(standard) + custom:
+        if data is None:
+            continue
+        data = _np.asarray(data, dtype=_np.float32)
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        vertex_format.add_attribute(name, data.shape[1], location)
+        arrays[name] = data
+    data = vertex_format.pack(arrays)
+    return VBObject(_vbo.VBO(data), None, len(data), texture, index, vertex_format)
+
+
+def _get_index_array(index, total_vertex):
+    """
+    Return the index array with the smallest type that can address all the vertex.
+
+    :param index: Index list
+    :param total_vertex: Total vertex
+    :type index: list, numpy.ndarray
+    :type total_vertex: int
+    :return: Index array (uint16 or uint32)
+    :rtype: numpy.ndarray
+    """
+    if total_vertex <= 0xffff + 1:
+        dtype = _np.uint16
+    else:
+        dtype = _np.uint32
+    return _np.ascontiguousarray(index, dtype=dtype).ravel()
+
+
+def weld_vertices(vertex, normal=None, uv=None):
+    """
+    Deduplicate identical vertex (same position, normal and uv). Returns the unique
+    vertex, normal and uv arrays, in order of first appearance, and the index array that
+    rebuilds the original list; used to create indexed VBObjects.
+
+    :param vertex: Vertex array (n,3)
+    :param normal: Normal array (n,3)
+    :param uv: UV array (n,2)
+    :type vertex: numpy.ndarray, list
+    :type normal: numpy.ndarray, list, None
+    :type uv: numpy.ndarray, list, None
+    :return: Vertex, normal, uv and index arrays
+    :rtype: tuple
+    """
+    columns = [_array(vertex, 'f').reshape(-1, 3)]
+    for data, size in ((normal, 3), (uv, 2)):
+        if data is not None:
+            columns.append(_array(data, 'f').reshape(-1, size))
+    data = _np.ascontiguousarray(_np.hstack(columns)) + 0.0  # Merge -0.0 and 0.0
+
+    # Compare each row as a single binary value
+    rows = data.view(_np.dtype((_np.void, data.dtype.itemsize * data.shape[1]))).ravel()
+    first, inverse = _np.unique(rows, return_index=True, return_inverse=True)[1:]
+    order = _np.argsort(first)
+    rank = _np.empty_like(order)
+    rank[order] = _np.arange(len(order))
+    unique = data[first[order]]
+    index = rank[inverse.ravel()]
+
+    result = [_np.ascontiguousarray(unique[:, 0:3])]
+    col = 3
+    for data, size in ((normal, 3), (uv, 2)):
+        if data is None:
+            result.append(None)
+        else:
+            result.append(_np.ascontiguousarray(unique[:, col:col + size]))
+            col += size
+    result.append(_get_index_array(index, len(unique)))
+    return tuple(result)
+
+
+class InstancedRenderer(object):
+    """
+    Draws many copies (instances) of a VBObject with a single glDrawArraysInstanced or
+    glDrawElementsInstanced call. Each instance has a transform matrix and a color,
+    stored in an instance VBO; the shader reads them from the generic attributes
+    instance_matrix (mat4, locations matrix_location to matrix_location+3) and
+    instance_color (vec4, color_location), for example:
+
+        attribute mat4 instance_matrix;
+        attribute vec4 instance_color;
+        gl_Position = gl_ModelViewProjectionMatrix * instance_matrix * gl_Vertex;
+
+    The attribute locations are bound when the program is linked, see get_attributes:
+
+        program = load_shader(path, name, attributes=InstancedRenderer.get_attributes())
+
+    If the context does not support instancing, or the object is an OpenGL list, the
+    instances are compiled into an OpenGL list (glMultMatrixf and glColor4fv using the
+    fixed-function pipeline) that is rebuilt only when the instances change.
+    """
+
+    def __init__(self, obj, translation=None, scale=None, rotation=None, matrix=None, color=None,
+                 matrix_location=_FIGURES_INSTANCE_MATRIX_LOCATION, color_location=_FIGURES_INSTANCE_COLOR_LOCATION):
+        """
+        Constructor.
+
+        :param obj: Object to draw
+        :param translation: Instance translation array (n,3)
+        :param scale: Instance scale array (n,3)
+        :param rotation: Instance rotation quaternion array (n,4) as (x,y,z,w)
+        :param matrix: Instance row-major transform matrix array (n,4,4), replaces translation, scale and rotation
+        :param color: Instance color array (n,4)
+        :param matrix_location: Shader location of the instance matrix attribute
+        :param color_location: Shader location of the instance color attribute
+        :type obj: VBObject, int
+        :type translation: numpy.ndarray, list, None
+        :type scale: numpy.ndarray, list, None
+        :type rotation: numpy.ndarray, list, None
+        :type matrix: numpy.ndarray, list, None
+        :type color: numpy.ndarray, list, None
+        :type matrix_location: int
+        :type color_location: int
+        """
+        if not isinstance(obj, VBObject) and type(obj) is not int:
+            raise Exception('obj must be VBObject or OpenGL list')
+        self._buffer = None
+        self._colorLocation = color_location
+        self._data = None
+        self._dirty = True
+        self._list = None
+        self._matrixLocation = matrix_location
+        self._obj = obj
+        self._vao = None
+        self.set_instances(translation, scale, rotation, matrix, color)
+
+    def set_instances(self, translation=None, scale=None, rotation=None, matrix=None, color=None):
+        """
+        Set the instance data, all arrays must have the same length. The data is
+        uploaded on the next draw.
+
+        :param translation: Instance translation array (n,3)
+        :param scale: Instance scale array (n,3)
+        :param rotation: Instance rotation quaternion array (n,4) as (x,y,z,w)
+        :param matrix: Instance row-major transform matrix array (n,4,4), replaces translation, scale and rotation
+        :param color: Instance color array (n,3..4)
+        :type translation: numpy.ndarray, list, None
+        :type scale: numpy.ndarray, list, None
+        :type rotation: numpy.ndarray, list, None
+        :type matrix: numpy.ndarray, list, None
+        :type color: numpy.ndarray, list, None
+        """
+        if matrix is None:
+            total = None
+            if color is not None:
+                total = len(color)
+            matrix = trs_matrices(translation, scale, rotation, total)
+        else:
+            matrix = _np.asarray(matrix, dtype=_np.float32).reshape(-1, 4, 4)
+        total = len(matrix)
+        data = _np.empty(total, dtype=_FIGURES_INSTANCE_DTYPE)
+
+        # Shader matrices are column-major, each column is one attribute
+        data['matrix'] = matrix.transpose(0, 2, 1)
+        if color is None:
+            data['color'] = 1.0
+        else:
+            color = _np.asarray(color, dtype=_np.float32).reshape(total, -1)
+            data['color'][:, 3] = 1.0
+            data['color'][:, 0:color.shape[1]] = color
+        self._data = data
+        self._dirty = True
+
+    @staticmethod
+    def get_attributes(matrix_location=_FIGURES_INSTANCE_MATRIX_LOCATION,
+                       color_location=_FIGURES_INSTANCE_COLOR_LOCATION):
+        """
+        Return the instance attribute locations to bind in the shader program, see
+        load_shader and ShaderProgram.
+
+        :param matrix_location: Shader location of the instance matrix attribute
+        :param color_location: Shader location of the instance color attribute
+        :type matrix_location: int
+        :type color_location: int
+        :return: Attribute locations, name: location
+        :rtype: dict
+        """
+        return {'instance_color': color_location, 'instance_matrix': matrix_location}
+
+    def get_total_instances(self):
+        """
+        Return the number of instances.
+
+        :return: Instances
+        :rtype: int
+        """
+        return len(self._data)
+
+    def _is_instanced(self):
+        """
+        Check if the instances can be drawn with a single instanced call.
+
+        :return: Instanced draw is supported
+        :rtype: bool
+        """
+        return isinstance(self._obj, VBObject) and bool(_gl.glVertexAttribDivisor) and \
+            bool(_gl.glDrawArraysInstanced) and bool(_gl.glDrawElementsInstanced)
+
+    def _bind(self):
+        """
+        Bind the object and the instance buffers, and enable the instance attributes.
+        """
+        # noinspection PyProtectedMember
+        self._obj._bind()
+        self._buffer.bind()
+        stride = _FIGURES_INSTANCE_DTYPE.itemsize
+        for col in range(4):
+            location = self._matrixLocation + col
+            _gl.glEnableVertexAttribArray(location)
+            _gl.glVertexAttribPointer(location, 4, _gl.GL_FLOAT, _gl.GL_FALSE, stride, self._buffer + 16 * col)
+            _gl.glVertexAttribDivisor(location, 1)
+        _gl.glEnableVertexAttribArray(self._colorLocation)
+        _gl.glVertexAttribPointer(self._colorLocation, 4, _gl.GL_FLOAT, _gl.GL_FALSE, stride,
+                                  self._buffer + _FIGURES_INSTANCE_DTYPE.fields['color'][1])
+        _gl.glVertexAttribDivisor(self._colorLocation, 1)
+
+    def _unbind(self):
+        """
+        Disable the instance attributes and unbind the buffers.
+        """
+        for location in list(range(self._matrixLocation, self._matrixLocation + 4)) + [self._colorLocation]:
+            _gl.glVertexAttribDivisor(location, 0)
+            _gl.glDisableVertexAttribArray(location)
+        # noinspection PyProtectedMember
+        self._obj._unbind()
+
+    def draw(self):
+        """
+        Draw all the instances.
+        """
+        if not self._is_instanced():
+            self._draw_fallback()
+            return
+
+        # Upload the instance data
+        if self._buffer is None:
+            self._buffer = _vbo.VBO(self._data)
+        elif self._dirty:
+            self._buffer.set_array(self._data)
+        if self._dirty:
+            self._buffer.bind()
+            self._buffer.unbind()
+            self._dirty = False
+
+        # Binding state is stored in a vertex array object if supported
+        if self._vao is None:
+            self._vao = 0
+            # noinspection PyProtectedMember
+            if self._obj._get_vao():
+                self._vao = _gl.glGenVertexArrays(1)
+                _gl.glBindVertexArray(self._vao)
+                self._bind()
+                _gl.glBindVertexArray(0)
+                _gl.glBindBuffer(_gl.GL_ARRAY_BUFFER, 0)
+                _gl.glBindBuffer(_gl.GL_ELEMENT_ARRAY_BUFFER, 0)
+        if self._vao:
+            _gl.glBindVertexArray(self._vao)
+        else:
+            self._bind()
+
+        obj = self._obj
+        for _i in range(obj.texlen):
+            _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
+            _gl.glEnable(_gl.GL_TEXTURE_2D)
+            _gl.glBindTexture(_gl.GL_TEXTURE_2D, obj.texture[_i])
+        if obj.index is None:
+            _gl.glDrawArraysInstanced(_gl.GL_TRIANGLES, 0, obj.totalVertex, len(self._data))
+        else:
+            _gl.glDrawElementsInstanced(_gl.GL_TRIANGLES, obj.totalIndex, obj.indexType, None, len(self._data))
+        for _i in range(obj.texlen):
+            _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
+            _gl.glDisable(_gl.GL_TEXTURE_2D)
+
+        if self._vao:
+            _gl.glBindVertexArray(0)
+        else:
+            self._unbind()
+
+    def _draw_fallback(self):
+        """
+        Draw the instances using the fixed-function pipeline, the instances are compiled
+        into an OpenGL list when they change.
+        """
+        if self._list is None:
+            self._list = _gl.glGenLists(1)
+            self._dirty = True
+        if self._dirty:
+            draw = self._obj.draw if isinstance(self._obj, VBObject) else None
+            _gl.glNewList(self._list, _gl.GL_COMPILE)
+            for instance in self._data:
+                _gl.glPushMatrix()
+                _gl.glMultMatrixf(instance['matrix'])
+                _gl.glColor4fv(instance['color'])
+                if draw is None:
+                    _gl.glCallList(self._obj)
+                else:
+                    draw()
+                _gl.glPopMatrix()
+            _gl.glEndList()
+            self._dirty = False
+        _gl.glCallList(self._list)
+
+
+class _GrowableArray(object):
+    """
+    Typed 2D NumPy array that grows by rows, doubling its capacity when full.
+    """
+
+    def __init__(self, cols, dtype, capacity=1024):
+        """
+        Constructor.
+
+        :param cols: Number of columns
+        :param dtype: Array type
+        :param capacity: Initial capacity (rows)
+        :type cols: int
+        :type dtype: type
+        :type capacity: int
+        """
+        self._cols = cols
+        self._data = _np.empty((capacity, cols), dtype=dtype)
+        self._size = 0
+
+    def extend(self, rows):
+        """
+        Append rows to the array.
+
+        :param rows: Rows (n,cols)
+        :type rows: numpy.ndarray, list
+        """
+        n = len(rows)
+        if n == 0:
+            return
+        if self._size + n > len(self._data):
+            data = _np.empty((max(2 * len(self._data), self._size + n), self._cols), dtype=self._data.dtype)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+        self._data[self._size:self._size + n] = rows
+        self._size += n
+
+    def get(self):
+        """
+        Return a view of the filled rows.
+
+        :return: Array (n,cols)
+        :rtype: numpy.ndarray
+        """
+        return self._data[:self._size]
+
+    def trim(self):
+        """
+        Release the unused capacity and return the array. No views of the array must be alive.
+
+        :return: Array (n,cols)
+        :rtype: numpy.ndarray
+        """
+        self._data.resize((self._size, self._cols), refcheck=False)
+        return self._data
+
+    def __len__(self):
+        """
+        Return the number of rows.
+
+        :return: Rows
+        :rtype: int
+        """
+        return self._size
+
+
+def _parse_obj_floats(lines, cols):
+    """
+    Parse the values of a run of OBJ vertex records (v, vt, vn), extra values of
+    each record are ignored.
+
+    :param lines: Record values, without the keyword
+    :param cols: Number of values to keep
+    :type lines: list
+    :type cols: int
+    :return: Array (n,cols)
+    :rtype: numpy.ndarray
+    """
+    # Fast path, every record has exactly the expected number of values
+    values = b' '.join(lines).split()
+    if len(values) == cols * len(lines):
+        return _np.array(values, dtype=_np.float64).reshape(-1, cols)
+    rows = _np.zeros((len(lines), cols))
+    for i in range(len(lines)):
+        line_values = lines[i].split()[:cols]
+        rows[i, :len(line_values)] = _np.array(line_values, dtype=_np.float64)
+    return rows
+
+
+def _parse_obj_faces(lines, nvertex, nuv, nnormal):
+    """
+    Parse a run of OBJ face records, polygons are triangulated as a fan. Returns the 1-based
+    vertex, uv and normal indices of each triangle; negative (relative) indices are resolved
+    and missing indices are set to zero.
+
+    :param lines: Record values, without the keyword
+    :param nvertex: Number of vertex read so far
+    :param nuv: Number of uv read so far
+    :param nnormal: Number of normals read so far
+    :type lines: list
+    :type nvertex: int
+    :type nuv: int
+    :type nnormal: int
+    :return: Vertex, uv and normal index arrays (m,3)
+    :rtype: tuple
+    """
+    counts = _np.array([len(line.split()) for line in lines], dtype=_np.int64)
+    refs = b' '.join(lines)
+    slashes = refs.count(b'/')
+    nrefs = int(counts.sum())
+    if slashes == 0 or slashes == 2 * nrefs:
+
+        # Fast path, all the references share the v or v/vt/vn (v//vn) format
+        refs = _np.array(refs.replace(b'//', b'/0/').replace(b'/', b' ').split(), dtype=_np.int64)
+        refs = refs.reshape(nrefs, -1)
+        if slashes == 0:
+            refs = _np.hstack((refs, _np.zeros((nrefs, 2), dtype=_np.int64)))
+
+        # Fan triangulation, polygon with n vertex becomes n-2 triangles
+        ntri = _np.maximum(counts - 2, 0)
+        first = _np.repeat(_np.cumsum(counts) - counts, ntri)
+        k = _np.arange(int(ntri.sum())) - _np.repeat(_np.cumsum(ntri) - ntri, ntri) + 1
+        faces = refs[_np.stack((first, first + k, first + k + 1), axis=1)]
+    else:
+        faces = []
+        for line in lines:
+            refs = []
+            for ref in line.split():
+                ref = ref.split(b'/')
+                refs.append((int(ref[0]),
+                             int(ref[1]) if len(ref) > 1 and ref[1] else 0,
+                             int(ref[2]) if len(ref) > 2 and ref[2] else 0))
+            for k in range(1, len(refs) - 1):
+                faces.append((refs[0], refs[k], refs[k + 1]))
+        faces = _np.array(faces, dtype=_np.int64).reshape(-1, 3, 3)
+    for j, total in enumerate((nvertex, nuv, nnormal)):
+        index = faces[:, :, j]
+        index[index < 0] += total + 1
+    return (faces[:, :, 0].astype(_np.int32), faces[:, :, 1].astype(_np.int32),
+            faces[:, :, 2].astype(_np.int32))
+
+
+def _parse_obj_model(file_name, chunk_size, split_groups):
+    """
+    Streaming OBJ parser. The file is read in chunks of chunk_size bytes and consecutive
+    records of the same type are parsed together into growable typed arrays. Pending
+    records are parsed at the end of each chunk, so memory is proportional to the parsed
+    data and not to the file text.
+
+    Yields (name, vertex, normals, uv, faces_vertex, faces_normal, faces_uv) tuples; if
+    split_groups is True a tuple is yielded for each object/group (o/g records) with the
+    faces of that group, else a single tuple with all the faces is yielded.
+
+    :param file_name: File name
+    :param chunk_size: Read chunk size (bytes)
+    :param split_groups: Yield each object/group
+    :type file_name: basestring
+    :type chunk_size: int
+    :type split_groups: bool
+    :return: Generator
+    """
+    vertex = _GrowableArray(3, _np.float64)
+    normals = _GrowableArray(3, _np.float64)
+    uv = _GrowableArray(2, _np.float64)
+    faces_vertex = _GrowableArray(3, _np.int32)
+    faces_normal = _GrowableArray(3, _np.int32)
+    faces_uv = _GrowableArray(3, _np.int32)
+    state = {'name': 'default', 'key': None, 'lines': []}
+
+    def flush():
+        """
+        Parse the pending run of records.
+        """
+        key = state['key']
+        lines = state['lines']
+        if not lines:
+            key = None
+        if key == b'v':
+            records = _parse_obj_floats(lines, 3)
+            records[:, 1] -= _FIGURES_OBJ_Y_OFFSET
+            vertex.extend(records)
+        elif key == b'vn':
+            normals.extend(_parse_obj_floats(lines, 3))
+        elif key == b'vt':
+            uv.extend(_parse_obj_floats(lines, 2))
+        elif key == b'f':
+            fv, ft, fn = _parse_obj_faces(lines, len(vertex), len(uv), len(normals))
+            faces_vertex.extend(fv)
+            faces_uv.extend(ft)
+            faces_normal.extend(fn)
+        state['key'] = None
+        state['lines'] = []
+
+    def group():
+        """
+        Return the current group tuple.
+
+        :return: Group
+        :rtype: tuple
+        """
+        return (state['name'], vertex.get(), normals.get(), uv.get(), faces_vertex.get(), faces_normal.get(),
+                faces_uv.get())
+
+    try:
+        objfile = open(file_name, 'rb')
+    except IOError:
+        raise Exception('Model file does not exist')
+
+    with objfile:
+        tail = b''
+        while True:
+            chunk = objfile.read(chunk_size)
+            if chunk:
+                chunk = tail + chunk
+                cut = chunk.rfind(b'\n') + 1
+                if cut == 0:  # Line longer than the chunk
+                    tail = chunk
+                    continue
+                chunk, tail = chunk[:cut], chunk[cut:]
+            else:
+                chunk, tail = tail, b''
+                if not chunk:
+                    break
+            for line in chunk.splitlines():
+                record = line.split(None, 1)
+                if len(record) < 2:
+                    continue
+                key = record[0]
+                if key != state['key']:
+                    flush()
+                    if key in (b'o', b'g') and split_groups:
+                        if len(faces_vertex) > 0:
+                            yield group()
+                            # Each group only contains its faces, the vertex are shared
+                            faces_vertex = _GrowableArray(3, _np.int32)
+                            faces_normal = _GrowableArray(3, _np.int32)
+                            faces_uv = _GrowableArray(3, _np.int32)
+                        state['name'] = record[1].strip().decode('utf-8', 'replace')
+                        continue
+                    state['key'] = key
+                state['lines'].append(record[1])
+            # Parse the pending run so the text held never exceeds one chunk
+            key = state['key']
+            flush()
+            state['key'] = key
+        flush()
+
+    if split_groups:
+        if len(faces_vertex) > 0:
+            yield group()
+    else:
+        yield (state['name'], vertex.trim(), normals.trim(), uv.trim(), faces_vertex.trim(), faces_normal.trim(),
+               faces_uv.trim())
+
+
+def iter_obj_model(file_name, chunk_size=_FIGURES_OBJ_CHUNK_SIZE):
+    """
+    Load an OBJ file by objects/groups. For each group (o/g records) yields a tuple
+    (name, vertex, normals, uv, faces_vertex, faces_normal, faces_uv), where the vertex,
+    normals and uv arrays contain all the data read so far (OBJ indices are global) and
+    the faces arrays only contain the triangles of the group. Vertex are moved down by
+    0.1 in y as in load_obj_model.
+
+    :param file_name: File name
+    :param chunk_size: Read chunk size (bytes)
+    :type file_name: basestring
+    :type chunk_size: int
+    :return: Generator of group tuples
+    """
+    return _parse_obj_model(file_name, chunk_size, True)
+
+
+def load_obj_model(file_name, chunk_size=_FIGURES_OBJ_CHUNK_SIZE, cache_dir=None):
     """
     Load an OBJ file.
 
+    Returns numpy arrays: vertex (n,3), normals (n,3), uv (n,2) and the faces vertex,
+    normal and uv indices (m,3). Polygons are triangulated as a fan, indices are 1-based
+    as in the OBJ file, and missing indices (v, v/vt, v//vn faces) are zero.
+
+    If cache_dir is defined the parsed arrays are stored there in binary format, and
+    the next loads of the same unmodified file are memory-mapped from the cache.
+
     :param file_name: File name
+    :param chunk_size: Read chunk size (bytes)
+    :param cache_dir: Binary cache folder
     :type file_name: basestring
+    :type chunk_size: int
+    :type cache_dir: basestring, None
     :return: OBJ file tuple
     :rtype: tuple
     """
-    file_text = open(file_name)
-    text = file_text.readlines()
-    vertex = []
-    normals = []
-    uv = []
-    faces_vertex = []
-    faces_normal = []
-    faces_uv = []
-
-    for line in text:
-        info = line.split(' ')
-        if info[0] == 'v':
-            vertex.append(
-                (float(info[1]), float(info[2]) - 0.1, float(info[3])))
-        elif info[0] == 'vn':
-            normals.append((float(info[1]), float(info[2]), float(info[3])))
-        elif info[0] == 'vt':
-            uv.append((float(info[1]), float(info[2])))
-        elif info[0] == 'f':
-            p1 = info[1].split('/')
-            p2 = info[2].split('/')
-            p3 = info[3].split('/')
-            faces_vertex.append((int(p1[0]), int(p2[0]), int(p3[0])))
-            faces_uv.append((int(p1[1]), int(p2[1]), int(p3[1])))
-            faces_normal.append((int(p1[2]), int(p2[2]), int(p3[2])))
-
-    return vertex, normals, uv, faces_vertex, faces_normal, faces_uv
+    names = ('vertex', 'normals', 'uv', 'faces_vertex', 'faces_normal', 'faces_uv')
+    cache = None
+    if cache_dir is not None:
+        cache = _get_cache_path(cache_dir, file_name, {'format': _FIGURES_CACHE_VERSION}, '.mesh')
+        if _os.path.isfile(cache):
+            arrays = _load_arrays(cache)[0]
+            return tuple(arrays[name] for name in names)
+
+    model = next(_parse_obj_model(file_name, chunk_size, False))[1:]
+    if cache is not None:
+        _save_arrays(cache, dict(zip(names, model)))
+    return model
+
+
+def _face_normals(vertex, faces):
+    """
+    Return the (non normalized) normal of each triangle, computed as (b-a)x(c-b). The
+    norm of each normal is twice the area of the triangle.
+
+    :param vertex: Vertex array (n,3)
+    :param faces: Triangle index array (m,3)
+    :type vertex: numpy.ndarray
+    :type faces: numpy.ndarray
+    :return: Face normals (m,3)
+    :rtype: numpy.ndarray
+    """
+    a = vertex[faces[:, 0]]
+    b = vertex[faces[:, 1]]
+    c = vertex[faces[:, 2]]
+    return _np.cross(b - a, c - b)
+
+
+def _normalize_rows(v):
+    """
+    Normalize each row of an (n,3) array, zero rows are left untouched.
+
+    :param v: Array
+    :type v: numpy.ndarray
+    :return: Normalized array
+    :rtype: numpy.ndarray
+    """
+    norm = _np.sqrt(_np.einsum('ij,ij->i', v, v))
+    norm[norm == 0] = 1.0
+    return v / norm[:, None]
+
+
+def _corner_angles(vertex, faces):
+    """
+    Return the interior angle (radians) of each corner of each triangle.
+
+    :param vertex: Vertex array (n,3)
+    :param faces: Triangle index array (m,3)
+    :type vertex: numpy.ndarray
+    :type faces: numpy.ndarray
+    :return: Angles (m,3)
+    :rtype: numpy.ndarray
+    """
+    a = vertex[faces[:, 0]]
+    b = vertex[faces[:, 1]]
+    c = vertex[faces[:, 2]]
+    angles = _np.empty((len(faces), 3))
+    for k, (u, v) in enumerate(((b - a, c - a), (c - b, a - b), (a - c, b - c))):
+        cross = _np.cross(u, v)
+        angles[:, k] = _np.arctan2(_np.sqrt(_np.einsum('ij,ij->i', cross, cross)), _np.einsum('ij,ij->i', u, v))
+    return angles
+
+
+def _average_vertex_normals(vertex, faces, weight=FIGURES_NORMAL_WEIGHT_UNIFORM):
+    """
+    Compute the normal of each vertex as the average of the normals of the triangles that
+    share it. All face normals are computed at once and scattered to the vertices, so the
+    cost is linear in the number of triangles.
+
+    Accepted weights:
+
+    FIGURES_NORMAL_WEIGHT_UNIFORM   Mean of the unit face normals (not normalized)
+    FIGURES_NORMAL_WEIGHT_AREA      Face normals weighted by triangle area, normalized
+    FIGURES_NORMAL_WEIGHT_ANGLE     Face normals weighted by corner angle, normalized
+
+    :param vertex: Vertex array (n,3)
+    :param faces: Triangle index array (m,3)
+    :param weight: Weight mode
+    :type vertex: numpy.ndarray
+    :type faces: numpy.ndarray
+    :type weight: int
+    :return: Vertex normals (n,3)
+    :rtype: numpy.ndarray
+    """
+    nvertex = len(vertex)
+    fnormals = _face_normals(vertex, faces)
+    if weight == FIGURES_NORMAL_WEIGHT_UNIFORM:
+        corner = _np.repeat(_normalize_rows(fnormals)[:, None, :], 3, axis=1)
+    elif weight == FIGURES_NORMAL_WEIGHT_AREA:
+        corner = _np.repeat(fnormals[:, None, :], 3, axis=1)
+    elif weight == FIGURES_NORMAL_WEIGHT_ANGLE:
+        corner = _normalize_rows(fnormals)[:, None, :] * _corner_angles(vertex, faces)[:, :, None]
+    else:
+        raise Exception('Invalid normal weight')
+
+    # Scatter the contribution of each corner to its vertex
+    index = faces.ravel()
+    corner = corner.reshape(-1, 3)
+    normals = _np.empty((nvertex, 3))
+    for k in range(3):
+        normals[:, k] = _np.bincount(index, weights=corner[:, k], minlength=nvertex)
+
+    if weight == FIGURES_NORMAL_WEIGHT_UNIFORM:
+        count = _np.bincount(index, minlength=nvertex)
+        return normals / _np.maximum(count, 1)[:, None]
+    return _normalize_rows(normals)
 
 
 def load_gmsh_model(modelfile, scale, dx=0.0, dy=0.0, dz=0.0, avg=True,
-                    neg_normal=False, texture=None):
+                    neg_normal=False, texture=None, avg_weight=FIGURES_NORMAL_WEIGHT_UNIFORM, cache_dir=None,
+                    indexed=True):
     """
     Loads an .MSH or .GMSH file and returns an vboObject scaled as 'scale', by default
     normal are average, to disable use avg=False. The model also can be displaced by
     (dx,dy,dz) and reverse the normals if neg_normal is True.
 
+    If cache_dir is defined the processed arrays are stored there in binary format, keyed
+    by the file and the load parameters, and the next loads are memory-mapped from the cache.
+
+    If indexed is True the shared vertex are welded and the model is drawn with an index buffer.
+
     :param modelfile: File name
     :param scale: Scale parameter
     :param dx: X-displacement
@@ -187,6 +1121,9 @@ def load_gmsh_model(modelfile, scale, dx=0.0, dy=0.0, dz=0.0, avg=True,
     :param avg: Normal-avg
     :param neg_normal: Reverse normal
     :param texture: Texture file
+    :param avg_weight: Normal-avg weight, see _average_vertex_normals
+    :param cache_dir: Binary cache folder
+    :param indexed: Weld vertex and draw with an index buffer
     :type modelfile: basestring
     :type scale: float
     :type dx: float, int
@@ -194,13 +1131,16 @@ def load_gmsh_model(modelfile, scale, dx=0.0, dy=0.0, dz=0.0, avg=True,
     :type avg: bool
     :type neg_normal: bool
     :type texture: list
+    :type avg_weight: int
+    :type cache_dir: basestring, None
+    :type indexed: bool
     :return: VBO Object that contains GMSH model
     :rtype: VBObject
     """
 
     def load(gmshfile, _scale, _dx, _dy, _dz):
         """
-        Load an GMSH file and returns 3 lists, one for vertex, one for normals and another for
+        Load an GMSH file and returns 3 arrays, one for vertex, one for normals and another for
         normal averages. Takes file, scale and displacement.
         :param gmshfile: GMSH file
         :param _scale: Scale parameter
@@ -210,72 +1150,6 @@ def load_gmsh_model(modelfile, scale, dx=0.0, dy=0.0, dz=0.0, avg=True,
         :return:
         """
 
-        def get_ave_normals(_nodes, _elems):
-            """
-            Calculate normal average for each vertex
-            :param _nodes:
-            :param _elems:
-            :return:
-            """
-            nodetrilist = []
-            for _nodenum in range(len(_nodes)):
-                nodetrilist.append([])
-                for elemnum in range(len(_elems)):
-                    if _nodenum in _elems[elemnum]:
-                        nodetrilist[_nodenum].append(elemnum)
-            _avenorms = []
-
-            for tri in nodetrilist:
-                ave_ni = 0.0
-                ave_nj = 0.0
-                ave_nk = 0.0
-                denom = max(float(len(tri)), 1)
-                for _elem in tri:
-                    _vert1 = [_nodes[_elems[_elem][0]][0], _nodes[_elems[_elem][0]][1],
-                              _nodes[_elems[_elem][0]][2]]
-                    _vert2 = [_nodes[_elems[_elem][1]][0], _nodes[_elems[_elem][1]][1],
-                              _nodes[_elems[_elem][1]][2]]
-                    _vert3 = [_nodes[_elems[_elem][2]][0], _nodes[_elems[_elem][2]][1],
-                              _nodes[_elems[_elem][2]][2]]
-                    _normals = get_normals(_vert1, _vert2, _vert3)
-                    ave_ni += _normals[0]
-                    ave_nj += _normals[1]
-                    ave_nk += _normals[2]
-                _avenorms.append([ave_ni / denom, ave_nj / denom, ave_nk / denom])
-            return _avenorms
-
-        def get_normals(vert_a, vert_b, vert_c):
-            """
-            Calculate normal each 3 vertex
-            :param vert_a:
-            :param vert_b:
-            :param vert_c:
-            :return:
-            """
-            x_a = vert_a[0]
-            x_b = vert_b[0]
-            x_c = vert_c[0]
-            y_a = vert_a[1]
-            y_b = vert_b[1]
-            y_c = vert_c[1]
-            z_a = vert_a[2]
-            z_b = vert_b[2]
-            z_c = vert_c[2]
-            a_bx = x_b - x_a
-            a_by = y_b - y_a
-            a_bz = z_b - z_a
-            b_cx = x_c - x_b
-            b_cy = y_c - y_b
-            b_cz = z_c - z_b
-            nx = a_by * b_cz - a_bz * b_cy
-            ny = a_bz * b_cx - a_bx * b_cz
-            nz = a_bx * b_cy - a_by * b_cx
-            vec_mag = _sqrt(nx ** 2 + ny ** 2 + nz ** 2)
-            ni = nx / vec_mag
-            nj = ny / vec_mag
-            nk = nz / vec_mag
-            return [ni, nj, nk]
-
         # Read file
         try:
             infile = open(gmshfile)
@@ -283,12 +1157,15 @@ def load_gmsh_model(modelfile, scale, dx=0.0, dy=0.0, dz=0.0, avg=True,
             raise Exception('Model file does not exist')
 
         # Create model
-        nodes = []
         try:
             gmshlines = infile.readlines()
+            infile.close()
             readnodes = False
             readelems = False
             skipline = 0
+            nnodes = 0
+            nodeids = []
+            nodexyz = []
             elems = []
             lnum = 0
             for line in gmshlines:
@@ -296,9 +1173,6 @@ def load_gmsh_model(modelfile, scale, dx=0.0, dy=0.0, dz=0.0, avg=True,
                     readnodes = True
                     skipline = 2
                     nnodes = int(gmshlines[lnum + 1].strip())
-                    nodes = []
-                    for _i in range(nnodes):
-                        nodes.append(99999.9)
                 elif '$EndNodes' in line:
                     readnodes = False
                     skipline = 1
@@ -310,60 +1184,73 @@ def load_gmsh_model(modelfile, scale, dx=0.0, dy=0.0, dz=0.0, avg=True,
                     skipline = 1
                 if skipline < 1:
                     if readnodes:
-                        n_xyz = line.strip().split()
-                        nodenum = int(n_xyz[0]) - 1
-                        n_x = float(n_xyz[1]) * _scale + _dx
-                        n_y = float(n_xyz[2]) * _scale + _dy
-                        n_z = float(n_xyz[3]) * _scale + _dz
-                        if neg_normal:
-                            n_z *= -1
-                        nodes[nodenum] = [n_x, n_y, n_z]
+                        n_xyz = line.split()
+                        nodeids.append(int(n_xyz[0]) - 1)
+                        nodexyz.append((float(n_xyz[1]), float(n_xyz[2]), float(n_xyz[3])))
                     elif readelems:
                         n123 = line.split()
                         if n123[1] == '2':
-                            n1 = int(n123[-3]) - 1
-                            n2 = int(n123[-1]) - 1
-                            n3 = int(n123[-2]) - 1
-                            elems.append([n1, n2, n3])
+                            elems.append((int(n123[-3]) - 1, int(n123[-1]) - 1, int(n123[-2]) - 1))
                 else:
                     skipline -= 1
                 lnum += 1
-            triarray = []
-            normarray = []
-            avenorms = []
-            nodeavenorms = get_ave_normals(nodes, elems)
-            for elem in elems:
-                vert1 = [nodes[elem[0]][0], nodes[elem[0]][1],
-                         nodes[elem[0]][2]]
-                vert2 = [nodes[elem[1]][0], nodes[elem[1]][1],
-                         nodes[elem[1]][2]]
-                vert3 = [nodes[elem[2]][0], nodes[elem[2]][1],
-                         nodes[elem[2]][2]]
-                avenorm0 = nodeavenorms[elem[0]]
-                avenorm1 = nodeavenorms[elem[1]]
-                avenorm2 = nodeavenorms[elem[2]]
-                normals = get_normals(vert1, vert2, vert3)
-                triarray.append(vert1)
-                triarray.append(vert2)
-                triarray.append(vert3)
-                normarray.append(normals)
-                normarray.append(normals)
-                normarray.append(normals)
-                avenorms.append(avenorm0)
-                avenorms.append(avenorm1)
-                avenorms.append(avenorm2)
+
+            # Scale and displace all the nodes at once
+            nodes = _np.full((nnodes, 3), 99999.9)
+            if len(nodeids) > 0:
+                nodes[_np.array(nodeids)] = _np.array(nodexyz) * _scale + (_dx, _dy, _dz)
+            if neg_normal:
+                nodes[:, 2] *= -1
+            elems = _np.array(elems, dtype=_np.int64).reshape(-1, 3)
+
+            triarray = nodes[elems].reshape(-1, 3)
+            normarray = _np.repeat(_normalize_rows(_face_normals(nodes, elems)), 3, axis=0)
+            avenorms = _average_vertex_normals(nodes, elems, avg_weight)[elems].reshape(-1, 3)
             return triarray, normarray, avenorms
 
         except:
             raise Exception('Error load model')
 
+    # Cached arrays are memory-mapped and uploaded as they are
+    cache = None
+    if cache_dir is not None:
+        cache = _get_cache_path(cache_dir, modelfile, {
+            'avg': avg, 'avg_weight': avg_weight, 'dx': dx, 'dy': dy, 'dz': dz, 'format': _FIGURES_CACHE_VERSION,
+            'indexed': indexed, 'neg_normal': neg_normal, 'scale': scale}, '.mesh')
+        if _os.path.isfile(cache):
+            arrays = _load_arrays(cache)[0]
+            return VBObject(_vbo.VBO(arrays['vertex']), _vbo.VBO(arrays['normal']), len(arrays['vertex']), texture,
+                            arrays.get('index'))
+
     vertex, norm, avgnorm = load(modelfile, scale, float(dx), float(dy), float(dz))
     if avg:
-        return VBObject(_vbo.VBO(_array(vertex, 'f')),
-                        _vbo.VBO(_array(avgnorm, 'f')), len(vertex), texture)
-    else:
-        return VBObject(_vbo.VBO(_array(vertex, 'f')), _vbo.VBO(_array(norm, 'f')),
-                        len(vertex), texture)
+        norm = avgnorm
+    arrays = {'vertex': _array(vertex, 'f'), 'normal': _array(norm, 'f')}
+    if indexed:
+        arrays['vertex'], arrays['normal'], _, arrays['index'] = weld_vertices(vertex, norm)
+    if cache is not None:
+        _save_arrays(cache, arrays)
+    return VBObject(_vbo.VBO(arrays['vertex']), _vbo.VBO(arrays['normal']), len(arrays['vertex']), texture,
+                    arrays.get('index'))
+
+
+def _create_vbo_object(vertex_array, normal_array, indexed):
+    """
+    Create a VBObject from vertex and normal lists.
+
+    :param vertex_array: Vertex list
+    :param normal_array: Normal list
+    :param indexed: Weld vertex and draw with an index buffer
+    :type vertex_array: list
+    :type normal_array: list
+    :type indexed: bool
+    :return: VBO Object
+    :rtype: VBObject
+    """
+    if indexed:
+        vertex, normal, _, index = weld_vertices(vertex_array, normal_array)
+        return VBObject(_vbo.VBO(vertex), _vbo.VBO(normal), len(vertex), index=index)
+    return VBObject(_vbo.VBO(_array(vertex_array, 'f')), _vbo.VBO(_array(normal_array, 'f')), len(vertex_array))
 
 
 def create_sphere(lats=10, longs=10, color=None):
@@ -502,6 +1389,36 @@ def create_cone(base=1.0, height=1.0, lat=20, lng=20, color=None):
         raise Exception('Latitude and longitude of the figure must be greater than 3')
 
 
+def _bind_textures(texture_list):
+    """
+    Enable and bind a texture per texture unit. If the list is None nothing is bound, so
+    the objects that share a texture atlas page can be drawn after a single bind.
+
+    :param texture_list: Texture OpenGL list
+    :type texture_list: list, None
+    """
+    if texture_list is None:
+        return
+    for _i in range(len(texture_list)):
+        _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
+        _gl.glEnable(_gl.GL_TEXTURE_2D)
+        _gl.glBindTexture(_gl.GL_TEXTURE_2D, texture_list[_i])
+
+
+def _unbind_textures(texture_list):
+    """
+    Disable the texture units enabled by _bind_textures.
+
+    :param texture_list: Texture OpenGL list
+    :type texture_list: list, None
+    """
+    if texture_list is None:
+        return
+    for _i in range(len(texture_list)):
+        _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
+        _gl.glDisable(_gl.GL_TEXTURE_2D)
+
+
 def create_cube(color=None):
     """
     Cretes a cube.
@@ -538,11 +1455,14 @@ def create_cube(color=None):
     return obj
 
 
-def create_cube_textured(texture_list):
+def create_cube_textured(texture_list, region=None):
     """
     Create a textured cube.
 
-    :param texture_list: Texture OpenGL list
+    :param texture_list: Texture OpenGL list, None to use the texture bound outside the list
+    :param region: Texture atlas region, the texture coordinates are mapped to it
+    :type texture_list: list, None
+    :type region: PyOpenGLtoolbox.textures.AtlasRegion, None
     :return: OpenGL list
     """
     a = Point3(-1.0, -1.0, -1.0)
@@ -554,15 +1474,14 @@ def create_cube_textured(texture_list):
     g = Point3(1.0, 1.0, 1.0)
     h = Point3(-1.0, 1.0, 1.0)
     t_list = [Point2(0, 0), Point2(1, 0), Point2(1, 1), Point2(0, 1)]
+    if region is not None:
+        t_list = region.remap(t_list)
 
     obj = _gl.glGenLists(1)
     _gl.glNewList(obj, _gl.GL_COMPILE)
     _gl.glPushMatrix()
 
-    for _i in range(len(texture_list)):
-        _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
-        _gl.glEnable(_gl.GL_TEXTURE_2D)
-        _gl.glBindTexture(_gl.GL_TEXTURE_2D, texture_list[_i])
+    _bind_textures(texture_list)
     _gl.glBegin(_gl.GL_QUADS)
     draw_vertex_list_create_normal_textured([a, b, c, d], t_list)
     draw_vertex_list_create_normal_textured([b, f, g, c], t_list)
@@ -572,9 +1491,7 @@ def create_cube_textured(texture_list):
     draw_vertex_list_create_normal_textured([a, e, f, b], t_list)
     _gl.glEnd()
 
-    for _i in range(len(texture_list)):
-        _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
-        _gl.glDisable(_gl.GL_TEXTURE_2D)
+    _unbind_textures(texture_list)
     _gl.glPopMatrix()
     _gl.glEndList()
 
@@ -677,11 +1594,14 @@ def create_pyramid(color=None):
     return obj
 
 
-def create_pyramid_textured(texture_list):
+def create_pyramid_textured(texture_list, region=None):
     """
     Create a textured pyramid.
 
-    :param texture_list: Texture OpenGL list
+    :param texture_list: Texture OpenGL list, None to use the texture bound outside the list
+    :param region: Texture atlas region, the texture coordinates are mapped to it
+    :type texture_list: list, None
+    :type region: PyOpenGLtoolbox.textures.AtlasRegion, None
     :return: OpenGL list
     """
     edge = 2.0
@@ -693,14 +1613,14 @@ def create_pyramid_textured(texture_list):
     e = Point3(0.0, 0.0, 0.666) * edge
     t_list = [Point2(0, 0), Point2(1, 0), Point2(1, 1), Point2(0, 1)]
     t_list_face = [Point2(0, 0), Point2(0.5, 1.0), Point2(1, 0)]
+    if region is not None:
+        t_list = region.remap(t_list)
+        t_list_face = region.remap(t_list_face)
 
     obj = _gl.glGenLists(1)
     _gl.glNewList(obj, _gl.GL_COMPILE)
     _gl.glPushMatrix()
-    for _i in range(len(texture_list)):
-        _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
-        _gl.glEnable(_gl.GL_TEXTURE_2D)
-        _gl.glBindTexture(_gl.GL_TEXTURE_2D, texture_list[_i])
+    _bind_textures(texture_list)
     _gl.glBegin(_gl.GL_QUADS)
     draw_vertex_list_create_normal_textured([d, c, b, a], t_list)
     _gl.glEnd()
@@ -710,9 +1630,7 @@ def create_pyramid_textured(texture_list):
     draw_vertex_list_create_normal_textured([c, d, e], t_list_face)
     draw_vertex_list_create_normal_textured([d, a, e], t_list_face)
     _gl.glEnd()
-    for _i in range(len(texture_list)):
-        _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
-        _gl.glDisable(_gl.GL_TEXTURE_2D)
+    _unbind_textures(texture_list)
     _gl.glPopMatrix()
     _gl.glEndList()
     return obj
@@ -785,20 +1703,27 @@ def create_teapot(color=None):
     return obj
 
 
-def create_teapot_textured(texture_list):
+def create_teapot_textured(texture_list, region=None):
     """
     Creates a teapot textured.
 
-    :param texture_list: Texture OpenGL list
+    :param texture_list: Texture OpenGL list, None to use the texture bound outside the list
+    :param region: Texture atlas region, the texture coordinates are mapped to it
+    :type texture_list: list, None
+    :type region: PyOpenGLtoolbox.textures.AtlasRegion, None
     :return: Object list
     """
     obj = _gl.glGenLists(1)
     _gl.glNewList(obj, _gl.GL_COMPILE)
     _gl.glPushMatrix()
-    for _i in range(len(texture_list)):
-        _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
-        _gl.glEnable(_gl.GL_TEXTURE_2D)
-        _gl.glBindTexture(_gl.GL_TEXTURE_2D, texture_list[_i])
+    _bind_textures(texture_list)
+    if region is not None:  # GLUT creates the texture coordinates, map them with the texture matrix
+        u0, v0, u1, v1 = region.get_rect()
+        _gl.glMatrixMode(_gl.GL_TEXTURE)
+        _gl.glPushMatrix()
+        _gl.glTranslatef(u0, v0, 0.0)
+        _gl.glScalef(u1 - u0, v1 - v0, 1.0)
+        _gl.glMatrixMode(_gl.GL_MODELVIEW)
     _gl.glRotate(90, 1, 0, 0)
     # noinspection PyBroadException
     try:
@@ -807,20 +1732,24 @@ def create_teapot_textured(texture_list):
         if not _FIGURES_ERRS[4]:
             _print_gl_error('OpenGL actual version does not support glutSolidTeapot function')
         _FIGURES_ERRS[4] = True
-    for _i in range(len(texture_list)):
-        _gl.glActiveTexture(_gl.GL_TEXTURE0 + _i)
-        _gl.glDisable(_gl.GL_TEXTURE_2D)
+    if region is not None:
+        _gl.glMatrixMode(_gl.GL_TEXTURE)
+        _gl.glPopMatrix()
+        _gl.glMatrixMode(_gl.GL_MODELVIEW)
+    _unbind_textures(texture_list)
     _gl.glPopMatrix()
     _gl.glEndList()
     return obj
 
 
-def create_pyramid_vbo(edge=1.0):
+def create_pyramid_vbo(edge=1.0, indexed=True):
     """
     Creates a VBO pyramid for shaders.
 
     :param edge: Edge length
+    :param indexed: Weld vertex and draw with an index buffer
     :type edge: float, int
+    :type indexed: bool
     :return: VBO Object
     :rtype: VBObject
     """
@@ -858,15 +1787,17 @@ def create_pyramid_vbo(edge=1.0):
                     n5, n5, n5]
 
     # Return VBO Object
-    return VBObject(_vbo.VBO(_array(vertex_array, 'f')), _vbo.VBO(_array(normal_array, 'f')), len(vertex_array))
+    return _create_vbo_object(vertex_array, normal_array, indexed)
 
 
-def create_tetrahedron_vbo(edge=1.0):
+def create_tetrahedron_vbo(edge=1.0, indexed=True):
     """
     Creates a VBO tetrahedron for shaders.
 
     :param edge: Edge length
+    :param indexed: Weld vertex and draw with an index buffer
     :type edge: float, int
+    :type indexed: bool
     :return: VBO object
     :rtype: VBObject
     """
@@ -901,8 +1832,7 @@ def create_tetrahedron_vbo(edge=1.0):
     normal_array = [n1, n1, n1, n2, n2, n2, n3, n3, n3, n4, n4, n4]
 
     # Return VBO
-    return VBObject(_vbo.VBO(_array(vertex_array, 'f')), _vbo.VBO(_array(normal_array, 'f')),
-                    len(vertex_array))
+    return _create_vbo_object(vertex_array, normal_array, indexed)
 
 
 def create_tetrahedron(color=None):
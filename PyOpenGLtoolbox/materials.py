@@ -44,6 +44,45 @@ _MATERIAL_DIFFUSE_COLOR_GREEN = [0.0, 0.505, 0.0]
 _MATERIAL_DIFFUSE_COLOR_PURPLE = [0.301, 0.0, 0.301]
 _MATERIAL_DIFFUSE_COLOR_RED = [0.556, 0.0, 0.0, 1.0]
 _MATERIAL_DIFFUSE_COLOR_YELLOW = [0.803, 0.803, 0.0]
+_MATERIAL_PRESETS = {
+    # name: (ambient, diffuse, specular, shininess)
+    'black_plastic': ([0.0, 0.0, 0.0, 1.0], [0.01, 0.01, 0.01, 1.0], [0.50, 0.50, 0.50, 1.0], 0.25 * 128),
+    'black_rubber': ([0.02, 0.02, 0.02, 1.0], [0.01, 0.01, 0.1, 1.0], [0.4, 0.4, 0.4, 1.0], 0.078125 * 128),
+    'brass': ([0.329, 0.223529, 0.027451, 1.0], [0.780392, 0.568627, 0.113725, 1.0],
+              [0.992157, 0.941176, 0.807843, 1.0], 0.21794872 * 128),
+    'bronze': ([0.2125, 0.1275, 0.054, 1.0], [0.714, 0.4284, 0.18144, 1.0],
+               [0.393548, 0.271906, 0.166721, 1.0], 0.2 * 128),
+    'chrome': ([0.25, 0.25, 0.25, 1.0], [0.4, 0.4, 0.4, 1.0], [0.774597, 0.774957, 0.774957, 1.0], 0.6 * 128),
+    'copper': ([0.19125, 0.0735, 0.0225, 1.0], [0.7038, 0.27048, 0.0828, 1.0],
+               [0.256777, 0.137622, 0.086014, 1.0], 0.1 * 128),
+    'cyan_plastic': ([0.0, 0.1, 0.06, 1.0], [0.0, 0.50980392, 0.50980392, 1.0],
+                     [0.50196078, 0.50196078, 0.50196078, 1.0], 0.25 * 128),
+    'cyan_rubber': ([0.0, 0.05, 0.05, 1.0], [0.4, 0.5, 0.5, 1.0], [0.04, 0.7, 0.7, 1.0], 0.078125 * 128),
+    'emerald': ([0.0215, 0.1745, 0.0215, 1.0], [0.07568, 0.61424, 0.007568, 1.0],
+                [0.633, 0.727811, 0.633, 1.0], 0.6 * 128),
+    'gold': ([0.24725, 0.1995, 0.0745, 1.0], [0.75164, 0.60648, 0.22648, 1.0],
+             [0.628281, 0.555802, 0.366065, 1.0], 0.4 * 128),
+    'green_plastic': ([0.0, 0.0, 0.0, 1.0], [0.1, 0.35, 0.1, 1.0], [0.45, 0.55, 0.45, 1.0], 0.25 * 128),
+    'green_rubber': ([0.0, 0.05, 0.0, 1.0], [0.4, 0.5, 0.4, 1.0], [0.04, 0.7, 0.04, 1.0], 0.078125 * 128),
+    'jade': ([0.135, 0.2225, 0.1575, 1.0], [0.54, 0.89, 0.63, 1.0], [0.316228, 0.316228, 0.316228, 1.0], 0.1 * 128),
+    'natural_white': ([1, 1, 1, 1.0], [1, 1, 1, 1.0], [1, 1, 1, 1], 128),
+    'obsidian': ([0.05375, 0.05, 0.0625, 1.0], [0.18275, 0.17, 0.25525, 1.0],
+                 [0.332741, 0.328634, 0.346435, 1.0], 0.3 * 128),
+    'pearl': ([0.25, 0.20725, 0.20725, 1.0], [1.0, 0.829, 0.829, 1.0],
+              [0.296648, 0.296648, 0.296648, 1.0], 0.088 * 128),
+    'red_plastic': ([0.0, 0.0, 0.0, 1.0], [0.5, 0.0, 0.0, 1.0], [0.7, 0.6, 0.6, 1.0], 0.25 * 128),
+    'red_rubber': ([0.05, 0.0, 0.0, 1.0], [0.5, 0.4, 0.4, 1.0], [0.7, 0.04, 0.04, 1.0], 0.078125 * 128),
+    'ruby': ([0.1745, 0.01175, 0.01175, 1.0], [0.61424, 0.04136, 0.04136, 1.0],
+             [0.727811, 0.626959, 0.626959, 1.0], 0.6 * 128),
+    'silver': ([0.19225, 0.19225, 0.19225, 1.0], [0.50754, 0.50754, 0.50754, 1.0],
+               [0.508273, 0.508273, 0.508273, 1.0], 0.4 * 128),
+    'turquoise': ([0.1, 0.18725, 0.1745, 1.0], [0.396, 0.74161, 0.69102, 1.0],
+                  [0.29754, 0.30829, 0.306678, 1.0], 0.1 * 128),
+    'white_plastic': ([0.0, 0.0, 0.0, 1.0], [0.55, 0.55, 0.55, 1.0], [0.70, 0.70, 0.70, 1.0], 0.25 * 128),
+    'white_rubber': ([0.05, 0.05, 0.05, 1.0], [0.5, 0.5, 0.5, 1.0], [0.7, 0.7, 0.7, 1.0], 0.078125 * 128),
+    'yellow_plastic': ([0.0, 0.0, 0.0, 1.0], [0.5, 0.5, 0.0, 1.0], [0.6, 0.6, 0.5, 1.0], 0.25 * 128),
+    'yellow_rubber': ([0.05, 0.05, 0.0, 1.0], [0.5, 0.5, 0.4, 1.0], [0.7, 0.7, 0.04, 1.0], 0.078125 * 128)
+}
 _MATERIAL_SPECULAR_COLOR_GREEN = [0.0, 0.705, 0.0]
 _MATERIAL_SPECULAR_COLOR_PURPLE = [0.505, 0.0, 0.505]
 _MATERIAL_SPECULAR_COLOR_RED = [0.858, 0.0, 0.0, 1.0]
@@ -51,24 +90,60 @@ _MATERIAL_SPECULAR_COLOR_YELLOW = [0.901, 0.901, 0.0]
 _MATERIAL_WHITE_EMISSION = [1.0, 1.0, 1.0, 1.0]
 
 
-def material_obsidian(emission=None, face=_GL_FRONT_AND_BACK):
+def _set_material(name, emission, face):
     """
-    Obsidian material.
+    Set the OpenGL material of a preset.
 
+    :param name: Preset name
     :param emission: Material emission constant
     :param face: Face mode (OpenGL constant)
-    :type emission: list
+    :type name: basestring
+    :type emission: list, None
     :type face: int
     """
+    ambient, diffuse, specular, shininess = _MATERIAL_PRESETS[name]
     if emission is None:
         emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_SPECULAR, [0.332741, 0.328634, 0.346435, 1.0])
-    _glMaterialfv(face, _GL_AMBIENT, [0.05375, 0.05, 0.0625, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.18275, 0.17, 0.25525, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.3 * 128)
+    _glMaterialfv(face, _GL_AMBIENT, ambient)
+    _glMaterialfv(face, _GL_DIFFUSE, diffuse)
+    _glMaterialfv(face, _GL_SPECULAR, specular)
+    _glMaterialfv(face, _GL_SHININESS, shininess)
     _glMaterialfv(face, _GL_EMISSION, emission)
 
 
+def get_material(material, emission=None):
+    """
+    Return the properties of a material preset, e.g. to fill an uniform buffer.
+
+    :param material: Material function (e.g. material_gold) or preset name (e.g. 'gold')
+    :param emission: Material emission constant
+    :type material: callable, basestring
+    :type emission: list, None
+    :return: Dictionary with ambient, diffuse, specular, emission (RGBA lists) and shininess
+    :rtype: dict
+    """
+    name = material if isinstance(material, str) else material.__name__.replace('material_', '', 1)
+    if name not in _MATERIAL_PRESETS:
+        raise Exception('Material {0} does not exist'.format(name))
+    ambient, diffuse, specular, shininess = _MATERIAL_PRESETS[name]
+    if emission is None:
+        emission = _MATERIAL_DEFAULT_EMISSION
+    return {'ambient': list(ambient), 'diffuse': list(diffuse), 'emission': list(emission),
+            'shininess': float(shininess), 'specular': list(specular)}
+
+
+def material_obsidian(emission=None, face=_GL_FRONT_AND_BACK):
+    """
+    Obsidian material.
+
+    :param emission: Material emission constant
+    :param face: Face mode (OpenGL constant)
+    :type emission: list
+    :type face: int
+    """
+    _set_material('obsidian', emission, face)
+
+
 def material_silver(emission=None, face=_GL_FRONT_AND_BACK):
     """
     Silver material.
@@ -78,13 +153,7 @@ def material_silver(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.19225, 0.19225, 0.19225, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.50754, 0.50754, 0.50754, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.508273, 0.508273, 0.508273, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.4 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('silver', emission, face)
 
 
 def material_copper(emission=None, face=_GL_FRONT_AND_BACK):
@@ -96,13 +165,7 @@ def material_copper(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.19125, 0.0735, 0.0225, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.7038, 0.27048, 0.0828, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.256777, 0.137622, 0.086014, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.1 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('copper', emission, face)
 
 
 def material_emerald(emission=None, face=_GL_FRONT_AND_BACK):
@@ -114,13 +177,7 @@ def material_emerald(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.0215, 0.1745, 0.0215, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.07568, 0.61424, 0.007568, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.633, 0.727811, 0.633, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.6 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('emerald', emission, face)
 
 
 def material_jade(emission=None, face=_GL_FRONT_AND_BACK):
@@ -132,13 +189,7 @@ def material_jade(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.135, 0.2225, 0.1575, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.54, 0.89, 0.63, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.316228, 0.316228, 0.316228, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.1 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('jade', emission, face)
 
 
 def material_pearl(emission=None, face=_GL_FRONT_AND_BACK):
@@ -150,13 +201,7 @@ def material_pearl(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.25, 0.20725, 0.20725, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [1.0, 0.829, 0.829, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.296648, 0.296648, 0.296648, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.088 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('pearl', emission, face)
 
 
 def material_turquoise(emission=None, face=_GL_FRONT_AND_BACK):
@@ -168,13 +213,7 @@ def material_turquoise(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.1, 0.18725, 0.1745, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.396, 0.74161, 0.69102, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.29754, 0.30829, 0.306678, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.1 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('turquoise', emission, face)
 
 
 def material_ruby(emission=None, face=_GL_FRONT_AND_BACK):
@@ -186,13 +225,7 @@ def material_ruby(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.1745, 0.01175, 0.01175, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.61424, 0.04136, 0.04136, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.727811, 0.626959, 0.626959, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.6 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('ruby', emission, face)
 
 
 def material_brass(emission=None, face=_GL_FRONT_AND_BACK):
@@ -204,13 +237,7 @@ def material_brass(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.329, 0.223529, 0.027451, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.780392, 0.568627, 0.113725, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.992157, 0.941176, 0.807843, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.21794872 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('brass', emission, face)
 
 
 def material_bronze(emission=None, face=_GL_FRONT_AND_BACK):
@@ -222,13 +249,7 @@ def material_bronze(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.2125, 0.1275, 0.054, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.714, 0.4284, 0.18144, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.393548, 0.271906, 0.166721, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.2 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('bronze', emission, face)
 
 
 def material_chrome(emission=None, face=_GL_FRONT_AND_BACK):
@@ -240,13 +261,7 @@ def material_chrome(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.25, 0.25, 0.25, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.4, 0.4, 0.4, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.774597, 0.774957, 0.774957, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.6 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('chrome', emission, face)
 
 
 def material_gold(emission=None, face=_GL_FRONT_AND_BACK):
@@ -258,13 +273,7 @@ def material_gold(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.24725, 0.1995, 0.0745, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.75164, 0.60648, 0.22648, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.628281, 0.555802, 0.366065, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.4 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('gold', emission, face)
 
 
 def material_black_plastic(emission=None, face=_GL_FRONT_AND_BACK):
@@ -276,13 +285,7 @@ def material_black_plastic(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.0, 0.0, 0.0, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.01, 0.01, 0.01, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.50, 0.50, 0.50, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.25 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('black_plastic', emission, face)
 
 
 def material_cyan_plastic(emission=None, face=_GL_FRONT_AND_BACK):
@@ -294,13 +297,7 @@ def material_cyan_plastic(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.0, 0.1, 0.06, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.0, 0.50980392, 0.50980392, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.50196078, 0.50196078, 0.50196078, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.25 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('cyan_plastic', emission, face)
 
 
 def material_green_plastic(emission=None, face=_GL_FRONT_AND_BACK):
@@ -312,13 +309,7 @@ def material_green_plastic(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.0, 0.0, 0.0, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.1, 0.35, 0.1, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.45, 0.55, 0.45, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.25 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('green_plastic', emission, face)
 
 
 def material_red_plastic(emission=None, face=_GL_FRONT_AND_BACK):
@@ -330,13 +321,7 @@ def material_red_plastic(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.0, 0.0, 0.0, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.5, 0.0, 0.0, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.7, 0.6, 0.6, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.25 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('red_plastic', emission, face)
 
 
 def material_white_plastic(emission=None, face=_GL_FRONT_AND_BACK):
@@ -348,13 +333,7 @@ def material_white_plastic(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.0, 0.0, 0.0, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.55, 0.55, 0.55, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.70, 0.70, 0.70, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.25 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('white_plastic', emission, face)
 
 
 def material_yellow_plastic(emission=None, face=_GL_FRONT_AND_BACK):
@@ -366,13 +345,7 @@ def material_yellow_plastic(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.0, 0.0, 0.0, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.5, 0.5, 0.0, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.6, 0.6, 0.5, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.25 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('yellow_plastic', emission, face)
 
 
 def material_black_rubber(emission=None, face=_GL_FRONT_AND_BACK):
@@ -384,13 +357,7 @@ def material_black_rubber(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.02, 0.02, 0.02, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.01, 0.01, 0.1, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.4, 0.4, 0.4, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.078125 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('black_rubber', emission, face)
 
 
 def material_cyan_rubber(emission=None, face=_GL_FRONT_AND_BACK):
@@ -402,13 +369,7 @@ def material_cyan_rubber(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.0, 0.05, 0.05, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.4, 0.5, 0.5, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.04, 0.7, 0.7, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.078125 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('cyan_rubber', emission, face)
 
 
 def material_green_rubber(emission=None, face=_GL_FRONT_AND_BACK):
@@ -420,13 +381,7 @@ def material_green_rubber(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.0, 0.05, 0.0, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.4, 0.5, 0.4, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.04, 0.7, 0.04, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.078125 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('green_rubber', emission, face)
 
 
 def material_red_rubber(emission=None, face=_GL_FRONT_AND_BACK):
@@ -438,13 +393,7 @@ def material_red_rubber(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.05, 0.0, 0.0, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.5, 0.4, 0.4, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.7, 0.04, 0.04, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.078125 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('red_rubber', emission, face)
 
 
 def material_white_rubber(emission=None, face=_GL_FRONT_AND_BACK):
@@ -456,13 +405,7 @@ def material_white_rubber(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.05, 0.05, 0.05, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.5, 0.5, 0.5, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.7, 0.7, 0.7, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.078125 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('white_rubber', emission, face)
 
 
 def material_yellow_rubber(emission=None, face=_GL_FRONT_AND_BACK):
@@ -474,13 +417,7 @@ def material_yellow_rubber(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [0.05, 0.05, 0.0, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [0.5, 0.5, 0.4, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [0.7, 0.7, 0.04, 1.0])
-    _glMaterialfv(face, _GL_SHININESS, 0.078125 * 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('yellow_rubber', emission, face)
 
 
 def material_natural_white(emission=None, face=_GL_FRONT_AND_BACK):
@@ -492,10 +429,4 @@ def material_natural_white(emission=None, face=_GL_FRONT_AND_BACK):
     :type emission: list
     :type face: int
     """
-    if emission is None:
-        emission = _MATERIAL_DEFAULT_EMISSION
-    _glMaterialfv(face, _GL_AMBIENT, [1, 1, 1, 1.0])
-    _glMaterialfv(face, _GL_DIFFUSE, [1, 1, 1, 1.0])
-    _glMaterialfv(face, _GL_SPECULAR, [1, 1, 1, 1])
-    _glMaterialfv(face, _GL_SHININESS, 128)
-    _glMaterialfv(face, _GL_EMISSION, emission)
+    _set_material('natural_white', emission, face)
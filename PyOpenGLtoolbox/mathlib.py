@@ -28,6 +28,7 @@ SOFTWARE.
 # Library imports
 from __future__ import print_function
 import math as _math
+import numpy as _np
 import sys as _sys
 
 # Constants
@@ -39,6 +40,8 @@ class Point3(object):
     """
     Point with 3 components.
     """
+    __slots__ = ('x', 'y', 'z')
+    _type = _UTILS_MATH_POINT_3
 
     def __init__(self, x=0.0, y=0.0, z=0.0):
         """
@@ -51,8 +54,22 @@ class Point3(object):
         :type y: float, int, hex, oct, complex
         :type z: float, int, hex, oct, complex
         """
-        self._point = Vector3(x, y, z)
-        self._type = _UTILS_MATH_POINT_3
+        self.x = x
+        self.y = y
+        self.z = z
+
+    @staticmethod
+    def _new(x, y, z):
+        """
+        Creates a new point of the same type.
+
+        :param x: X-coordinate
+        :param y: Y-coordinate
+        :param z: Z-coordinate
+        :return: New point
+        :rtype: Point3
+        """
+        return Point3(x, y, z)
 
     def get_type(self):
         """
@@ -70,7 +87,7 @@ class Point3(object):
         :return: X-coordinate
         :rtype: float, int, hex, oct, complex
         """
-        return self._point.get_x()
+        return self.x
 
     def get_y(self):
         """
@@ -79,7 +96,7 @@ class Point3(object):
         :return: y-coordinate
         :rtype: float, int, hex, oct, complex
         """
-        return self._point.get_y()
+        return self.y
 
     def get_z(self):
         """
@@ -88,7 +105,7 @@ class Point3(object):
         :return: z-coordinate
         :rtype: float, int, hex, oct, complex
         """
-        return self._point.get_z()
+        return self.z
 
     def set_x(self, value):
         """
@@ -97,7 +114,7 @@ class Point3(object):
         :param value: Value
         :type value: float, int, hex, oct, complex
         """
-        self._point.set_x(value)
+        self.x = value
 
     def set_y(self, value):
         """
@@ -106,7 +123,7 @@ class Point3(object):
         :param value: Value
         :type value: float, int, hex, oct, complex
         """
-        self._point.set_y(value)
+        self.y = value
 
     def set_z(self, value):
         """
@@ -115,7 +132,7 @@ class Point3(object):
         :param value: Value
         :type value: float, int, hex, oct, complex
         """
-        self._point.set_z(value)
+        self.z = value
 
     def export_to_list(self):
         """
@@ -124,7 +141,7 @@ class Point3(object):
         :return: List
         :rtype: list
         """
-        return [self._point.get_x(), self._point.get_y(), self._point.get_z()]
+        return [self.x, self.y, self.z]
 
     def export_to_tuple(self):
         """
@@ -133,13 +150,16 @@ class Point3(object):
         :return: Tuple
         :rtype: tuple
         """
-        return self._point.get_x(), self._point.get_y(), self._point.get_z()
+        return self.x, self.y, self.z
 
     def normalize(self):
         """
         Normalize the point.
         """
-        self._point.normalize()
+        modl = _math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+        self.x /= modl
+        self.y /= modl
+        self.z /= modl
 
     def echo(self, mantise=1):
         """
@@ -148,37 +168,54 @@ class Point3(object):
         :param mantise: Point mantise
         :type mantise: int
         """
-        self._point.echo(mantise, point3=True)
+        print(self.__str__(mantise))
 
     def __add__(self, other):
         """
-        Divide point with another.
+        Adds point with another.
 
         :param other: Other point
-        :type other: Point3, Point2
+        :type other: Point3, Point2, Vector3, tuple, list
         :return: Point
         """
-        return self._vec_to_point(self._point.__add__(self._point_to_vec(other)))
+        if type(other) is Point3 or isinstance(other, (Point3, Vector3)):
+            return self._new(self.x + other.x, self.y + other.y, self.z + other.z)
+        elif type(other) is tuple or type(other) is list:
+            return self._new(self.x + other[0], self.y + other[1], self.z + other[2])
+        Vector3.throw_error(2, '__add__')
+        return self
 
     def __sub__(self, other):
         """
         Substract point with another.
 
         :param other: Other point
-        :type other: Point3, Point2
+        :type other: Point3, Point2, Vector3, tuple, list
         :return: Point
         """
-        return self._vec_to_point(self._point.__sub__(self._point_to_vec(other)))
+        if type(other) is Point3 or isinstance(other, (Point3, Vector3)):
+            return self._new(self.x - other.x, self.y - other.y, self.z - other.z)
+        elif type(other) is tuple or type(other) is list:
+            return self._new(self.x - other[0], self.y - other[1], self.z - other[2])
+        Vector3.throw_error(2, '__sub__')
+        return self
 
     def __mul__(self, other):
         """
         Multiply point with another.
 
-        :param other: Other point
-        :type other: Point3, Point2
+        :param other: Other point or value
+        :type other: Point3, Point2, Vector3, tuple, list, int, float
         :return: Point
         """
-        return self._vec_to_point(self._point.__mul__(self._point_to_vec(other)))
+        if type(other) is float or type(other) is int:
+            return self._new(self.x * other, self.y * other, self.z * other)
+        elif isinstance(other, (Point3, Vector3)):
+            return self._new(self.x * other.x, self.y * other.y, self.z * other.z)
+        elif type(other) is tuple or type(other) is list:
+            return self._new(self.x * other[0], self.y * other[1], self.z * other[2])
+        Vector3.throw_error(2, '__mul__')
+        return self
 
     def __str__(self, mantise=1, **kwargs):
         """
@@ -187,17 +224,26 @@ class Point3(object):
         :return: Point to string
         :rtype: basestring
         """
-        return self._point.__str__(mantise, point3=True)
+        return Vector3(self.x, self.y, self.z).__str__(mantise, point3=True)
 
     def __div__(self, other):
         """
         Divide point with another.
 
-        :param other: Other point
-        :type other: Point3, Point2
+        :param other: Other point or value
+        :type other: Point3, Point2, Vector3, tuple, list, int, float
         :return: Point
         """
-        return self._vec_to_point(self._point.__div__(self._point_to_vec(other)))
+        if type(other) is float or type(other) is int:
+            return self._new(self.x / other, self.y / other, self.z / other)
+        elif isinstance(other, (Point3, Vector3)):
+            return self._new(self.x / other.x, self.y / other.y, self.z / other.z)
+        elif type(other) is tuple or type(other) is list:
+            return self._new(self.x / other[0], self.y / other[1], self.z / other[2])
+        Vector3.throw_error(2, '__div__')
+        return self
+
+    __truediv__ = __div__
 
     def __abs__(self):
         """
@@ -205,91 +251,105 @@ class Point3(object):
 
         :return: Point
         """
-        return self._vec_to_point(self._point.__abs__())
+        return self._new(abs(self.x), abs(self.y), abs(self.z))
 
-    # noinspection PyMethodFirstArgAssignment
     def __iadd__(self, other):
         """
         Adds point with another.
 
         :param other: Other point
-        :type other: Point3, Point2
+        :type other: Point3, Point2, Vector3, tuple, list
         :return: Point
         """
-        self = self._vec_to_point(self._point.__iadd__(other))
+        if type(other) is Point3 or isinstance(other, (Point3, Vector3)):
+            self.x += other.x
+            self.y += other.y
+            self.z += other.z
+        elif type(other) is tuple or type(other) is list:
+            self.x += other[0]
+            self.y += other[1]
+            self.z += other[2]
+        else:
+            Vector3.throw_error(2, '__iadd__')
         return self
 
-    # noinspection PyMethodFirstArgAssignment
     def __isub__(self, other):
         """
         Substract point with another.
 
         :param other: Other point
-        :type other: Point3, Point2
+        :type other: Point3, Point2, Vector3, tuple, list
         :return: Point
         """
-        self = self._vec_to_point(self._point.__isub__(other))
+        if type(other) is Point3 or isinstance(other, (Point3, Vector3)):
+            self.x -= other.x
+            self.y -= other.y
+            self.z -= other.z
+        elif type(other) is tuple or type(other) is list:
+            self.x -= other[0]
+            self.y -= other[1]
+            self.z -= other[2]
+        else:
+            Vector3.throw_error(2, '__isub__')
         return self
 
-    # noinspection PyMethodFirstArgAssignment
     def __imul__(self, other):
         """
         Multiply point with another.
 
-        :param other: Other point
-        :type other: Point3, Point2
+        :param other: Other point or value
+        :type other: Point3, Point2, Vector3, tuple, list, int, float
         :return: Point
         """
-        self = self._vec_to_point(self._point.__imul__(other))
+        if type(other) is float or type(other) is int:
+            self.x *= other
+            self.y *= other
+            self.z *= other
+        elif isinstance(other, (Point3, Vector3)):
+            self.x *= other.x
+            self.y *= other.y
+            self.z *= other.z
+        elif type(other) is tuple or type(other) is list:
+            self.x *= other[0]
+            self.y *= other[1]
+            self.z *= other[2]
+        else:
+            Vector3.throw_error(2, '__imul__')
         return self
 
-    # noinspection PyMethodFirstArgAssignment
     def __idiv__(self, other):
         """
         Divide point with another.
 
-        :param other: Other point
-        :type other: Point3, Point2
+        :param other: Other point or value
+        :type other: Point3, Point2, Vector3, tuple, list, int, float
         :return: Point
         """
-        self = self._vec_to_point(self._point.__iadd__(other))
-        return self
-
-    @staticmethod
-    def _point_to_vec(point):
-        """
-        Converts a point to a vector.
-
-        :param point: Point
-        :type point: Point3
-        :return: New vector
-        :rtype: Vector3
-        """
-        if isinstance(point, Point3):
-            return Vector3(point.get_x(), point.get_y(), point.get_z())
+        if type(other) is float or type(other) is int:
+            self.x /= other
+            self.y /= other
+            self.z /= other
+        elif isinstance(other, (Point3, Vector3)):
+            self.x /= other.x
+            self.y /= other.y
+            self.z /= other.z
+        elif type(other) is tuple or type(other) is list:
+            self.x /= other[0]
+            self.y /= other[1]
+            self.z /= other[2]
         else:
-            return point
-
-    @staticmethod
-    def _vec_to_point(vec):
-        """
-        Converts a vector to point.
+            Vector3.throw_error(2, '__idiv__')
+        return self
 
-        :param vec: Vector
-        :type vec: Vector3
-        :return: New point
-        :rtype: Point2
-        """
-        if isinstance(vec, Vector3):
-            return Point3(vec.get_x(), vec.get_y(), vec.get_z())
-        else:
-            return vec
+    __itruediv__ = __idiv__
 
 
 class Point2(Point3):
     """
     2-coordinates point.
     """
+    __slots__ = ()
+    _type = _UTILS_MATH_POINT_2
 
     def __init__(self, x=0.0, y=0.0):
         """
@@ -300,39 +360,22 @@ class Point2(Point3):
         :type x: float, int, hex, oct, complex
         :type y: float, int, hex, oct, complex
         """
-        Point3.__init__(self, x, y)
-        self._point = Vector3(x, y)
-        self._type = _UTILS_MATH_POINT_2
-
-    @staticmethod
-    def _point_to_vec(point):
-        """
-        Converts a point to a vector.
-
-        :param point: Point
-        :type point: Point2
-        :return: New vector
-        :rtype: Vector3
-        """
-        if isinstance(point, Point2):
-            return Vector3(point.get_x(), point.get_y())
-        else:
-            return point
+        self.x = x
+        self.y = y
+        self.z = 0.0
 
     @staticmethod
-    def _vec_to_point(vec):
+    def _new(x, y, z):
         """
-        Converts a vector to point.
+        Creates a new point of the same type, z-coordinate is discarded.
 
-        :param vec: Vector
-        :type vec: Vector3
+        :param x: X-coordinate
+        :param y: Y-coordinate
+        :param z: Z-coordinate
         :return: New point
         :rtype: Point2
         """
-        if isinstance(vec, Vector3):
-            return Point2(vec.get_x(), vec.get_y())
-        else:
-            return vec
+        return Point2(x, y)
 
     def __str__(self, mantise=1, **kwargs):
         """
@@ -345,16 +388,7 @@ class Point2(Point3):
         :return: Point string
         :rtype: basestring
         """
-        return self._point.__str__(mantise, point2=True)
-
-    def echo(self, mantise=1):
-        """
-        Print the point.
-
-        :param mantise: Point mantise
-        :type mantise: int
-        """
-        self._point.echo(mantise, point2=True)
+        return Vector3(self.x, self.y).__str__(mantise, point2=True)
 
     def export_to_list(self):
         """
@@ -363,7 +397,7 @@ class Point2(Point3):
         :return: List
         :rtype: list
         """
-        return [self._point.get_x(), self._point.get_y()]
+        return [self.x, self.y]
 
     def export_to_tuple(self):
         """
@@ -372,13 +406,94 @@ class Point2(Point3):
         :return: Tuple
         :rtype: tuple
         """
-        return self._point.get_x(), self._point.get_y()
+        return self.x, self.y
+
+    def __iadd__(self, other):
+        """
+        Adds point with another, z-coordinate is discarded.
+
+        :param other: Other point
+        :type other: Point3, Point2, Vector3, tuple, list
+        :return: Point
+        """
+        if type(other) is Point2 or isinstance(other, (Point3, Vector3)):
+            self.x += other.x
+            self.y += other.y
+        elif type(other) is tuple or type(other) is list:
+            self.x += other[0]
+            self.y += other[1]
+        else:
+            Vector3.throw_error(2, '__iadd__')
+        return self
+
+    def __isub__(self, other):
+        """
+        Substract point with another, z-coordinate is discarded.
+
+        :param other: Other point
+        :type other: Point3, Point2, Vector3, tuple, list
+        :return: Point
+        """
+        if type(other) is Point2 or isinstance(other, (Point3, Vector3)):
+            self.x -= other.x
+            self.y -= other.y
+        elif type(other) is tuple or type(other) is list:
+            self.x -= other[0]
+            self.y -= other[1]
+        else:
+            Vector3.throw_error(2, '__isub__')
+        return self
+
+    def __imul__(self, other):
+        """
+        Multiply point with another, z-coordinate is discarded.
+
+        :param other: Other point or value
+        :type other: Point3, Point2, Vector3, tuple, list, int, float
+        :return: Point
+        """
+        if type(other) is float or type(other) is int:
+            self.x *= other
+            self.y *= other
+        elif isinstance(other, (Point3, Vector3)):
+            self.x *= other.x
+            self.y *= other.y
+        elif type(other) is tuple or type(other) is list:
+            self.x *= other[0]
+            self.y *= other[1]
+        else:
+            Vector3.throw_error(2, '__imul__')
+        return self
+
+    def __idiv__(self, other):
+        """
+        Divide point with another, z-coordinate is discarded.
+
+        :param other: Other point or value
+        :type other: Point3, Point2, Vector3, tuple, list, int, float
+        :return: Point
+        """
+        if type(other) is float or type(other) is int:
+            self.x /= other
+            self.y /= other
+        elif isinstance(other, (Point3, Vector3)):
+            self.x /= other.x
+            self.y /= other.y
+        elif type(other) is tuple or type(other) is list:
+            self.x /= other[0]
+            self.y /= other[1]
+        else:
+            Vector3.throw_error(2, '__idiv__')
+        return self
+
+    __itruediv__ = __idiv__
 
 
 class Vector3(object):
     """
     3 component Vector.
     """
+    __slots__ = ('x', 'y', 'z')
 
     def __init__(self, x=0.0, y=0.0, z=0.0):
         """
@@ -402,7 +517,7 @@ class Vector3(object):
         :return: Module
         :rtype: float
         """
-        return self.distance_with(Vector3(0, 0, 0))
+        return _math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
 
     def set_x(self, x):
         """
@@ -482,9 +597,8 @@ class Vector3(object):
         :return: New vector
         :rtype: Vector3
         """
-        if isinstance(other, Vector3):
-            return Vector3(self.x + other.get_x(), self.y + other.get_y(),
-                           self.z + other.get_z())
+        if type(other) is Vector3 or isinstance(other, Vector3):
+            return Vector3(self.x + other.x, self.y + other.y, self.z + other.z)
         elif type(other) is tuple or type(other) is list:
             if len(other) == 3:
                 return Vector3(self.x + other[0], self.y + other[1],
@@ -502,9 +616,8 @@ class Vector3(object):
         :return: New vector
         :rtype: Vector3
         """
-        if isinstance(other, Vector3):
-            return Vector3(self.x - other.get_x(), self.y - other.get_y(),
-                           self.z - other.get_z())
+        if type(other) is Vector3 or isinstance(other, Vector3):
+            return Vector3(self.x - other.x, self.y - other.y, self.z - other.z)
         elif type(other) is tuple or type(other) is list:
             if len(other) == 3:
                 return Vector3(self.x - other[0], self.y - other[1],
@@ -532,18 +645,15 @@ class Vector3(object):
         :return: New vector
         :rtype: Vector3
         """
-        if isinstance(other, Vector3):
-            return Vector3(self.x * other.get_x(), self.y * other.get_y(),
-                           self.z * other.get_z())
+        if type(other) is float or type(other) is int:
+            return Vector3(self.x * other, self.y * other, self.z * other)
+        elif isinstance(other, Vector3):
+            return Vector3(self.x * other.x, self.y * other.y, self.z * other.z)
+        elif type(other) is list or type(other) is tuple:
+            return Vector3(self.x * other[0], self.y * other[1], self.z * other[2])
         else:
-            if type(other) is list or type(other) is tuple:
-                return Vector3(self.x * other[0], self.y * other[1],
-                               self.z * other[2])
-            elif type(other) is int or type(other) is float:
-                return Vector3(self.x * other, self.y * other, self.z * other)
-            else:
-                self.throw_error(2, '__mul__')
-                return self
+            self.throw_error(2, '__mul__')
+            return self
 
     def __abs__(self):
         """
@@ -563,16 +673,17 @@ class Vector3(object):
         :return: New vector
         :rtype: Vector3
         """
-        if isinstance(other, Vector3):
-            return Vector3(self.x / other.get_x(), self.y / other.get_y(),
-                           self.z / other.get_z())
+        if type(other) is float or type(other) is int:
+            return Vector3(self.x / other, self.y / other, self.z / other)
+        elif isinstance(other, Vector3):
+            return Vector3(self.x / other.x, self.y / other.y, self.z / other.z)
+        elif type(other) is complex:
+            return Vector3(self.x / other, self.y / other, self.z / other)
         else:
-            if type(other) is int or type(other) is float or type(other) is hex or type(other) is complex or type(
-                    other) is oct:
-                return Vector3(self.x / other, self.y / other, self.z / other)
-            else:
-                self.throw_error(2, '__div__')
-                return self
+            self.throw_error(2, '__div__')
+            return self
+
+    __truediv__ = __div__
 
     def __invert__(self, other):
         """
@@ -740,10 +851,10 @@ class Vector3(object):
         :return: New vector
         :rtype: Vector3
         """
-        if isinstance(other, Vector3):
-            self.x += other.get_x()
-            self.y += other.get_y()
-            self.z += other.get_z()
+        if type(other) is Vector3 or isinstance(other, Vector3):
+            self.x += other.x
+            self.y += other.y
+            self.z += other.z
             return self
         elif type(other) is tuple or type(other) is list:
             if len(other) == 3:
@@ -764,10 +875,10 @@ class Vector3(object):
         :return: New vector
         :rtype: Vector3
         """
-        if isinstance(other, Vector3):
-            self.x -= other.get_x()
-            self.y -= other.get_y()
-            self.z -= other.get_z()
+        if type(other) is Vector3 or isinstance(other, Vector3):
+            self.x -= other.x
+            self.y -= other.y
+            self.z -= other.z
             return self
         elif type(other) is tuple or type(other) is list:
             if len(other) == 3:
@@ -788,25 +899,24 @@ class Vector3(object):
         :return: New vector
         :rtype: Vector3
         """
-        if isinstance(other, Vector3):
-            self.x *= other.get_x()
-            self.y *= other.get_y()
-            self.z *= other.get_z()
+        if type(other) is float or type(other) is int:
+            self.x *= other
+            self.y *= other
+            self.z *= other
+            return self
+        elif isinstance(other, Vector3):
+            self.x *= other.x
+            self.y *= other.y
+            self.z *= other.z
+            return self
+        elif type(other) is list or type(other) is tuple:
+            self.x *= other[0]
+            self.y *= other[1]
+            self.z *= other[2]
             return self
         else:
-            if type(other) is list or type(other) is tuple:
-                self.x *= other[0]
-                self.y *= other[1]
-                self.z *= other[2]
-                return self
-            elif type(other) is int or type(other) is float:
-                self.x *= other
-                self.y *= other
-                self.z *= other
-                return self
-            else:
-                self.throw_error(2, '__imul__')
-                return self
+            self.throw_error(2, '__imul__')
+            return self
 
     def __idiv__(self, other):
         """
@@ -817,25 +927,26 @@ class Vector3(object):
         :return: New vector
         :rtype: Vector3
         """
-        if isinstance(other, Vector3):
-            self.x /= other.get_x()
-            self.y /= other.get_y()
-            self.z /= other.get_z()
+        if type(other) is float or type(other) is int:
+            self.x /= other
+            self.y /= other
+            self.z /= other
+            return self
+        elif isinstance(other, Vector3):
+            self.x /= other.x
+            self.y /= other.y
+            self.z /= other.z
+            return self
+        elif type(other) is list or type(other) is tuple:
+            self.x /= other[0]
+            self.y /= other[1]
+            self.z /= other[2]
             return self
         else:
-            if type(other) is list or type(other) is tuple:
-                self.x /= other[0]
-                self.y /= other[1]
-                self.z /= other[2]
-                return self
-            elif type(other) is int or type(other) is float:
-                self.x /= other
-                self.y /= other
-                self.z /= other
-                return self
-            else:
-                self.throw_error(2, '__idiv__')
-                return self
+            self.throw_error(2, '__idiv__')
+            return self
+
+    __itruediv__ = __idiv__
 
     @staticmethod
     def throw_error(err_num, err_func):
@@ -932,8 +1043,10 @@ class Vector3(object):
         :rtype: float
         """
         if isinstance(other, Vector3):
-            return _math.sqrt(
-                (self.x - other.get_x()) ** 2 + (self.y - other.get_y()) ** 2 + (self.z - other.get_y()) ** 2)
+            dx = self.x - other.x
+            dy = self.y - other.y
+            dz = self.z - other.z
+            return _math.sqrt(dx * dx + dy * dy + dz * dz)
         elif type(other) is list or type(other) is tuple:
             return self.distance_with(Vector3(*other))
         else:
@@ -985,6 +1098,1409 @@ class Vector3(object):
         return self.x, self.y, self.z
 
 
+class Vector3Array(object):
+    """
+    Array of 3 component vectors backed by an (n,3) numpy array, all operations are
+    applied to every vector at once.
+    """
+
+    def __init__(self, data=0, dtype=_np.float64):
+        """
+        Constructor.
+
+        :param data: Number of (zero) vectors, (n,3) array, or list of Vector3/Point3/lists
+        :param dtype: Array type (float32, float64)
+        :type data: int, list, tuple, numpy.ndarray, Vector3Array
+        :type dtype: type
+        """
+        if type(data) is int:
+            self._data = _np.zeros((data, 3), dtype=dtype)
+        else:
+            if isinstance(data, Vector3Array):
+                data = data.get_array()
+            elif (type(data) is list or type(data) is tuple) and len(data) > 0 and \
+                    isinstance(data[0], (Vector3, Point3)):
+                data = [v.export_to_tuple() for v in data]
+            self._data = _np.array(data, dtype=dtype).reshape(-1, 3)
+
+    def _new(self, data):
+        """
+        Create an array of the same class that wraps data without copying it.
+
+        :param data: Array (n,3)
+        :type data: numpy.ndarray
+        :return: New array
+        :rtype: Vector3Array
+        """
+        new = self.__class__.__new__(self.__class__)
+        new._data = data
+        return new
+
+    def _other(self, other, vector=False):
+        """
+        Return the numpy operand of an operation. Vector3, Point3, lists and tuples are
+        vectors broadcasted to all rows, and 1D numpy arrays are per-row values (n,)
+        applied to each row. If vector is True 1D numpy arrays are also vectors.
+
+        :param other: Operand
+        :param vector: The operand is a vector or an array of vectors
+        :type other: Vector3Array, Vector3, Point3, list, tuple, numpy.ndarray, float, int
+        :type vector: bool
+        :return: Operand
+        """
+        if isinstance(other, Vector3Array):
+            return other.get_array()
+        elif isinstance(other, (Vector3, Point3)):
+            return _np.array(other.export_to_tuple(), dtype=self._data.dtype)
+        elif type(other) is list or type(other) is tuple:
+            return _np.array(other, dtype=self._data.dtype)
+        if not vector and isinstance(other, _np.ndarray) and other.ndim == 1:
+            return other[:, None]
+        return other
+
+    def get_array(self):
+        """
+        Return the backing (n,3) array.
+
+        :return: Array
+        :rtype: numpy.ndarray
+        """
+        return self._data
+
+    def get_x(self):
+        """
+        Return the x-coordinates.
+
+        :return: Coordinates (n,)
+        :rtype: numpy.ndarray
+        """
+        return self._data[:, 0]
+
+    def get_y(self):
+        """
+        Return the y-coordinates.
+
+        :return: Coordinates (n,)
+        :rtype: numpy.ndarray
+        """
+        return self._data[:, 1]
+
+    def get_z(self):
+        """
+        Return the z-coordinates.
+
+        :return: Coordinates (n,)
+        :rtype: numpy.ndarray
+        """
+        return self._data[:, 2]
+
+    def __len__(self):
+        """
+        Return the number of vectors.
+
+        :return: Length
+        :rtype: int
+        """
+        return len(self._data)
+
+    def __getitem__(self, item):
+        """
+        Return a vector, or a new array if item is a slice, mask or index array.
+
+        :param item: Index
+        :type item: int, slice, numpy.ndarray
+        :return: Vector or array
+        :rtype: Vector3, Vector3Array
+        """
+        if isinstance(item, (int, _np.integer)):
+            return self._item(*self._data[item].tolist())
+        return self._new(self._data[item])
+
+    def __setitem__(self, item, value):
+        """
+        Set a vector or a group of vectors.
+
+        :param item: Index
+        :param value: Value
+        :type item: int, slice, numpy.ndarray
+        :type value: Vector3Array, Vector3, Point3, list, tuple, numpy.ndarray
+        """
+        self._data[item] = self._other(value, True)
+
+    @staticmethod
+    def _item(x, y, z):
+        """
+        Create a single element.
+
+        :return: Vector
+        :rtype: Vector3
+        """
+        return Vector3(x, y, z)
+
+    def __add__(self, other):
+        """
+        Add vectors.
+
+        :param other: Vectors, vector or value
+        :return: New array
+        :rtype: Vector3Array
+        """
+        return self._new(self._data + self._other(other))
+
+    def __sub__(self, other):
+        """
+        Substract vectors.
+
+        :param other: Vectors, vector or value
+        :return: New array
+        :rtype: Vector3Array
+        """
+        return self._new(self._data - self._other(other))
+
+    def __mul__(self, other):
+        """
+        Multiply vectors component-wise, or scale them by a value (or a value per vector).
+
+        :param other: Vectors, vector or value
+        :return: New array
+        :rtype: Vector3Array
+        """
+        return self._new(self._data * self._other(other))
+
+    def __div__(self, other):
+        """
+        Divide vectors component-wise, or by a value (or a value per vector).
+
+        :param other: Vectors, vector or value
+        :return: New array
+        :rtype: Vector3Array
+        """
+        return self._new(self._data / self._other(other))
+
+    __truediv__ = __div__
+
+    def __neg__(self):
+        """
+        Apply negative sign to the vectors.
+
+        :return: New array
+        :rtype: Vector3Array
+        """
+        return self._new(-self._data)
+
+    def __abs__(self):
+        """
+        Return absolute value.
+
+        :return: New array
+        :rtype: Vector3Array
+        """
+        return self._new(_np.abs(self._data))
+
+    def __iadd__(self, other):
+        """
+        Add vectors in place.
+
+        :param other: Vectors, vector or value
+        :return: Self
+        :rtype: Vector3Array
+        """
+        self._data += self._other(other)
+        return self
+
+    def __isub__(self, other):
+        """
+        Substract vectors in place.
+
+        :param other: Vectors, vector or value
+        :return: Self
+        :rtype: Vector3Array
+        """
+        self._data -= self._other(other)
+        return self
+
+    def __imul__(self, other):
+        """
+        Multiply vectors in place.
+
+        :param other: Vectors, vector or value
+        :return: Self
+        :rtype: Vector3Array
+        """
+        self._data *= self._other(other)
+        return self
+
+    def __idiv__(self, other):
+        """
+        Divide vectors in place.
+
+        :param other: Vectors, vector or value
+        :return: Self
+        :rtype: Vector3Array
+        """
+        self._data /= self._other(other)
+        return self
+
+    __itruediv__ = __idiv__
+
+    def dot(self, other):
+        """
+        Return the scalar product of each vector with other.
+
+        :param other: Vectors or vector
+        :type other: Vector3Array, Vector3, list, tuple, numpy.ndarray
+        :return: Scalar product (n,)
+        :rtype: numpy.ndarray
+        """
+        other = self._other(other, True)
+        if other.ndim == 1:
+            return self._data.dot(other)
+        return _np.einsum('ij,ij->i', self._data, other)
+
+    def cross(self, other):
+        """
+        Return the cross product of each vector with other.
+
+        :param other: Vectors or vector
+        :type other: Vector3Array, Vector3, list, tuple, numpy.ndarray
+        :return: New array
+        :rtype: Vector3Array
+        """
+        return self._new(_np.cross(self._data, self._other(other, True)))
+
+    def get_module(self):
+        """
+        Return the length of each vector.
+
+        :return: Lengths (n,)
+        :rtype: numpy.ndarray
+        """
+        return _np.sqrt(_np.einsum('ij,ij->i', self._data, self._data))
+
+    def normalize(self):
+        """
+        Normalize the vectors in place, zero vectors are left untouched.
+        """
+        module = self.get_module()
+        module[module == 0] = 1
+        self._data /= module[:, None]
+
+    def get_normalized(self):
+        """
+        Generates normalized vectors.
+
+        :return: New array
+        :rtype: Vector3Array
+        """
+        new = self.clone()
+        new.normalize()
+        return new
+
+    def distance_with(self, other):
+        """
+        Return the distance of each vector from other.
+
+        :param other: Vectors or vector
+        :type other: Vector3Array, Vector3, Point3, list, tuple, numpy.ndarray
+        :return: Distances (n,)
+        :rtype: numpy.ndarray
+        """
+        diff = self._data - self._other(other, True)
+        return _np.sqrt(_np.einsum('ij,ij->i', diff, diff))
+
+    def clone(self):
+        """
+        Clones the array.
+
+        :return: New array
+        :rtype: Vector3Array
+        """
+        return self._new(self._data.copy())
+
+    def export_to_list(self):
+        """
+        Export the vectors to a list of [x,y,z] lists.
+
+        :return: List
+        :rtype: list
+        """
+        return self._data.tolist()
+
+    def export_to_vectors(self):
+        """
+        Export the array to a list of Vector3.
+
+        :return: List of vectors
+        :rtype: list
+        """
+        return [Vector3(*v) for v in self._data.tolist()]
+
+    def __str__(self):
+        """
+        Return the array as string.
+
+        :return: String
+        :rtype: basestring
+        """
+        return '{0}({1})'.format(self.__class__.__name__, self._data.tolist())
+
+
+class Point3Array(Vector3Array):
+    """
+    Array of 3 component points backed by an (n,3) numpy array.
+    """
+
+    @staticmethod
+    def _item(x, y, z):
+        """
+        Create a single element.
+
+        :return: Point
+        :rtype: Point3
+        """
+        return Point3(x, y, z)
+
+    def export_to_points(self):
+        """
+        Export the array to a list of Point3.
+
+        :return: List of points
+        :rtype: list
+        """
+        return [Point3(*p) for p in self._data.tolist()]
+
+
+def _xyz(v):
+    """
+    Return the three coordinates of a vector, point, list or tuple.
+
+    :param v: Vector
+    :type v: Vector3, Point3, list, tuple, numpy.ndarray
+    :return: (x,y,z) tuple
+    :rtype: tuple
+    """
+    if isinstance(v, (Vector3, Point3)):
+        return v.x, v.y, v.z
+    return v[0], v[1], v[2]
+
+
+def _rotation_matrix(angle, x, y, z):
+    """
+    Return the (4,4) rotation matrix of angle (in degrees) around the axis (x,y,z), as
+    glRotate does.
+
+    :param angle: Angle in degrees
+    :param x: Axis x-coordinate
+    :param y: Axis y-coordinate
+    :param z: Axis z-coordinate
+    :return: Matrix
+    :rtype: numpy.ndarray
+    """
+    modl = _math.sqrt(x * x + y * y + z * z)
+    if modl > 0:
+        x, y, z = x / modl, y / modl, z / modl
+    c = _cos(angle)
+    s = _sin(angle)
+    t = 1 - c
+    return _np.array([
+        [t * x * x + c, t * x * y - s * z, t * x * z + s * y, 0],
+        [t * x * y + s * z, t * y * y + c, t * y * z - s * x, 0],
+        [t * x * z - s * y, t * y * z + s * x, t * z * z + c, 0],
+        [0, 0, 0, 1]
+    ], dtype=_np.float64)
+
+
+class Matrix4(object):
+    """
+    4x4 transformation matrix backed by a row-major (4,4) numpy array. Vectors are
+    columns (M*v), so M = T*R*S first scales, then rotates and then translates. OpenGL
+    expects column-major matrices, use export_to_gl to load or upload them.
+    """
+
+    def __init__(self, data=None):
+        """
+        Constructor.
+
+        :param data: Row-major matrix (4,4) or 16 values, identity if None
+        :type data: list, tuple, numpy.ndarray, Matrix4, None
+        """
+        if data is None:
+            self._data = _np.identity(4)
+        else:
+            if isinstance(data, Matrix4):
+                data = data.get_array()
+            self._data = _np.array(data, dtype=_np.float64).reshape(4, 4)
+
+    @staticmethod
+    def _new(data):
+        """
+        Create a matrix that wraps data without copying it.
+
+        :param data: Array (4,4)
+        :type data: numpy.ndarray
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        new = Matrix4.__new__(Matrix4)
+        new._data = data
+        return new
+
+    @staticmethod
+    def identity():
+        """
+        Return the identity matrix.
+
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        return Matrix4()
+
+    @staticmethod
+    def translation(x=0.0, y=0.0, z=0.0):
+        """
+        Return a translation matrix, as glTranslate does.
+
+        :param x: X-translation
+        :param y: Y-translation
+        :param z: Z-translation
+        :type x: float, int
+        :type y: float, int
+        :type z: float, int
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        data = _np.identity(4)
+        data[0:3, 3] = x, y, z
+        return Matrix4._new(data)
+
+    @staticmethod
+    def scaling(x=1.0, y=1.0, z=1.0):
+        """
+        Return a scale matrix, as glScale does.
+
+        :param x: X-scale
+        :param y: Y-scale
+        :param z: Z-scale
+        :type x: float, int
+        :type y: float, int
+        :type z: float, int
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        return Matrix4._new(_np.diag((x, y, z, 1.0)).astype(_np.float64))
+
+    @staticmethod
+    def rotation(angle, x, y, z):
+        """
+        Return a rotation matrix of angle around the axis (x,y,z), as glRotate does.
+
+        :param angle: Angle in degrees
+        :param x: Axis x-coordinate
+        :param y: Axis y-coordinate
+        :param z: Axis z-coordinate
+        :type angle: float, int
+        :type x: float, int
+        :type y: float, int
+        :type z: float, int
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        return Matrix4._new(_rotation_matrix(angle, x, y, z))
+
+    @staticmethod
+    def from_trs(translation=None, rotation=None, scale=None):
+        """
+        Return the matrix M = T*R*S.
+
+        :param translation: Translation
+        :param rotation: Rotation quaternion, or (x,y,z,w)
+        :param scale: Scale vector or uniform scale value
+        :type translation: Vector3, Point3, list, tuple, None
+        :type rotation: Quaternion, list, tuple, None
+        :type scale: Vector3, list, tuple, float, int, None
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        if translation is not None:
+            translation = _xyz(translation)
+        if isinstance(rotation, Quaternion):
+            rotation = rotation.export_to_tuple()
+        if type(scale) is float or type(scale) is int:
+            scale = (scale, scale, scale)
+        elif scale is not None:
+            scale = _xyz(scale)
+        return Matrix4._new(trs_matrices(translation, scale, rotation, 1)[0])
+
+    @staticmethod
+    def look_at(eye, center, up):
+        """
+        Return the view matrix of a camera at eye looking at center, as gluLookAt does.
+
+        :param eye: Camera position
+        :param center: Point to look at
+        :param up: Up vector
+        :type eye: Vector3, Point3, list, tuple
+        :type center: Vector3, Point3, list, tuple
+        :type up: Vector3, Point3, list, tuple
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        eye = _np.array(_xyz(eye), dtype=_np.float64)
+        forward = _np.array(_xyz(center), dtype=_np.float64) - eye
+        forward /= _np.linalg.norm(forward)
+        side = _np.cross(forward, _xyz(up))
+        side /= _np.linalg.norm(side)
+        new_up = _np.cross(side, forward)
+        data = _np.identity(4)
+        data[0, 0:3] = side
+        data[1, 0:3] = new_up
+        data[2, 0:3] = -forward
+        data[0:3, 3] = -data[0:3, 0:3].dot(eye)
+        return Matrix4._new(data)
+
+    @staticmethod
+    def perspective(fovy, aspect, near, far):
+        """
+        Return a perspective projection matrix, as gluPerspective does.
+
+        :param fovy: Vertical field of view in degrees
+        :param aspect: Aspect ratio (width/height)
+        :param near: Near clipping plane
+        :param far: Far clipping plane
+        :type fovy: float, int
+        :type aspect: float, int
+        :type near: float, int
+        :type far: float, int
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        f = 1.0 / _math.tan(_math.radians(fovy) / 2.0)
+        data = _np.zeros((4, 4))
+        data[0, 0] = f / aspect
+        data[1, 1] = f
+        data[2, 2] = float(far + near) / (near - far)
+        data[2, 3] = 2.0 * far * near / (near - far)
+        data[3, 2] = -1.0
+        return Matrix4._new(data)
+
+    @staticmethod
+    def ortho(left, right, bottom, top, near, far):
+        """
+        Return an orthographic projection matrix, as glOrtho does.
+
+        :param left: Left clipping plane
+        :param right: Right clipping plane
+        :param bottom: Bottom clipping plane
+        :param top: Top clipping plane
+        :param near: Near clipping plane
+        :param far: Far clipping plane
+        :type left: float, int
+        :type right: float, int
+        :type bottom: float, int
+        :type top: float, int
+        :type near: float, int
+        :type far: float, int
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        data = _np.identity(4)
+        data[0, 0] = 2.0 / (right - left)
+        data[1, 1] = 2.0 / (top - bottom)
+        data[2, 2] = -2.0 / (far - near)
+        data[0, 3] = -float(right + left) / (right - left)
+        data[1, 3] = -float(top + bottom) / (top - bottom)
+        data[2, 3] = -float(far + near) / (far - near)
+        return Matrix4._new(data)
+
+    def get_array(self):
+        """
+        Return the backing row-major (4,4) array.
+
+        :return: Array
+        :rtype: numpy.ndarray
+        """
+        return self._data
+
+    def get_translation(self):
+        """
+        Return the translation part of the matrix.
+
+        :return: Translation
+        :rtype: Vector3
+        """
+        return Vector3(*self._data[0:3, 3].tolist())
+
+    def get_determinant(self):
+        """
+        Return the determinant of the matrix.
+
+        :return: Determinant
+        :rtype: float
+        """
+        return float(_np.linalg.det(self._data))
+
+    def __getitem__(self, item):
+        """
+        Return matrix values, m[row, column].
+
+        :param item: Index
+        :return: Value or array
+        """
+        return self._data[item]
+
+    def __setitem__(self, item, value):
+        """
+        Set matrix values, m[row, column] = value.
+
+        :param item: Index
+        :param value: Value
+        """
+        self._data[item] = value
+
+    def __mul__(self, other):
+        """
+        Compose the matrix with another or transform vectors and points. Points are
+        translated, vectors are not.
+
+        :param other: Matrix, point, vector or arrays
+        :type other: Matrix4, Point3, Vector3, Point3Array, Vector3Array, numpy.ndarray
+        :return: New matrix, point, vector or array
+        """
+        if isinstance(other, Matrix4):
+            return Matrix4._new(self._data.dot(other.get_array()))
+        elif isinstance(other, Point3):
+            return other._new(*(self._data[0:3, 0:3].dot(_xyz(other)) + self._data[0:3, 3]).tolist())
+        elif isinstance(other, Vector3):
+            return Vector3(*self._data[0:3, 0:3].dot(_xyz(other)).tolist())
+        elif isinstance(other, Point3Array):
+            return other._new(transform_points(self._data, other.get_array()))
+        elif isinstance(other, Vector3Array):
+            return other._new(transform_points(self._data, other.get_array(), w=0.0))
+        elif isinstance(other, _np.ndarray):
+            return _np.matmul(self._data, other)
+        Vector3.throw_error(2, '__mul__')
+        return self
+
+    def __imul__(self, other):
+        """
+        Compose the matrix with another, M = M*other.
+
+        :param other: Matrix
+        :type other: Matrix4
+        :return: Self
+        :rtype: Matrix4
+        """
+        if isinstance(other, Matrix4):
+            self._data = self._data.dot(other.get_array())
+        else:
+            Vector3.throw_error(2, '__imul__')
+        return self
+
+    def __eq__(self, other):
+        """
+        Matrices are equal if all their values are equal.
+
+        :param other: Matrix
+        :type other: Matrix4
+        :return: True if equal
+        :rtype: bool
+        """
+        return isinstance(other, Matrix4) and bool(_np.all(self._data == other.get_array()))
+
+    def __ne__(self, other):
+        """
+        Matrices are not equal if any value differs.
+
+        :param other: Matrix
+        :type other: Matrix4
+        :return: True if not equal
+        :rtype: bool
+        """
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def invert(self):
+        """
+        Invert the matrix.
+        """
+        self._data = _np.linalg.inv(self._data)
+
+    def get_inverse(self):
+        """
+        Return the inverse matrix.
+
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        return Matrix4._new(_np.linalg.inv(self._data))
+
+    def transpose(self):
+        """
+        Transpose the matrix.
+        """
+        self._data = _np.ascontiguousarray(self._data.T)
+
+    def get_transposed(self):
+        """
+        Return the transposed matrix.
+
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        return Matrix4(self._data.T)
+
+    def transform_points(self, points, w=1.0):
+        """
+        Transform an array of points (w=1) or vectors (w=0).
+
+        :param points: Points (n,3)
+        :param w: Homogeneous coordinate
+        :type points: numpy.ndarray, list
+        :type w: float
+        :return: Transformed points (n,3)
+        :rtype: numpy.ndarray
+        """
+        return transform_points(self._data, points, w)
+
+    def clone(self):
+        """
+        Clones the matrix.
+
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        return Matrix4._new(self._data.copy())
+
+    def export_to_gl(self):
+        """
+        Export the matrix as 16 column-major float32 values, ready for glLoadMatrixf,
+        glMultMatrixf or glUniformMatrix4fv without transpose.
+
+        :return: Array (16,)
+        :rtype: numpy.ndarray
+        """
+        return _np.ascontiguousarray(self._data.T, dtype=_np.float32).reshape(16)
+
+    def export_to_list(self):
+        """
+        Export the matrix to a list of rows.
+
+        :return: List
+        :rtype: list
+        """
+        return self._data.tolist()
+
+    def __str__(self):
+        """
+        Return the matrix as string.
+
+        :return: Matrix as string
+        :rtype: basestring
+        """
+        return 'Matrix4({0})'.format(self._data.tolist())
+
+
+class Quaternion(object):
+    """
+    Rotation quaternion (x,y,z,w), w being the real part.
+    """
+    __slots__ = ('x', 'y', 'z', 'w')
+
+    def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+        """
+        Constructor, identity rotation by default.
+
+        :param x: X-component
+        :param y: Y-component
+        :param z: Z-component
+        :param w: Real part
+        :type x: float, int
+        :type y: float, int
+        :type z: float, int
+        :type w: float, int
+        """
+        self.x = x
+        self.y = y
+        self.z = z
+        self.w = w
+
+    @staticmethod
+    def rotation(angle, x, y, z):
+        """
+        Return the rotation of angle around the axis (x,y,z), as glRotate does.
+
+        :param angle: Angle in degrees
+        :param x: Axis x-coordinate
+        :param y: Axis y-coordinate
+        :param z: Axis z-coordinate
+        :type angle: float, int
+        :type x: float, int
+        :type y: float, int
+        :type z: float, int
+        :return: New quaternion
+        :rtype: Quaternion
+        """
+        modl = _math.sqrt(x * x + y * y + z * z)
+        if modl == 0:
+            return Quaternion()
+        s = _sin(angle / 2.0) / modl
+        return Quaternion(x * s, y * s, z * s, _cos(angle / 2.0))
+
+    def get_x(self):
+        """
+        Get x-component.
+
+        :return: Component
+        :rtype: float
+        """
+        return self.x
+
+    def get_y(self):
+        """
+        Get y-component.
+
+        :return: Component
+        :rtype: float
+        """
+        return self.y
+
+    def get_z(self):
+        """
+        Get z-component.
+
+        :return: Component
+        :rtype: float
+        """
+        return self.z
+
+    def get_w(self):
+        """
+        Get real part.
+
+        :return: Component
+        :rtype: float
+        """
+        return self.w
+
+    def get_module(self):
+        """
+        Returns quaternion module.
+
+        :return: Module
+        :rtype: float
+        """
+        return _math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z + self.w * self.w)
+
+    def dot(self, other):
+        """
+        Return the scalar product with another quaternion.
+
+        :param other: Quaternion
+        :type other: Quaternion
+        :return: Scalar product
+        :rtype: float
+        """
+        return self.x * other.x + self.y * other.y + self.z * other.z + self.w * other.w
+
+    def normalize(self):
+        """
+        Normalize the quaternion.
+        """
+        modl = self.get_module()
+        self.x /= modl
+        self.y /= modl
+        self.z /= modl
+        self.w /= modl
+
+    def get_normalized(self):
+        """
+        Return the normalized quaternion.
+
+        :return: New quaternion
+        :rtype: Quaternion
+        """
+        modl = self.get_module()
+        return Quaternion(self.x / modl, self.y / modl, self.z / modl, self.w / modl)
+
+    def conjugate(self):
+        """
+        Return the conjugate quaternion, the inverse rotation if normalized.
+
+        :return: New quaternion
+        :rtype: Quaternion
+        """
+        return Quaternion(-self.x, -self.y, -self.z, self.w)
+
+    def get_inverse(self):
+        """
+        Return the inverse quaternion.
+
+        :return: New quaternion
+        :rtype: Quaternion
+        """
+        n = self.dot(self)
+        return Quaternion(-self.x / n, -self.y / n, -self.z / n, self.w / n)
+
+    def __mul__(self, other):
+        """
+        Compose with another quaternion (rotate by other first), rotate a vector or point,
+        or scale the quaternion by a value.
+
+        :param other: Quaternion, vector, point or value
+        :type other: Quaternion, Vector3, Point3, float, int
+        :return: New quaternion, vector or point
+        """
+        if isinstance(other, Quaternion):
+            return Quaternion(self.w * other.x + self.x * other.w + self.y * other.z - self.z * other.y,
+                              self.w * other.y - self.x * other.z + self.y * other.w + self.z * other.x,
+                              self.w * other.z + self.x * other.y - self.y * other.x + self.z * other.w,
+                              self.w * other.w - self.x * other.x - self.y * other.y - self.z * other.z)
+        elif isinstance(other, (Vector3, Point3)):
+            # v' = v + 2w(q x v) + 2q x (q x v)
+            vx, vy, vz = other.x, other.y, other.z
+            tx = 2 * (self.y * vz - self.z * vy)
+            ty = 2 * (self.z * vx - self.x * vz)
+            tz = 2 * (self.x * vy - self.y * vx)
+            x = vx + self.w * tx + self.y * tz - self.z * ty
+            y = vy + self.w * ty + self.z * tx - self.x * tz
+            z = vz + self.w * tz + self.x * ty - self.y * tx
+            if isinstance(other, Point3):
+                return other._new(x, y, z)
+            return Vector3(x, y, z)
+        elif type(other) is float or type(other) is int:
+            return Quaternion(self.x * other, self.y * other, self.z * other, self.w * other)
+        Vector3.throw_error(2, '__mul__')
+        return self
+
+    def __imul__(self, other):
+        """
+        Compose with another quaternion in place.
+
+        :param other: Quaternion
+        :type other: Quaternion
+        :return: Self
+        :rtype: Quaternion
+        """
+        if isinstance(other, Quaternion):
+            x, y, z, w = self.x, self.y, self.z, self.w
+            self.x = w * other.x + x * other.w + y * other.z - z * other.y
+            self.y = w * other.y - x * other.z + y * other.w + z * other.x
+            self.z = w * other.z + x * other.y - y * other.x + z * other.w
+            self.w = w * other.w - x * other.x - y * other.y - z * other.z
+        else:
+            Vector3.throw_error(2, '__imul__')
+        return self
+
+    def __add__(self, other):
+        """
+        Adds quaternion with another.
+
+        :param other: Quaternion
+        :type other: Quaternion
+        :return: New quaternion
+        :rtype: Quaternion
+        """
+        return Quaternion(self.x + other.x, self.y + other.y, self.z + other.z, self.w + other.w)
+
+    def __neg__(self):
+        """
+        Apply negative sign to quaternion, the rotation does not change.
+
+        :return: New quaternion
+        :rtype: Quaternion
+        """
+        return Quaternion(-self.x, -self.y, -self.z, -self.w)
+
+    def slerp(self, other, t):
+        """
+        Spherical linear interpolation towards other, following the shortest path.
+
+        :param other: Target quaternion
+        :param t: Interpolation parameter, 0 returns self and 1 other
+        :type other: Quaternion
+        :type t: float
+        :return: New quaternion
+        :rtype: Quaternion
+        """
+        q = slerp_quaternions(self.export_to_tuple(), other.export_to_tuple(), t)
+        return Quaternion(*q.tolist())
+
+    def get_matrix(self):
+        """
+        Return the rotation matrix.
+
+        :return: New matrix
+        :rtype: Matrix4
+        """
+        return Matrix4._new(trs_matrices(rotation=self.export_to_tuple())[0])
+
+    def clone(self):
+        """
+        Clones quaternion.
+
+        :return: New quaternion
+        :rtype: Quaternion
+        """
+        return Quaternion(self.x, self.y, self.z, self.w)
+
+    def export_to_list(self):
+        """
+        Export quaternion to list.
+
+        :return: List containing (x,y,z,w)
+        :rtype: list
+        """
+        return [self.x, self.y, self.z, self.w]
+
+    def export_to_tuple(self):
+        """
+        Export quaternion to tuple.
+
+        :return: Tuple containing (x,y,z,w)
+        :rtype: tuple
+        """
+        return self.x, self.y, self.z, self.w
+
+    def __str__(self, mantise=3):
+        """
+        Return the quaternion as string.
+
+        :param mantise: Mantise
+        :type mantise: int
+        :return: Quaternion as string
+        :rtype: basestring
+        """
+        return '[{0},{1},{2},{3}]'.format(round(self.x, mantise), round(self.y, mantise),
+                                          round(self.z, mantise), round(self.w, mantise))
+
+
+class MatrixStack(object):
+    """
+    CPU-side matrix stack, replaces glPushMatrix/glPopMatrix and the fixed-function
+    transforms. The current matrix is the top of the stack; translate, rotate, scale
+    and mult_matrix multiply it on the right, as OpenGL does.
+    Can be used as a context manager: with stack: ... pushes and pops the matrix.
+    """
+
+    def __init__(self, matrix=None):
+        """
+        Constructor.
+
+        :param matrix: Initial matrix, identity if None
+        :type matrix: Matrix4, numpy.ndarray, list, None
+        """
+        self._stack = [Matrix4(matrix).get_array()]
+
+    def push(self):
+        """
+        Push a copy of the current matrix.
+        """
+        self._stack.append(self._stack[-1].copy())
+
+    def pop(self):
+        """
+        Pop the current matrix.
+        """
+        if len(self._stack) == 1:
+            raise Exception('MatrixStack underflow, pop without push')
+        self._stack.pop()
+
+    def __enter__(self):
+        """
+        Push the current matrix.
+
+        :return: Stack
+        :rtype: MatrixStack
+        """
+        self.push()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Pop the current matrix.
+        """
+        self.pop()
+
+    def __len__(self):
+        """
+        Return the depth of the stack.
+
+        :return: Depth
+        :rtype: int
+        """
+        return len(self._stack)
+
+    def load_identity(self):
+        """
+        Replace the current matrix with the identity.
+        """
+        self._stack[-1] = _np.identity(4)
+
+    def load_matrix(self, matrix):
+        """
+        Replace the current matrix.
+
+        :param matrix: Matrix
+        :type matrix: Matrix4, numpy.ndarray, list
+        """
+        self._stack[-1] = Matrix4(matrix).get_array()
+
+    def mult_matrix(self, matrix):
+        """
+        Multiply the current matrix by matrix.
+
+        :param matrix: Matrix
+        :type matrix: Matrix4, numpy.ndarray
+        """
+        if isinstance(matrix, Matrix4):
+            matrix = matrix.get_array()
+        self._stack[-1] = self._stack[-1].dot(matrix)
+
+    def translate(self, x, y, z):
+        """
+        Multiply the current matrix by a translation, as glTranslate does.
+
+        :param x: X-translation
+        :param y: Y-translation
+        :param z: Z-translation
+        :type x: float, int
+        :type y: float, int
+        :type z: float, int
+        """
+        top = self._stack[-1]
+        top[:, 3] += top[:, 0:3].dot((x, y, z))
+
+    def rotate(self, angle, x, y, z):
+        """
+        Multiply the current matrix by a rotation, as glRotate does.
+
+        :param angle: Angle in degrees
+        :param x: Axis x-coordinate
+        :param y: Axis y-coordinate
+        :param z: Axis z-coordinate
+        :type angle: float, int
+        :type x: float, int
+        :type y: float, int
+        :type z: float, int
+        """
+        self._stack[-1] = self._stack[-1].dot(_rotation_matrix(angle, x, y, z))
+
+    def scale(self, x, y, z):
+        """
+        Multiply the current matrix by a scale, as glScale does.
+
+        :param x: X-scale
+        :param y: Y-scale
+        :param z: Z-scale
+        :type x: float, int
+        :type y: float, int
+        :type z: float, int
+        """
+        self._stack[-1][:, 0:3] *= (x, y, z)
+
+    def get_matrix(self):
+        """
+        Return a copy of the current matrix.
+
+        :return: Matrix
+        :rtype: Matrix4
+        """
+        return Matrix4._new(self._stack[-1].copy())
+
+    def get_array(self):
+        """
+        Return the current row-major (4,4) array.
+
+        :return: Array
+        :rtype: numpy.ndarray
+        """
+        return self._stack[-1]
+
+    def apply(self, matrices):
+        """
+        Multiply the current matrix by a batch of object matrices in a single pass.
+
+        :param matrices: Matrices (n,4,4)
+        :type matrices: numpy.ndarray
+        :return: Matrices (n,4,4)
+        :rtype: numpy.ndarray
+        """
+        return _np.matmul(self._stack[-1], matrices)
+
+    def export_to_gl(self):
+        """
+        Export the current matrix as 16 column-major float32 values, ready for glLoadMatrixf
+        or glUniformMatrix4fv without transpose.
+
+        :return: Array (16,)
+        :rtype: numpy.ndarray
+        """
+        return _np.ascontiguousarray(self._stack[-1].T, dtype=_np.float32).reshape(16)
+
+
+def trs_matrices(translation=None, scale=None, rotation=None, total=None):
+    """
+    Compose translation, scale and rotation arrays into (n,4,4) row-major transform
+    matrices M = T*R*S.
+
+    :param translation: Translation array (n,3)
+    :param scale: Scale array (n,3)
+    :param rotation: Rotation quaternion array (n,4) as (x,y,z,w)
+    :param total: Number of matrices, used if all the arrays are None
+    :type translation: numpy.ndarray, list, tuple, None
+    :type scale: numpy.ndarray, list, tuple, None
+    :type rotation: numpy.ndarray, list, tuple, None
+    :type total: int, None
+    :return: Matrices (n,4,4)
+    :rtype: numpy.ndarray
+    """
+    if translation is not None:
+        translation = _np.asarray(translation, dtype=_np.float64).reshape(-1, 3)
+    if scale is not None:
+        scale = _np.asarray(scale, dtype=_np.float64).reshape(-1, 3)
+    if rotation is not None:
+        rotation = _np.asarray(rotation, dtype=_np.float64).reshape(-1, 4)
+    for data in (translation, scale, rotation):
+        if data is not None:
+            total = len(data)
+    matrix = _np.zeros((total or 0, 4, 4))
+    if rotation is None:
+        matrix[:, 0, 0] = matrix[:, 1, 1] = matrix[:, 2, 2] = 1.0
+    else:
+        modl = _np.sqrt(_np.einsum('ij,ij->i', rotation, rotation))
+        modl[modl == 0] = 1.0
+        q = rotation / modl[:, None]
+        x, y, z, w = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+        matrix[:, 0, 0] = 1 - 2 * (y * y + z * z)
+        matrix[:, 0, 1] = 2 * (x * y - z * w)
+        matrix[:, 0, 2] = 2 * (x * z + y * w)
+        matrix[:, 1, 0] = 2 * (x * y + z * w)
+        matrix[:, 1, 1] = 1 - 2 * (x * x + z * z)
+        matrix[:, 1, 2] = 2 * (y * z - x * w)
+        matrix[:, 2, 0] = 2 * (x * z - y * w)
+        matrix[:, 2, 1] = 2 * (y * z + x * w)
+        matrix[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    if scale is not None:
+        matrix[:, 0:3, 0:3] *= scale[:, None, :]
+    if translation is not None:
+        matrix[:, 0:3, 3] = translation
+    matrix[:, 3, 3] = 1.0
+    return matrix
+
+
+def compose_matrices(a, b):
+    """
+    Compose matrices, a*b. Any of them can be a single (4,4) matrix, which is applied to
+    all the matrices of the other.
+
+    :param a: Matrices (n,4,4) or (4,4)
+    :param b: Matrices (n,4,4) or (4,4)
+    :type a: numpy.ndarray, Matrix4
+    :type b: numpy.ndarray, Matrix4
+    :return: Matrices (n,4,4)
+    :rtype: numpy.ndarray
+    """
+    if isinstance(a, Matrix4):
+        a = a.get_array()
+    if isinstance(b, Matrix4):
+        b = b.get_array()
+    return _np.matmul(a, b)
+
+
+def invert_matrices(matrices):
+    """
+    Invert matrices.
+
+    :param matrices: Matrices (n,4,4)
+    :type matrices: numpy.ndarray
+    :return: Inverse matrices (n,4,4)
+    :rtype: numpy.ndarray
+    """
+    return _np.linalg.inv(matrices)
+
+
+def transpose_matrices(matrices):
+    """
+    Transpose matrices, also converts row-major matrices to the column-major order used by
+    OpenGL.
+
+    :param matrices: Matrices (n,4,4)
+    :type matrices: numpy.ndarray
+    :return: Transposed matrices (n,4,4)
+    :rtype: numpy.ndarray
+    """
+    return _np.ascontiguousarray(_np.swapaxes(matrices, -1, -2))
+
+
+def transform_points(matrices, points, w=1.0):
+    """
+    Transform points (w=1) or vectors (w=0) by a matrix, or each point by its own matrix.
+
+    :param matrices: Matrix (4,4) or matrices (n,4,4)
+    :param points: Points (n,3)
+    :param w: Homogeneous coordinate
+    :type matrices: numpy.ndarray, Matrix4
+    :type points: numpy.ndarray, list
+    :type w: float
+    :return: Transformed points (n,3)
+    :rtype: numpy.ndarray
+    """
+    if isinstance(matrices, Matrix4):
+        matrices = matrices.get_array()
+    points = _np.asarray(points, dtype=_np.float64).reshape(-1, 3)
+    if matrices.ndim == 2:
+        result = points.dot(matrices[0:3, 0:3].T)
+        if w:
+            result += w * matrices[0:3, 3]
+        return result
+    result = _np.einsum('nij,nj->ni', matrices[:, 0:3, 0:3], points)
+    if w:
+        result += w * matrices[:, 0:3, 3]
+    return result
+
+
+def slerp_quaternions(a, b, t):
+    """
+    Spherical linear interpolation of quaternions (x,y,z,w), following the shortest path.
+
+    :param a: Start quaternions (n,4) or (4,)
+    :param b: End quaternions (n,4) or (4,)
+    :param t: Interpolation parameter, value or array (n,)
+    :type a: numpy.ndarray, list, tuple
+    :type b: numpy.ndarray, list, tuple
+    :type t: float, numpy.ndarray
+    :return: Quaternions (n,4), or (4,) if a, b and t are single
+    :rtype: numpy.ndarray
+    """
+    a = _np.asarray(a, dtype=_np.float64)
+    b = _np.asarray(b, dtype=_np.float64)
+    single = a.ndim == 1 and b.ndim == 1 and _np.ndim(t) == 0
+    a = a.reshape(-1, 4)
+    b = b.reshape(-1, 4)
+    a = a / _np.linalg.norm(a, axis=1)[:, None]
+    b = b / _np.linalg.norm(b, axis=1)[:, None]
+    t = _np.asarray(t, dtype=_np.float64).reshape(-1, 1)
+    d = _np.einsum('ij,ij->i', *_np.broadcast_arrays(a, b))[:, None]
+
+    # Take the shortest path
+    b = _np.where(d < 0, -b, b)
+    d = _np.abs(d)
+
+    # Interpolate linearly if the quaternions are too close
+    theta = _np.arccos(_np.minimum(d, 1.0))
+    sin_theta = _np.sin(theta)
+    close = sin_theta < 1e-6
+    sin_theta[close] = 1.0
+    s0 = _np.where(close, 1.0 - t, _np.sin((1.0 - t) * theta) / sin_theta)
+    s1 = _np.where(close, t, _np.sin(t * theta) / sin_theta)
+    q = s0 * a + s1 * b
+    q /= _np.linalg.norm(q, axis=1)[:, None]
+    if single:
+        return q[0]
+    return q
+
+
 def _normal_3_points(a, b, c):
     """
     Return normal vector from 3 points.
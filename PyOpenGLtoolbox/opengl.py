@@ -27,8 +27,10 @@ SOFTWARE.
 
 # Library imports
 from __future__ import print_function
+from PyOpenGLtoolbox.mathlib import Matrix4 as _Matrix4
 from PyOpenGLtoolbox.utils import print_gl_error as _print_gl_error
 from OpenGL.GLU import gluPerspective as _gluPerspective
+import numpy as _np
 
 # noinspection PyPep8Naming
 import OpenGL.GL as _gl
@@ -277,6 +279,193 @@ def reshape_window_ortho(w, h, left, right, bottom, top, z_near, z_far):
     _gl.glLoadIdentity()
 
 
+class Projection(object):
+    """
+    Perspective or orthographic projection of a window. The projection matrix is computed
+    only when a parameter changes; apply replaces reshape_window_perspective and
+    reshape_window_ortho, and the version counter lets renderers skip uploading an
+    unchanged matrix.
+    """
+
+    def __init__(self, w, h, near, far, fov=_OPENGL_DEFAULT_FOV):
+        """
+        Constructor, creates a perspective projection.
+
+        :param w: Window width
+        :param h: Window height
+        :param near: Near plane distance
+        :param far: Far plane distance
+        :param fov: Field of view
+        :type w: int
+        :type h: int
+        :type near: float, int
+        :type far: float, int
+        :type fov: float, int
+        """
+        self._far = far
+        self._fov = fov
+        self._h = max(h, 1)
+        self._matrix = None
+        self._matrix_gl = None
+        self._near = near
+        self._ortho = None
+        self._version = 0
+        self._w = w
+
+    def _set_dirty(self):
+        """
+        Invalidate the cached matrix.
+        """
+        self._matrix = None
+        self._version += 1
+
+    def set_size(self, w, h):
+        """
+        Set window size.
+
+        :param w: Window width
+        :param h: Window height
+        :type w: int
+        :type h: int
+        """
+        h = max(h, 1)
+        if w != self._w or h != self._h:
+            self._w = w
+            self._h = h
+            self._set_dirty()
+
+    def set_fov(self, fov):
+        """
+        Set perspective field of view.
+
+        :param fov: Field of view
+        :type fov: float, int
+        """
+        self._fov = fov
+        self._set_dirty()
+
+    def set_near(self, near):
+        """
+        Set near plane distance.
+
+        :param near: Near plane distance
+        :type near: float, int
+        """
+        self._near = near
+        self._set_dirty()
+
+    def set_far(self, far):
+        """
+        Set far plane distance.
+
+        :param far: Far plane distance
+        :type far: float, int
+        """
+        self._far = far
+        self._set_dirty()
+
+    def set_ortho(self, left, right, bottom, top):
+        """
+        Use an ortographic projection with the given clipping planes.
+
+        :param left: Left coordinate of ortho clipping plane
+        :param right: Right coordinate of ortho clipping plane
+        :param bottom: Bottom coordinate of ortho clipping plane
+        :param top: Top coordinate of ortho clipping plane
+        :type left: float, int
+        :type right: float, int
+        :type bottom: float, int
+        :type top: float, int
+        """
+        self._ortho = (left, right, bottom, top)
+        self._set_dirty()
+
+    def set_perspective(self):
+        """
+        Use a perspective projection.
+        """
+        if self._ortho is not None:
+            self._ortho = None
+            self._set_dirty()
+
+    def is_ortho(self):
+        """
+        Return true if the projection is ortographic.
+
+        :return: Boolean
+        :rtype: bool
+        """
+        return self._ortho is not None
+
+    def get_size(self):
+        """
+        Return window size.
+
+        :return: (width, height)
+        :rtype: tuple
+        """
+        return self._w, self._h
+
+    def get_aspect(self):
+        """
+        Return window aspect ratio.
+
+        :return: Aspect ratio
+        :rtype: float
+        """
+        return float(self._w) / float(self._h)
+
+    def get_version(self):
+        """
+        Return the projection version, it changes every time the matrix changes.
+
+        :return: Version
+        :rtype: int
+        """
+        return self._version
+
+    def get_projection_matrix(self):
+        """
+        Return the read-only row-major float32 (4,4) projection matrix.
+
+        :return: Projection matrix
+        :rtype: numpy.ndarray
+        """
+        if self._matrix is None:
+            if self._ortho is None:
+                matrix = _Matrix4.perspective(self._fov, self.get_aspect(), self._near, self._far)
+            else:
+                matrix = _Matrix4.ortho(self._ortho[0], self._ortho[1], self._ortho[2], self._ortho[3],
+                                        self._near, self._far)
+            self._matrix_gl = matrix.export_to_gl()
+            self._matrix = matrix.get_array().astype(_np.float32)
+            self._matrix.setflags(write=False)
+        return self._matrix
+
+    def apply(self):
+        """
+        Set the viewport and load the projection matrix, then reset the model matrix.
+        """
+        self.get_projection_matrix()
+        _gl.glViewport(0, 0, int(self._w), int(self._h))
+        _gl.glMatrixMode(_gl.GL_PROJECTION)
+        _gl.glLoadMatrixf(self._matrix_gl)
+        _gl.glMatrixMode(_gl.GL_MODELVIEW)
+        _gl.glLoadIdentity()
+
+    def reshape(self, w, h):
+        """
+        Set window size and apply the projection.
+
+        :param w: Window width
+        :param h: Window height
+        :type w: int
+        :type h: int
+        """
+        self.set_size(w, h)
+        self.apply()
+
+
 def init_light(light=None, ambient=None, constant_att=_OPENGL_DEFAULT_CONSTANT_ATTENUATION,
                diffuse=None, linear_att=_OPENGL_DEFAULT_LINEAR_ATTENUATION,
                quad_att=_OPENGL_DEFAULT_QUADRATIC_ATTENUATION, specular=None,
@@ -1,7 +1,7 @@
 # coding=utf-8
 """
 PYOPENGL-TOOLBOX PARTICLES
-Particle class.
+Particle class, and ParticleSystem for large numbers of particles.
 
 MIT License
 Copyright (c) 2015-2019 Pablo Pizarro R.
@@ -28,6 +28,7 @@ SOFTWARE.
 # Library imports
 from __future__ import print_function
 from PyOpenGLtoolbox.mathlib import _cos, _sin, Point3, Vector3
+import numpy as _np
 import types as _types
 
 # Constants
@@ -40,7 +41,30 @@ PARTICLES_OPERATOR_MULT = 0x0f65
 PARTICLES_OPERATOR_OR = 0x0f66
 PARTICLES_OPERATOR_POW = 0x0f67
 PARTICLES_OPERATOR_XOR = 0x0f68
+_PARTICLES_CAPACITY = 1024
+_PARTICLES_COLUMNS = (
+    # name, dtype, shape, default
+    ('position', _np.float64, (3,), 0.0),
+    ('velocity', _np.float64, (3,), 0.0),
+    ('ang_velocity', _np.float64, (3,), 0.0),
+    ('move', _np.bool_, (3,), True),
+    ('rotate', _np.bool_, (3,), True),
+    ('age', _np.float64, (), 0.0),
+    ('lifetime', _np.float64, (), _np.inf)
+)
+_PARTICLES_OPERATORS = {
+    PARTICLES_OPERATOR_ADD: _np.add,
+    PARTICLES_OPERATOR_AND: _np.logical_and,
+    PARTICLES_OPERATOR_DIFF: _np.subtract,
+    PARTICLES_OPERATOR_DIV: _np.true_divide,
+    PARTICLES_OPERATOR_MOD: _np.mod,
+    PARTICLES_OPERATOR_MULT: _np.multiply,
+    PARTICLES_OPERATOR_OR: _np.logical_or,
+    PARTICLES_OPERATOR_POW: _np.power,
+    PARTICLES_OPERATOR_XOR: _np.logical_xor
+}
 _PARTICLES_ROUND = 3
+_PARTICLES_TYPES = {bool: _np.bool_, float: _np.float64, int: _np.int64}
 
 
 class Particle(object):
@@ -523,7 +547,7 @@ class Particle(object):
         :return: Movement
         :rtype: bool
         """
-        return self._boolvel[0]
+        return self._boolvel[1]
 
     def has_movement_z(self):
         """
@@ -532,7 +556,7 @@ class Particle(object):
         :return: Movement
         :rtype: bool
         """
-        return self._boolvel[0]
+        return self._boolvel[2]
 
     def start(self):
         """
@@ -749,6 +773,8 @@ class Particle(object):
                     self._properties[propname] /= newvalue
                 elif operator == PARTICLES_OPERATOR_MOD:
                     self._properties[propname] %= newvalue
+                elif operator == PARTICLES_OPERATOR_MULT:
+                    self._properties[propname] *= newvalue
                 elif operator == PARTICLES_OPERATOR_OR:
                     self._properties[propname] = self._properties[propname] or newvalue
                 elif operator == PARTICLES_OPERATOR_POW:
@@ -855,3 +881,557 @@ class Particle(object):
                           onoff(self.has_movement_y()),
                           onoff(self.has_movement_z()), self.get_name(),
                           get_funct_list(), get_prop_list())
+
+
+class ParticleSystem(object):
+    """
+    Particles stored as a structure of arrays: position, velocity, angular velocity
+    (degrees), movement and rotation flags, age and lifetime are contiguous NumPy
+    columns. update moves every particle in one vectorized step with the same rules
+    as Particle.update, and particles are emitted and killed without per-particle
+    Python work; killed particles are removed by compacting the columns, so the index
+    of the following particles changes.
+    """
+
+    def __init__(self, capacity=_PARTICLES_CAPACITY):
+        """
+        Constructor.
+
+        :param capacity: Initial number of particles the columns can hold, they grow as needed
+        :type capacity: int
+        """
+        self._capacity = max(1, int(capacity))
+        self._columns = {}
+        self._defaults = {}
+        self._properties = []
+        self._size = 0
+        for name, dtype, shape, default in _PARTICLES_COLUMNS:
+            self._add_column(name, dtype, shape, default)
+
+    def _add_column(self, name, dtype, shape, default):
+        """
+        Create a column.
+
+        :param name: Column name
+        :param dtype: Column type
+        :param shape: Shape of each value
+        :param default: Value of new particles
+        :type name: basestring
+        :type dtype: type
+        :type shape: tuple
+        :type default: object
+        """
+        column = _np.empty((self._capacity,) + shape, dtype=dtype)
+        column[0:self._size] = default
+        self._columns[name] = column
+        self._defaults[name] = default
+
+    def _reserve(self, total):
+        """
+        Grow the columns to hold a number of particles.
+
+        :param total: Number of particles
+        :type total: int
+        """
+        if total <= self._capacity:
+            return
+        self._capacity = max(total, 2 * self._capacity)
+        for name, column in self._columns.items():
+            new = _np.empty((self._capacity,) + column.shape[1:], dtype=column.dtype)
+            new[0:self._size] = column[0:self._size]
+            self._columns[name] = new
+
+    def emit(self, count=1, **values):
+        """
+        Add particles. Values of the columns (position, velocity, ang_velocity, move,
+        rotate, lifetime...) are given by name, with one value for all the new particles
+        or one per particle; missing columns take their default value (at the origin,
+        still, all movements enabled, infinite lifetime).
+
+        :param count: Number of particles
+        :param values: Column values
+        :type count: int
+        :type values: object
+        :return: Indices of the new particles
+        :rtype: numpy.ndarray
+        """
+        for name in values:
+            if name not in self._columns:
+                raise Exception('Column {0} does not exist'.format(name))
+        start = self._size
+        self._reserve(start + count)
+        for name, column in self._columns.items():
+            column[start:start + count] = values[name] if name in values else self._defaults[name]
+        self._size += count
+        return _np.arange(start, start + count)
+
+    def kill(self, particles):
+        """
+        Remove particles, the columns are compacted keeping the order of the survivors.
+
+        :param particles: Boolean mask of the particles to remove, or their indices
+        :type particles: numpy.ndarray, list
+        :return: Number of removed particles
+        :rtype: int
+        """
+        n = self._size
+        particles = _np.asarray(particles)
+        if particles.size == 0:
+            return 0
+        if particles.dtype == _np.bool_:
+            keep = ~particles[0:n]
+        else:
+            keep = _np.ones(n, dtype=bool)
+            keep[particles.astype(_np.intp)] = False
+        alive = int(_np.count_nonzero(keep))
+        if alive == n:
+            return 0
+        for column in self._columns.values():
+            column[0:alive] = column[0:n][keep]
+        self._size = alive
+        return n - alive
+
+    def clear(self):
+        """
+        Remove all particles.
+        """
+        self._size = 0
+
+    def update(self, dt=1.0):
+        """
+        Update all the particles: rotate them around the x, y and z axes by their angular
+        velocity, move them by their velocity (in the enabled axes), increase their age
+        and remove the particles that reached their lifetime.
+
+        :param dt: Time step, velocities are per unit of time
+        :type dt: float, int
+        :return: Number of removed particles
+        :rtype: int
+        """
+        n = self._size
+        if n == 0:
+            return 0
+        position = self._columns['position'][0:n]
+        angles = _np.where(self._columns['rotate'][0:n], self._columns['ang_velocity'][0:n], 0.0)
+        if angles.any():
+            angles = _np.radians(angles * dt)
+            cos, sin = _np.cos(angles), _np.sin(angles)
+            x, y, z = position[:, 0], position[:, 1], position[:, 2]
+            y[:], z[:] = y * cos[:, 0] - z * sin[:, 0], y * sin[:, 0] + z * cos[:, 0]
+            x[:], z[:] = x * cos[:, 1] + z * sin[:, 1], -x * sin[:, 1] + z * cos[:, 1]
+            x[:], y[:] = x * cos[:, 2] - y * sin[:, 2], x * sin[:, 2] + y * cos[:, 2]
+        position += self._columns['velocity'][0:n] * self._columns['move'][0:n] * dt
+        age = self._columns['age'][0:n]
+        age += dt
+        dead = age >= self._columns['lifetime'][0:n]
+        if dead.any():
+            return self.kill(dead)
+        return 0
+
+    def add_property(self, name, dtype=float, default=0, shape=()):
+        """
+        Add a typed property column, existing particles take the default value. Values of
+        new particles can be given to emit by name.
+
+        :param name: Property name
+        :param dtype: Type, float, int, bool or a NumPy type
+        :param default: Value of the particles that do not define it
+        :param shape: Shape of each value, e.g. (3,) for vectors
+        :type name: basestring
+        :type dtype: type
+        :type default: object
+        :type shape: tuple
+        """
+        if name in self._columns:
+            raise Exception('Column {0} already exists'.format(name))
+        self._add_column(name, _PARTICLES_TYPES.get(dtype, dtype), tuple(shape), default)
+        self._properties.append(name)
+
+    def has_property(self, name):
+        """
+        Return true if a property column exists.
+
+        :param name: Property name
+        :type name: basestring
+        :return: Boolean
+        :rtype: bool
+        """
+        return name in self._properties
+
+    def get_properties(self):
+        """
+        Return the property names.
+
+        :return: Names
+        :rtype: list
+        """
+        return list(self._properties)
+
+    def get_property(self, name):
+        """
+        Return a property of the alive particles, see get_column.
+
+        :param name: Property name
+        :type name: basestring
+        :return: Column
+        :rtype: numpy.ndarray
+        """
+        return self.get_column(name)
+
+    def modify_property(self, name, value, operator=None, mask=None):
+        """
+        Modify a property (or any column) of all the particles, or of the particles
+        selected by mask, in a single vectorized call. Operators are the same as
+        Particle.modify_property; AND, OR and XOR are logical, and DIV is an integer
+        division in integer columns. The value is a scalar, one value per particle or one
+        per selected particle.
+
+        :param name: Property name
+        :param value: Value
+        :param operator: Operator, None replaces the values
+        :param mask: Boolean mask or indices of the particles, None selects all
+        :type name: basestring
+        :type value: object
+        :type operator: int, None
+        :type mask: numpy.ndarray, list, None
+        """
+        column = self.get_column(name)
+        if operator is not None:
+            self._get_operator(operator, column.dtype)
+        if mask is None:
+            if operator is None:
+                column[...] = value
+            else:
+                self._get_operator(operator, column.dtype)(column, value, out=column, casting='unsafe')
+            return
+        mask = _np.asarray(mask)
+        if _np.ndim(value) == column.ndim and _np.shape(value)[0:1] == (self._size,) and \
+                (mask.dtype != _np.bool_ or _np.count_nonzero(mask) != self._size):
+            value = _np.asarray(value)[mask]  # One value per particle
+        if operator is None:
+            column[mask] = value
+        else:
+            column[mask] = self._get_operator(operator, column.dtype)(column[mask], value)
+
+    @staticmethod
+    def _get_operator(operator, dtype):
+        """
+        Return the NumPy function of an operator for a column type.
+
+        :param operator: Operator
+        :param dtype: Column type
+        :type operator: int
+        :type dtype: numpy.dtype
+        :return: Function
+        :rtype: numpy.ufunc
+        """
+        if operator not in _PARTICLES_OPERATORS:
+            raise Exception('Invalid operator')
+        if operator == PARTICLES_OPERATOR_DIV and _np.issubdtype(dtype, _np.integer):
+            return _np.floor_divide
+        return _PARTICLES_OPERATORS[operator]
+
+    def get_column(self, name):
+        """
+        Return a column of the alive particles, it is a view that can be modified (until
+        particles are emitted or killed).
+
+        :param name: Column name
+        :type name: basestring
+        :return: Column
+        :rtype: numpy.ndarray
+        """
+        if name not in self._columns:
+            raise Exception('Column {0} does not exist'.format(name))
+        return self._columns[name][0:self._size]
+
+    def get_columns(self):
+        """
+        Return the column names.
+
+        :return: Names
+        :rtype: list
+        """
+        return list(self._columns.keys())
+
+    def get_positions(self):
+        """
+        Return the (n,3) positions of the alive particles.
+
+        :return: Positions
+        :rtype: numpy.ndarray
+        """
+        return self.get_column('position')
+
+    def get_particle(self, index):
+        """
+        Return a particle as a Particle object, whose position, velocities and movements
+        are read from and written to the columns.
+
+        :param index: Particle index
+        :type index: int
+        :return: Particle
+        :rtype: ParticleView
+        """
+        if not 0 <= index < self._size:
+            raise Exception('Particle {0} does not exist'.format(index))
+        return ParticleView(self, index)
+
+    def __getitem__(self, index):
+        """
+        Return a particle, see get_particle.
+
+        :param index: Particle index
+        :type index: int
+        :return: Particle
+        :rtype: ParticleView
+        """
+        return self.get_particle(index)
+
+    def __iter__(self):
+        """
+        Iterate over the particles as Particle objects.
+
+        :return: Iterator
+        """
+        for i in range(self._size):
+            yield ParticleView(self, i)
+
+    def __len__(self):
+        """
+        Return the number of alive particles.
+
+        :return: Number of particles
+        :rtype: int
+        """
+        return self._size
+
+
+class _ParticleRow(object):
+    """
+    Row of a particle system column with the accessors of Point3/Vector3 and list
+    indexing, used by ParticleView.
+    """
+
+    def __init__(self, system, column, index):
+        """
+        Constructor.
+
+        :param system: Particle system
+        :param column: Column name
+        :param index: Particle index
+        :type system: ParticleSystem
+        :type column: basestring
+        :type index: int
+        """
+        self._column = column
+        self._index = index
+        self._system = system
+
+    def _row(self):
+        """
+        Return the row, the column is looked up every time as it may have been reallocated.
+
+        :return: Row
+        :rtype: numpy.ndarray
+        """
+        if self._index >= len(self._system):
+            raise Exception('Particle {0} does not exist'.format(self._index))
+        return self._system._columns[self._column][self._index]
+
+    def get_x(self):
+        """
+        Return the x-component.
+
+        :return: Value
+        :rtype: float, bool
+        """
+        return self._row()[0].item()
+
+    def get_y(self):
+        """
+        Return the y-component.
+
+        :return: Value
+        :rtype: float, bool
+        """
+        return self._row()[1].item()
+
+    def get_z(self):
+        """
+        Return the z-component.
+
+        :return: Value
+        :rtype: float, bool
+        """
+        return self._row()[2].item()
+
+    def set_x(self, x):
+        """
+        Set the x-component.
+
+        :param x: Value
+        :type x: float, int, bool
+        """
+        self._row()[0] = x
+
+    def set_y(self, y):
+        """
+        Set the y-component.
+
+        :param y: Value
+        :type y: float, int, bool
+        """
+        self._row()[1] = y
+
+    def set_z(self, z):
+        """
+        Set the z-component.
+
+        :param z: Value
+        :type z: float, int, bool
+        """
+        self._row()[2] = z
+
+    def export_to_list(self):
+        """
+        Return the row as a list.
+
+        :return: Values
+        :rtype: list
+        """
+        return self._row().tolist()
+
+    def export_to_tuple(self):
+        """
+        Return the row as a tuple.
+
+        :return: Values
+        :rtype: tuple
+        """
+        return tuple(self._row().tolist())
+
+    def __getitem__(self, i):
+        """
+        Return a component.
+
+        :param i: Component index
+        :type i: int
+        :return: Value
+        :rtype: float, bool
+        """
+        return self._row()[i].item()
+
+    def __setitem__(self, i, value):
+        """
+        Set a component.
+
+        :param i: Component index
+        :param value: Value
+        :type i: int
+        :type value: float, int, bool
+        """
+        self._row()[i] = value
+
+
+class ParticleView(Particle):
+    """
+    Particle of a ParticleSystem, with the Particle API. Position, velocities,
+    movements and the properties added to the system are its columns; name, other
+    properties and bound functions are kept in the view. The view refers to an index,
+    which changes when particles before it are killed.
+    """
+
+    def __init__(self, system, index):
+        """
+        Constructor.
+
+        :param system: Particle system
+        :param index: Particle index
+        :type system: ParticleSystem
+        :type index: int
+        """
+        Particle.__init__(self)
+        self._angvel = _ParticleRow(system, 'ang_velocity', index)
+        self._boolrot = _ParticleRow(system, 'rotate', index)
+        self._boolvel = _ParticleRow(system, 'move', index)
+        self._index = index
+        self._position = _ParticleRow(system, 'position', index)
+        self._posVel = _ParticleRow(system, 'velocity', index)
+        self._system = system
+
+    def add_property(self, propname, value):
+        """
+        Add a property to the particle, if the system has a property column with that name
+        the value is written to it.
+
+        :param propname: Property name
+        :param value: Property value
+        :type propname: basestring, int
+        :type value: object
+        """
+        if self._system.has_property(propname):
+            self._system.get_property(propname)[self._index] = value
+        else:
+            Particle.add_property(self, propname, value)
+
+    def get_property(self, propname):
+        """
+        Return property value, from the system property columns or from the particle.
+
+        :param propname: Property name
+        :type propname: basestring, int
+        :return: object
+        """
+        if self._system.has_property(propname):
+            value = self._system.get_property(propname)[self._index]
+            return value.item() if value.ndim == 0 else value.copy()
+        return Particle.get_property(self, propname)
+
+    def modify_property(self, propname, newvalue, operator=None):
+        """
+        Modify an property, see Particle.modify_property. Properties of the system are
+        modified in its columns.
+
+        :param propname: Property name
+        :param newvalue: Property value
+        :param operator: Operator
+        :type propname: basestring, int
+        :type newvalue: object
+        :type operator: int
+        """
+        if self._system.has_property(propname):
+            column = self._system.get_property(propname)
+            if operator is None:
+                column[self._index] = newvalue
+            else:
+                column[self._index] = self._system._get_operator(operator, column.dtype)(column[self._index], newvalue)
+        else:
+            Particle.modify_property(self, propname, newvalue, operator)
+
+    def _get_prop_name(self):
+        """
+        Get all property names, of the system and of the particle.
+
+        :return: Property names
+        :rtype: list
+        """
+        return self._system.get_properties() + list(self._properties.keys())
+
+    def get_index(self):
+        """
+        Returns the index of the particle in the system.
+
+        :return: Index
+        :rtype: int
+        """
+        return self._index
+
+    def get_system(self):
+        """
+        Returns the particle system.
+
+        :return: Particle system
+        :rtype: ParticleSystem
+        """
+        return self._system
@@ -27,15 +27,255 @@ SOFTWARE.
 
 # Library imports
 from __future__ import print_function
-from ctypes import c_float as _cfloat
+from PyOpenGLtoolbox.mathlib import Matrix4 as _Matrix4
+from PyOpenGLtoolbox.utils import _load_arrays, _save_arrays
+import hashlib as _hashlib
+import numpy as _np
+import os as _os
+import re as _re
+import threading as _threading
+import time as _time
+
+try:
+    import queue as _queue
+except ImportError:
+    # noinspection PyUnresolvedReferences,PyPep8Naming
+    import Queue as _queue
 
 # noinspection PyPep8Naming
 import OpenGL.GL as _gl
+# noinspection PyPep8Naming
+import OpenGL.GL.ARB.parallel_shader_compile as _gl_arb_parallel
+# noinspection PyPep8Naming
+import OpenGL.GL.KHR.parallel_shader_compile as _gl_khr_parallel
 
 # Constants
+_SHADER_CACHE = [None]
+_SHADER_CACHE_EXT = '.glprog'
+_SHADER_COMMENTS = _re.compile(r'//[^\n]*|/\*.*?\*/', _re.S)
+_SHADER_COMPLETION_STATUS = 0x91b1  # GL_COMPLETION_STATUS_KHR, same value in ARB_parallel_shader_compile
 _SHADER_DEFAULT_PROGRAM = 0
 _SHADER_FRAGMENT = 0x01
+_SHADER_INCLUDE = _re.compile(r'^\s*#\s*include\s+["<]([^">]+)[">]\s*$')
+_SHADER_LOG_FORMATS = (
+    _re.compile(r'^(?P<file>\d+):(?P<line>\d+)\(\d+\)\s*:\s*(?P<severity>\w+)\s*:\s*(?P<message>.*)$'),  # Mesa
+    _re.compile(r'^(?P<file>\d+)\((?P<line>\d+)\)\s*:\s*(?P<severity>\w+)\s*\w*\s*:\s*(?P<message>.*)$'),  # NVIDIA
+    _re.compile(r'^(?P<severity>\w+)\s*:\s*(?P<file>\d+):(?P<line>\d+)\s*:\s*(?P<message>.*)$')  # AMD, Intel, ANGLE
+)
+_SHADER_MAX_COMPILER_THREADS = 0xffffffff  # Let the driver choose
+_SHADER_PARALLEL = [None]
+_SHADER_SAMPLER = ('glUniform1iv', 1, _np.int32, None)
+_SHADER_SOURCES = {}
+_SHADER_UNIFORMF = (None, 'glUniform1f', 'glUniform2f', 'glUniform3f', 'glUniform4f')
+_SHADER_UNIFORMI = (None, 'glUniform1i', 'glUniform2i', 'glUniform3i', 'glUniform4i')
+_SHADER_UNIFORMS = {}
+_SHADER_UNIFORM_TYPES = {
+    # type: (setter, components, dtype, matrix (rows, columns))
+    _gl.GL_BOOL: ('glUniform1iv', 1, _np.int32, None),
+    _gl.GL_BOOL_VEC2: ('glUniform2iv', 2, _np.int32, None),
+    _gl.GL_BOOL_VEC3: ('glUniform3iv', 3, _np.int32, None),
+    _gl.GL_BOOL_VEC4: ('glUniform4iv', 4, _np.int32, None),
+    _gl.GL_FLOAT: ('glUniform1fv', 1, _np.float32, None),
+    _gl.GL_FLOAT_MAT2: ('glUniformMatrix2fv', 4, _np.float32, (2, 2)),
+    _gl.GL_FLOAT_MAT2x3: ('glUniformMatrix2x3fv', 6, _np.float32, (3, 2)),
+    _gl.GL_FLOAT_MAT2x4: ('glUniformMatrix2x4fv', 8, _np.float32, (4, 2)),
+    _gl.GL_FLOAT_MAT3: ('glUniformMatrix3fv', 9, _np.float32, (3, 3)),
+    _gl.GL_FLOAT_MAT3x2: ('glUniformMatrix3x2fv', 6, _np.float32, (2, 3)),
+    _gl.GL_FLOAT_MAT3x4: ('glUniformMatrix3x4fv', 12, _np.float32, (4, 3)),
+    _gl.GL_FLOAT_MAT4: ('glUniformMatrix4fv', 16, _np.float32, (4, 4)),
+    _gl.GL_FLOAT_MAT4x2: ('glUniformMatrix4x2fv', 8, _np.float32, (2, 4)),
+    _gl.GL_FLOAT_MAT4x3: ('glUniformMatrix4x3fv', 12, _np.float32, (3, 4)),
+    _gl.GL_FLOAT_VEC2: ('glUniform2fv', 2, _np.float32, None),
+    _gl.GL_FLOAT_VEC3: ('glUniform3fv', 3, _np.float32, None),
+    _gl.GL_FLOAT_VEC4: ('glUniform4fv', 4, _np.float32, None),
+    _gl.GL_INT: ('glUniform1iv', 1, _np.int32, None),
+    _gl.GL_INT_SAMPLER_1D: _SHADER_SAMPLER,
+    _gl.GL_INT_SAMPLER_1D_ARRAY: _SHADER_SAMPLER,
+    _gl.GL_INT_SAMPLER_2D: _SHADER_SAMPLER,
+    _gl.GL_INT_SAMPLER_2D_ARRAY: _SHADER_SAMPLER,
+    _gl.GL_INT_SAMPLER_2D_MULTISAMPLE: _SHADER_SAMPLER,
+    _gl.GL_INT_SAMPLER_2D_MULTISAMPLE_ARRAY: _SHADER_SAMPLER,
+    _gl.GL_INT_SAMPLER_2D_RECT: _SHADER_SAMPLER,
+    _gl.GL_INT_SAMPLER_3D: _SHADER_SAMPLER,
+    _gl.GL_INT_SAMPLER_BUFFER: _SHADER_SAMPLER,
+    _gl.GL_INT_SAMPLER_CUBE: _SHADER_SAMPLER,
+    _gl.GL_INT_VEC2: ('glUniform2iv', 2, _np.int32, None),
+    _gl.GL_INT_VEC3: ('glUniform3iv', 3, _np.int32, None),
+    _gl.GL_INT_VEC4: ('glUniform4iv', 4, _np.int32, None),
+    _gl.GL_SAMPLER_1D: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_1D_ARRAY: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_1D_ARRAY_SHADOW: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_1D_SHADOW: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_2D: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_2D_ARRAY: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_2D_ARRAY_SHADOW: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_2D_MULTISAMPLE: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_2D_MULTISAMPLE_ARRAY: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_2D_RECT: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_2D_RECT_SHADOW: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_2D_SHADOW: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_3D: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_BUFFER: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_CUBE: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_CUBE_MAP_ARRAY: _SHADER_SAMPLER,
+    _gl.GL_SAMPLER_CUBE_SHADOW: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT: ('glUniform1uiv', 1, _np.uint32, None),
+    _gl.GL_UNSIGNED_INT_SAMPLER_1D: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT_SAMPLER_1D_ARRAY: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT_SAMPLER_2D: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT_SAMPLER_2D_ARRAY: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT_SAMPLER_2D_MULTISAMPLE: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT_SAMPLER_2D_MULTISAMPLE_ARRAY: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT_SAMPLER_2D_RECT: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT_SAMPLER_3D: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT_SAMPLER_BUFFER: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT_SAMPLER_CUBE: _SHADER_SAMPLER,
+    _gl.GL_UNSIGNED_INT_VEC2: ('glUniform2uiv', 2, _np.uint32, None),
+    _gl.GL_UNSIGNED_INT_VEC3: ('glUniform3uiv', 3, _np.uint32, None),
+    _gl.GL_UNSIGNED_INT_VEC4: ('glUniform4uiv', 4, _np.uint32, None)
+}
+_SHADER_VERSION = _re.compile(r'^\s*#\s*version\b')
 _SHADER_VERTEX = 0x02
+_SHADER_WATCHER = [None]
+_SHADER_WATCH_INTERVAL = 0.5
+
+
+def _read_source(path):
+    """
+    Return the contents of a source file, files are kept in memory until they are modified.
+
+    :param path: File
+    :type path: basestring
+    :return: Source code
+    :rtype: basestring
+    """
+    path = _os.path.abspath(path)
+    try:
+        mtime = _os.path.getmtime(path)
+    except OSError:
+        raise Exception('File {0} does not exist'.format(path))
+    if path not in _SHADER_SOURCES or _SHADER_SOURCES[path][0] != mtime:
+        with open(path) as f:
+            _SHADER_SOURCES[path] = (mtime, f.read())
+    return _SHADER_SOURCES[path][1]
+
+
+def _format_define(value):
+    """
+    Return the GLSL text of a define value.
+
+    :param value: Value
+    :type value: bool, int, float, basestring, None
+    :return: Value
+    :rtype: basestring
+    """
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _resolve_includes(source, path, include_dirs, included, stack):
+    """
+    Replace the #include directives of a source with the included files.
+
+    :param source: Source code
+    :param path: Source file, relative includes are searched in its folder first
+    :param include_dirs: Include folders
+    :param included: Files already included, each file is included once
+    :param stack: Files being included, to detect cycles
+    :type source: basestring
+    :type path: basestring, None
+    :type include_dirs: list
+    :type included: set
+    :type stack: list
+    :return: Source code
+    :rtype: basestring
+    """
+    lines = []
+    for line in source.splitlines():
+        match = _SHADER_INCLUDE.match(line)
+        if match is None:
+            lines.append(line)
+            continue
+        name = match.group(1)
+        folders = ([_os.path.dirname(path)] if path is not None else []) + list(include_dirs)
+        for folder in folders:
+            include = _os.path.abspath(_os.path.join(folder, name))
+            if _os.path.isfile(include):
+                break
+        else:
+            raise Exception('Include {0} not found in {1}'.format(name, path or 'source'))
+        if include in stack:
+            raise Exception('Include cycle: {0}'.format(' -> '.join(stack + [include])))
+        if include not in included:
+            included.add(include)
+            lines.append(_resolve_includes(_read_source(include), include, include_dirs, included, stack + [include]))
+    return '\n'.join(lines)
+
+
+def preprocess(source, path=None, defines=None, include_dirs=None, includes=None):
+    """
+    Preprocess a GLSL source: #include directives are replaced with the files (searched
+    in the folder of the source and then in include_dirs, each file is included once),
+    defines replace the value of existing #define directives or are added after #version,
+    and the output is normalized (no comments, trailing spaces or repeated blank lines)
+    so equal programs have the same hash.
+
+    :param source: Source code
+    :param path: Source file
+    :param defines: Defines, name: value (None defines the name without value)
+    :param include_dirs: Include folders
+    :param includes: Set that receives the included files
+    :type source: basestring
+    :type path: basestring, None
+    :type defines: dict, None
+    :type include_dirs: list, None
+    :type includes: set, None
+    :return: Source code
+    :rtype: basestring
+    """
+    if path is not None:
+        path = _os.path.abspath(path)
+    included = set() if includes is None else includes
+    source = _resolve_includes(source, path, include_dirs or [], included, [] if path is None else [path])
+    source = _SHADER_COMMENTS.sub(lambda m: '\n' * m.group(0).count('\n'), source)
+    lines = []
+    for line in source.splitlines():
+        line = line.rstrip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    while lines and not lines[-1]:
+        lines.pop()
+    if defines:
+        pending = []
+        for name in sorted(defines):
+            directive = '#define {0} {1}'.format(name, _format_define(defines[name])).rstrip()
+            pattern = _re.compile(r'^\s*#\s*define\s+{0}(\s|$)'.format(_re.escape(name)))
+            found = [i for i in range(len(lines)) if pattern.match(lines[i])]
+            for i in found:
+                lines[i] = directive
+            if not found:
+                pending.append(directive)
+        version = [i for i in range(len(lines)) if _SHADER_VERSION.match(lines[i])]
+        index = version[0] + 1 if version else 0
+        lines[index:index] = pending
+    return '\n'.join(lines) + '\n'
+
+
+def get_source_hash(source):
+    """
+    Return the hash of a preprocessed source.
+
+    :param source: Source code
+    :type source: basestring
+    :return: Hash
+    :rtype: basestring
+    """
+    return _hashlib.sha1(source.encode('utf-8')).hexdigest()
 
 
 class Shader(object):
@@ -43,22 +283,27 @@ class Shader(object):
     Shader class, can load an compile GLSL shaders.
     """
 
-    def __init__(self, path, shader_type, do_compile=False, format_list=None):
+    def __init__(self, path, shader_type, do_compile=False, format_list=None, defines=None, include_dirs=None):
         """
         Constructor.
 
         :param path: Shader path
         :param shader_type: Shader type
         :param do_compile: Compile after load
-        :param format_list: Format list
+        :param format_list: Format list, {0}, {1}... are replaced before preprocessing (use defines instead)
+        :param defines: Defines, see preprocess
+        :param include_dirs: Include folders, see preprocess
         :type path: basestring
         :type shader_type: int
         :type do_compile: bool
         :type format_list: list
+        :type defines: dict, None
+        :type include_dirs: list, None
         """
         if shader_type == _SHADER_FRAGMENT or shader_type == _SHADER_VERTEX:
             self._compiled = False
             self._file = str(self.load(path))
+            self._status = None
             self._path = path
             self._shader = None
             self._shader_type = shader_type
@@ -72,50 +317,100 @@ class Shader(object):
                         num += 1
                 else:
                     raise Exception('format_list must be list type')
+            self._includes = set()
+            self._file = preprocess(self._file, path, defines, include_dirs, self._includes)
+            self._hash = None
+            self._options = (format_list, defines, include_dirs)
         else:
             raise Exception('Shader invalid, must be FRAGMENT or VERTEX')
         if do_compile:
             self.compile()
 
+    def _submit(self):
+        """
+        Send the shader to the driver, the compile status is not queried so the driver
+        can compile it in the background.
+        """
+        if self.is_compiled():
+            raise Exception('File already been compiled')
+        if self._file is None:
+            raise Exception('File not loaded')
+        if self._shader_type == _SHADER_VERTEX:
+            self._shader = _gl.glCreateShader(_gl.GL_VERTEX_SHADER)
+        else:
+            self._shader = _gl.glCreateShader(_gl.GL_FRAGMENT_SHADER)
+        _gl.glShaderSource(self._shader, self._file)
+        _gl.glCompileShader(self._shader)
+        self._compiled = True
+        self._status = None
+
     def compile(self):
         """
-        Compiles loaded shader.
+        Compiles loaded shader, raises an exception with the info log if it fails.
+        """
+        self._submit()
+        if not self.get_compile_status():
+            raise Exception('Error compiling shader {0}:\n{1}'.format(self._path, _format_errors(self.get_errors())))
+
+    def get_compile_status(self):
+        """
+        Returns true if the shader was compiled successfully, waits for the driver.
+
+        :return: Compile status
+        :rtype: bool
+        """
+        if self._status is None:
+            self._status = bool(_np.ravel(_gl.glGetShaderiv(self.get_compiled(), _gl.GL_COMPILE_STATUS))[0])
+        return self._status
+
+    def is_ready(self):
+        """
+        Returns true if the driver has finished compiling the shader, without waiting when
+        parallel compilation is supported.
+
+        :return: Boolean
+        :rtype: bool
         """
         if not self.is_compiled():
-            if self._file is not None:
-                try:
-                    if self._shader_type == _SHADER_VERTEX:
-                        self._shader = _gl.glCreateShader(_gl.GL_VERTEX_SHADER)
-                    else:
-                        self._shader = _gl.glCreateShader(_gl.GL_FRAGMENT_SHADER)
-                    _gl.glShaderSource(self._shader, self._file)
-                    _gl.glCompileShader(self._shader)
-                    self._compiled = True
-                except:
-                    raise Exception('Error when compilin shader')
-            else:
-                raise Exception('File not loaded')
-        else:
-            raise Exception('File already been compiled')
+            return False
+        if self._status is not None or not _has_parallel_compile():
+            return True
+        return bool(_np.ravel(_gl.glGetShaderiv(self._shader, _SHADER_COMPLETION_STATUS))[0])
+
+    def get_log(self):
+        """
+        Returns the info log of the compiled shader.
+
+        :return: Info log
+        :rtype: basestring
+        """
+        log = _gl.glGetShaderInfoLog(self.get_compiled())
+        if isinstance(log, bytes):
+            log = log.decode('utf-8', 'replace')
+        return log.strip()
+
+    def get_errors(self):
+        """
+        Returns the info log as a list of entries with keys stage, file, line (of the
+        preprocessed source, None if unknown), severity, message and code (source line).
+
+        :return: Log entries
+        :rtype: list
+        """
+        stage = 'fragment' if self._shader_type == _SHADER_FRAGMENT else 'vertex'
+        return _parse_log(self.get_log(), stage, self._path, self._file)
 
     @staticmethod
     def load(path):
         """
-        Loads an file an turns into string.
+        Loads an file an turns into string, files are kept in memory until they are modified.
 
         :param path: File
         :type path: basestring
         :return: File as string
         :rtype: basestring
         """
-        try:
-            f = open(path)
-            program = ''
-            for i in f:
-                program += i
-            return program
-        except:
-            raise Exception('File {0} does not exist'.format(path))
+        return _read_source(path)
 
     def get_compiled(self):
         """
@@ -128,6 +423,45 @@ class Shader(object):
         else:
             raise Exception('Shader has not been compiled yet')
 
+    def get_source(self):
+        """
+        Returns the shader source, after preprocessing.
+
+        :return: Source code
+        :rtype: basestring
+        """
+        return self._file
+
+    def get_hash(self):
+        """
+        Returns the hash of the preprocessed source.
+
+        :return: Hash
+        :rtype: basestring
+        """
+        if self._hash is None:
+            self._hash = get_source_hash(self._file)
+        return self._hash
+
+    def get_dependencies(self):
+        """
+        Returns the shader file and the files it includes.
+
+        :return: Files
+        :rtype: list
+        """
+        return [self._path] + sorted(self._includes)
+
+    def copy(self):
+        """
+        Returns a new shader loaded from the same files with the same options, the files
+        are read again if they have been modified.
+
+        :return: Shader
+        :rtype: Shader
+        """
+        return Shader(self._path, self._shader_type, False, *self._options)
+
     def get_type(self):
         """
         Return shader type.
@@ -179,26 +513,186 @@ class Shader(object):
         print(self._file)
 
 
+class _Uniform(object):
+    """
+    Active uniform of a program and the last value uploaded to it.
+    """
+
+    def __init__(self, location, uniform_type, size, values=None, ready=None):
+        """
+        Constructor.
+
+        :param location: Uniform location
+        :param uniform_type: OpenGL type, None if unknown
+        :param size: Number of elements
+        :param values: Last values, a view of the array values if the uniform is an element
+        :param ready: Elements that have been uploaded
+        :type location: int
+        :type uniform_type: int, None
+        :type size: int
+        :type values: numpy.ndarray, None
+        :type ready: numpy.ndarray, None
+        """
+        self.location = location
+        self.size = size
+        self.type = uniform_type
+        if uniform_type in _SHADER_UNIFORM_TYPES:
+            self.setter, self.components, self.dtype, self.matrix = _SHADER_UNIFORM_TYPES[uniform_type]
+            if values is None:
+                values = _np.zeros(size * self.components, dtype=self.dtype)
+                ready = _np.zeros(size, dtype=bool)
+        self.ready = ready
+        self.values = values
+
+    def set(self, value):
+        """
+        Upload a value if it differs from the last one. Matrices with (rows, columns)
+        shape are row-major, flat values are column-major (OpenGL order).
+
+        :param value: Value, or array of values if the uniform is an array
+        :type value: int, float, list, tuple, numpy.ndarray, Matrix4
+        :return: True if the value was uploaded
+        :rtype: bool
+        """
+        if self.values is None:
+            raise Exception('Uniform type {0} is not supported'.format(self.type))
+        if isinstance(value, _Matrix4):
+            value = value.get_array()
+        value = _np.asarray(value, dtype=self.dtype)
+        if self.matrix is not None and value.ndim >= 2 and value.shape[-2:] == self.matrix:
+            value = value.swapaxes(-1, -2)
+        count = value.size // self.components
+        if count == 0 or count * self.components != value.size or count > self.size:
+            raise Exception('Invalid value of {0} elements for an uniform of {1} components and size {2}'.format(
+                value.size, self.components, self.size))
+        values = self.values[0:value.size].reshape(value.shape)
+        if self.ready[0:count].all() and _np.array_equal(values, value):
+            return False
+        _np.copyto(values, value)
+        self.ready[0:count] = True
+        if self.matrix is not None:
+            getattr(_gl, self.setter)(self.location, count, _gl.GL_FALSE, self.values)
+        else:
+            getattr(_gl, self.setter)(self.location, count, self.values)
+        return True
+
+
+class _ProgramUniforms(object):
+    """
+    Uniforms of a linked program, introspected with glGetActiveUniform. It is shared by
+    all the ShaderProgram objects that use the same OpenGL program.
+    """
+
+    def __init__(self, program):
+        """
+        Constructor.
+
+        :param program: Program object
+        :type program: int
+        """
+        self._program = program
+        self._uniforms = {}
+        self.explicit = {}  # Values set with uniformf/uniformi, name: (setters, values)
+        total = int(_np.ravel(_gl.glGetProgramiv(program, _gl.GL_ACTIVE_UNIFORMS))[0])
+        for i in range(total):
+            name, size, uniform_type = _gl.glGetActiveUniform(program, i)
+            if isinstance(name, bytes):
+                name = name.decode('utf-8')
+            location = _gl.glGetUniformLocation(program, name)
+            if location == -1:  # Uniform block members
+                continue
+            uniform = _Uniform(location, int(uniform_type), int(size))
+            self._uniforms[name] = uniform
+            if name.endswith('[0]'):
+                self._uniforms[name[0:-3]] = uniform
+
+    def get(self, name):
+        """
+        Return an uniform, elements of arrays (e.g. texture[1]) share the values of their
+        array.
+
+        :param name: Uniform name
+        :type name: basestring
+        :return: Uniform, None if it is not active
+        :rtype: _Uniform, None
+        """
+        if name in self._uniforms:
+            return self._uniforms[name]
+        uniform = None
+        location = _gl.glGetUniformLocation(self._program, name)
+        if location != -1:
+            base, _, index = name.rpartition('[')
+            parent = self._uniforms.get(base)
+            if parent is not None and parent.values is not None and index[0:-1].isdigit():
+                i = int(index[0:-1])
+                uniform = _Uniform(location, parent.type, parent.size - i, parent.values[i * parent.components:],
+                                   parent.ready[i:])
+            else:
+                uniform = _Uniform(location, None, 1)
+        self._uniforms[name] = uniform
+        return uniform
+
+    def apply_to(self, uniforms):
+        """
+        Set the uploaded values in the uniforms of another program, which must be in
+        use. Uniforms whose type changed or that are no longer active are skipped.
+
+        :param uniforms: Program uniforms
+        :type uniforms: _ProgramUniforms
+        """
+        for name, uniform in self._uniforms.items():
+            if uniform is None or uniform.values is None or name.endswith(']') or not uniform.ready.any():
+                continue
+            target = uniforms.get(name)
+            if target is not None and target.type == uniform.type:
+                size = min(uniform.size, target.size)
+                target.set(uniform.values[0:size * uniform.components])
+        for name, (setters, vals) in self.explicit.items():
+            target = uniforms.get(name)
+            if target is not None:
+                getattr(_gl, setters[len(vals)])(target.location, *vals)
+                uniforms.explicit[name] = (setters, vals)
+
+    def get_active(self):
+        """
+        Return the introspected uniforms.
+
+        :return: Dictionary name: (location, type, size)
+        :rtype: dict
+        """
+        return dict((name, (u.location, u.type, u.size)) for name, u in self._uniforms.items()
+                    if u is not None and u.values is not None)
+
+
 class ShaderProgram(object):
     """
     ShaderProgram class, contains fragment and shader code that runs in background.
     """
 
-    def __init__(self, vertex_shader=None, fragment_shader=None, do_compile=False):
+    def __init__(self, vertex_shader=None, fragment_shader=None, do_compile=False, cache=None, attributes=None):
         """
         Constructor.
 
         :param vertex_shader: Vertex shader
         :param fragment_shader: Fragment shader
         :param do_compile: Compile instantly
+        :param cache: Shader cache, the program is taken from it if it has the same sources
+        :param attributes: Attribute locations, name: location, bound before linking
         :type vertex_shader: Shader
         :type fragment_shader: Shader
         :type do_compile: bool
+        :type cache: ShaderCache, None
+        :type attributes: dict, None
         """
+        self._attributes = dict(attributes or {})
+        self._cache = cache
+        self._cache_key = None
         self._compiled = False
         self._enabled = True
+        self._errors = []
         self._fshader = None
         self._name = 'unnamed'
+        self._pending = False
         self._program = None
         self._vshader = None
         if vertex_shader is not None or fragment_shader is not None:
@@ -255,24 +749,119 @@ class ShaderProgram(object):
         else:
             raise Exception('vertex must be Shader object')
 
+    def _submit(self):
+        """
+        Send the shaders to the driver and link them without waiting, the program is
+        taken from the cache if it has the same sources.
+        """
+        if self.is_compiled():
+            raise Exception('Program already been compiled')
+        self._errors = []
+        self._compiled = True
+        if self._cache is not None:
+            self._cache_key = self._cache.get_key([self._vshader.get_source(), self._fshader.get_source()] +
+                                                  _get_attribute_sources(self._attributes))
+            self._program = self._cache._find(self._cache_key)
+            if self._program is not None:
+                return
+        self._program = _submit_program(self._vshader, self._fshader, self._cache is not None and
+                                        self._cache._cache_dir is not None, self._attributes)
+        self._pending = True
+
+    def _finish(self):
+        """
+        Wait for the submitted program and check its link status, raises an exception with
+        the info log if it failed.
+        """
+        if not self._pending:
+            return
+        self._pending = False
+        self._errors = _check_program(self._program, self._vshader, self._fshader)
+        if self._errors:
+            self._compiled = False
+            self._program = None
+            raise Exception('Error linking program {0}:\n{1}'.format(self._name, _format_errors(self._errors)))
+        _gl.glValidateProgram(self._program)
+        if self._cache_key is not None:
+            self._cache._add(self._cache_key, self._program)
+
     def compile(self):
         """
-        Compiles.
+        Compiles, raises an exception with the info log if the program cannot be linked.
         """
-        if not self.is_compiled():
-            self._program = _gl.glCreateProgram()
-            _gl.glAttachShader(self._program, self._fshader.get_compiled())
-            _gl.glAttachShader(self._program, self._vshader.get_compiled())
+        self._submit()
+        self._finish()
 
-            _gl.glValidateProgram(self._program)
-            _gl.glLinkProgram(self._program)
+    def is_ready(self):
+        """
+        Returns true if the program has been compiled and linked, or has failed, without
+        waiting for the driver when parallel compilation is supported. Useful to keep
+        loading screens responsive, see compile_programs.
 
-            _gl.glDeleteShader(self._fshader.get_compiled())
-            _gl.glDeleteShader(self._vshader.get_compiled())
+        :return: Boolean
+        :rtype: bool
+        """
+        if not self._pending:
+            return self._compiled or bool(self._errors)
+        if not _has_parallel_compile():
+            return True
+        return bool(_np.ravel(_gl.glGetProgramiv(self._program, _SHADER_COMPLETION_STATUS))[0])
 
-            self._compiled = True
-        else:
-            raise Exception('Program already been compiled')
+    def get_errors(self):
+        """
+        Returns the log entries of the last failed compile, see Shader.get_errors.
+
+        :return: Log entries
+        :rtype: list
+        """
+        return list(self._errors)
+
+    def reload(self, vertex, fragment):
+        """
+        Replace the shaders and swap to the new program, must be called from the OpenGL
+        context thread between frames. The uniform values are set again in the new
+        program; if it cannot be linked the current program is kept.
+
+        :param vertex: Vertex shader
+        :param fragment: Fragment shader
+        :type vertex: Shader
+        :type fragment: Shader
+        :return: Error log, None if the program was swapped
+        :rtype: basestring, None
+        """
+        # noinspection PyBroadException
+        try:
+            if self._cache is not None:
+                program = self._cache.get_program(vertex, fragment, self._attributes)
+            else:
+                program = _link_program(vertex, fragment, attributes=self._attributes)
+        except Exception as e:
+            return str(e)
+        old = self.get_compiled() if self.is_compiled() else None
+        self._vshader, self._fshader = vertex, fragment
+        self._program, self._compiled = program, True
+        if program == old:
+            return None
+        current = int(_np.ravel(_gl.glGetIntegerv(_gl.GL_CURRENT_PROGRAM))[0])
+        if old in _SHADER_UNIFORMS:
+            _gl.glUseProgram(program)
+            _SHADER_UNIFORMS[old].apply_to(self._get_uniforms())
+            _gl.glUseProgram(program if current == old else current)
+        elif current == old:
+            _gl.glUseProgram(program)
+        if old is not None and self._cache is None:
+            _SHADER_UNIFORMS.pop(old, None)
+            _gl.glDeleteProgram(old)
+        return None
+
+    def watch(self, watcher=None):
+        """
+        Reload the program when its files change, see ShaderWatcher.
+
+        :param watcher: Shader watcher, None uses the shared one (see reload_shaders)
+        :type watcher: ShaderWatcher, None
+        """
+        (get_shader_watcher() if watcher is None else watcher).watch(self)
 
     def is_compiled(self):
         """
@@ -285,11 +874,12 @@ class ShaderProgram(object):
 
     def get_compiled(self):
         """
-        Returns compiled program.
+        Returns compiled program, waits for the driver if it was compiled in the background.
 
         :return: Program
         """
         if self.is_compiled():
+            self._finish()
             return self._program
         else:
             raise Exception('Program has not been compiled yet')
@@ -343,9 +933,10 @@ class ShaderProgram(object):
         Start program.
         """
         if self.is_compiled():
+            program = self.get_compiled()
             try:
                 if self._enabled:
-                    _gl.glUseProgram(self._program)
+                    _gl.glUseProgram(program)
             except:
                 raise Exception('Error executing program')
         else:
@@ -381,6 +972,81 @@ class ShaderProgram(object):
         """
         return self._enabled
 
+    def _get_uniforms(self):
+        """
+        Return the uniforms of the program.
+
+        :return: Program uniforms
+        :rtype: _ProgramUniforms
+        """
+        program = self.get_compiled()
+        if program not in _SHADER_UNIFORMS:
+            _SHADER_UNIFORMS[program] = _ProgramUniforms(program)
+        return _SHADER_UNIFORMS[program]
+
+    def get_uniforms(self):
+        """
+        Return the active uniforms of the program.
+
+        :return: Dictionary name: (location, type, size)
+        :rtype: dict
+        """
+        return self._get_uniforms().get_active()
+
+    def get_uniform_location(self, n):
+        """
+        Return the location of an uniform, the locations are cached.
+
+        :param n: Uniform name
+        :type n: basestring
+        :return: Location, -1 if the uniform is not active
+        :rtype: int
+        """
+        uniform = self._get_uniforms().get(n)
+        return -1 if uniform is None else uniform.location
+
+    def set_uniform(self, n, value):
+        """
+        Set an uniform with its own type, the program must be in use. Values can be
+        numbers, sequences or NumPy arrays of vectors, matrices or arrays of them; the
+        OpenGL call is skipped if the value has not changed since the last upload.
+
+        :param n: Uniform name
+        :param value: Value
+        :type n: basestring
+        :type value: int, float, list, tuple, numpy.ndarray, Matrix4
+        :return: True if the value was uploaded
+        :rtype: bool
+        """
+        if not self.get_status():
+            return False
+        uniforms = self._get_uniforms()
+        uniform = uniforms.get(n)
+        if uniform is None:
+            return False
+        uniforms.explicit.pop(n, None)
+        return uniform.set(value)
+
+    def _set_uniform_values(self, n, setters, vals):
+        """
+        Set an uniform with an explicit function, the cached value is discarded.
+
+        :param n: Uniform name
+        :param setters: OpenGL functions by number of values
+        :param vals: Values
+        :type n: basestring
+        :type setters: tuple
+        :type vals: tuple
+        """
+        uniforms = self._get_uniforms()
+        uniform = uniforms.get(n)
+        if uniform is None:
+            return
+        if uniform.ready is not None:
+            uniform.ready[0] = False
+        getattr(_gl, setters[len(vals)])(uniform.location, *vals)
+        uniforms.explicit[n] = (setters, vals)
+
     def uniformf(self, n, *vals):
         """
         Binds an uniform float value to the program.
@@ -389,11 +1055,7 @@ class ShaderProgram(object):
         :param vals: Value
         """
         if len(vals) in range(1, 5) and self.get_status():
-            {1: _gl.glUniform1f,
-             2: _gl.glUniform2f,
-             3: _gl.glUniform3f,
-             4: _gl.glUniform4f
-             }[len(vals)](_gl.glGetUniformLocation(self._program, n), *vals)
+            self._set_uniform_values(n, _SHADER_UNIFORMF, vals)
 
     def uniformi(self, n, *vals):
         """
@@ -403,41 +1065,801 @@ class ShaderProgram(object):
         :param vals: Value
         """
         if len(vals) in range(1, 5) and self.get_status():
-            {1: _gl.glUniform1i,
-             2: _gl.glUniform2i,
-             3: _gl.glUniform3i,
-             4: _gl.glUniform4i
-             }[len(vals)](_gl.glGetUniformLocation(self._program, n), *vals)
+            self._set_uniform_values(n, _SHADER_UNIFORMI, vals)
 
     def uniform_matrixf(self, n, mat):
         """
         Binds an uniform matrix value to the program.
 
         :param n: Index
-        :param mat: Matrix
+        :param mat: Matrix, or 16 column-major values
+        :type mat: Matrix4, list, tuple, numpy.ndarray
         """
-        if self.get_status():
-            loc = _gl.glGetUniformLocation(self._program, n)
-            # noinspection PyCallingNonCallable,PyTypeChecker
-            _gl.glUniformMatrix4fv(loc, 1, False, (_cfloat * 16)(*mat))
+        self.set_uniform(n, mat)
+
+
+def _has_parallel_compile():
+    """
+    Return true if the context compiles shaders in parallel (KHR or ARB
+    parallel_shader_compile), the number of compiler threads is left to the driver.
+
+    :return: Boolean
+    :rtype: bool
+    """
+    if _SHADER_PARALLEL[0] is None:
+        extensions = []
+        # noinspection PyBroadException
+        try:
+            extensions = (_gl.glGetString(_gl.GL_EXTENSIONS) or b'').split()
+        except Exception:  # Core profile, extensions are listed one by one
+            # noinspection PyBroadException
+            try:
+                total = int(_np.ravel(_gl.glGetIntegerv(_gl.GL_NUM_EXTENSIONS))[0])
+                extensions = [_gl.glGetStringi(_gl.GL_EXTENSIONS, i) for i in range(total)]
+            except Exception:
+                pass
+        _SHADER_PARALLEL[0] = False
+        for name, module, function in ((b'GL_KHR_parallel_shader_compile', _gl_khr_parallel,
+                                        'glMaxShaderCompilerThreadsKHR'),
+                                       (b'GL_ARB_parallel_shader_compile', _gl_arb_parallel,
+                                        'glMaxShaderCompilerThreadsARB')):
+            if name in extensions:
+                if bool(getattr(module, function)):
+                    getattr(module, function)(_SHADER_MAX_COMPILER_THREADS)
+                _SHADER_PARALLEL[0] = True
+                break
+    return _SHADER_PARALLEL[0]
+
+
+def _parse_log(log, stage, path=None, source=None):
+    """
+    Split an info log in entries, the formats of Mesa, NVIDIA, AMD and Intel are known.
+
+    :param log: Info log
+    :param stage: Stage name (vertex, fragment, program)
+    :param path: Source file
+    :param source: Source code, to add the line of each entry
+    :type log: basestring
+    :type stage: basestring
+    :type path: basestring, None
+    :type source: basestring, None
+    :return: Entries with keys stage, file, line, severity, message and code
+    :rtype: list
+    """
+    lines = source.splitlines() if source is not None else []
+    entries = []
+    for text in log.splitlines():
+        text = text.strip()
+        if not text:
+            continue
+        entry = {'stage': stage, 'file': path, 'line': None, 'severity': None, 'message': text, 'code': None}
+        for log_format in _SHADER_LOG_FORMATS:
+            match = log_format.match(text)
+            if match is not None:
+                entry['line'] = int(match.group('line'))
+                entry['severity'] = match.group('severity').lower()
+                entry['message'] = match.group('message')
+                if 0 < entry['line'] <= len(lines):
+                    entry['code'] = lines[entry['line'] - 1].strip()
+                break
+        else:
+            for severity in ('error', 'warning', 'info'):
+                entry['severity'] = severity
+                if severity in text.lower():
+                    break
+        entries.append(entry)
+    return entries
+
+
+def _format_errors(errors):
+    """
+    Return the text of a list of log entries.
+
+    :param errors: Log entries, see _parse_log
+    :type errors: list
+    :return: Text
+    :rtype: basestring
+    """
+    lines = []
+    for e in errors:
+        where = e['file'] or e['stage']
+        if e['line'] is not None:
+            where += ':{0}'.format(e['line'])
+        lines.append('{0}: {1}: {2}'.format(where, e['severity'], e['message']))
+        if e['code']:
+            lines.append('    ' + e['code'])
+    return '\n'.join(lines)
+
+
+def _get_program_log(program):
+    """
+    Return the info log of a program.
+
+    :param program: Program object
+    :type program: int
+    :return: Info log
+    :rtype: basestring
+    """
+    log = _gl.glGetProgramInfoLog(program)
+    if isinstance(log, bytes):
+        log = log.decode('utf-8', 'replace')
+    return log.strip()
+
+
+def _is_linked(program):
+    """
+    Return true if a program has been linked successfully.
+
+    :param program: Program object
+    :type program: int
+    :return: Link status
+    :rtype: bool
+    """
+    return bool(_np.ravel(_gl.glGetProgramiv(program, _gl.GL_LINK_STATUS))[0])
 
 
-def load_shader(shaderpath, shadername, vertex_format_list=None, fragment_formatlist=None):
+def _get_attribute_sources(attributes):
     """
-    Loads an shader.
+    Return the attribute locations as cache key sources, programs linked with other
+    locations are different programs.
+
+    :param attributes: Attribute locations, name: location
+    :type attributes: dict, None
+    :return: Key sources, empty if there are no attributes
+    :rtype: list
+    """
+    if not attributes:
+        return []
+    return [';'.join('{0}={1}'.format(name, attributes[name]) for name in sorted(attributes))]
+
+
+def _submit_program(vertex, fragment, retrievable=False, attributes=None):
+    """
+    Send two shaders to the driver and link them, the status is not queried so the
+    driver can compile them in the background.
+
+    :param vertex: Vertex shader
+    :param fragment: Fragment shader
+    :param retrievable: Allow glGetProgramBinary
+    :param attributes: Attribute locations, name: location, bound before linking
+    :type vertex: Shader
+    :type fragment: Shader
+    :type retrievable: bool
+    :type attributes: dict, None
+    :return: Program object
+    :rtype: int
+    """
+    for shader in (vertex, fragment):
+        if not shader.is_compiled():
+            shader._submit()
+    program = _gl.glCreateProgram()
+    _gl.glAttachShader(program, fragment.get_compiled())
+    _gl.glAttachShader(program, vertex.get_compiled())
+    if retrievable and bool(_gl.glProgramParameteri):
+        _gl.glProgramParameteri(program, _gl.GL_PROGRAM_BINARY_RETRIEVABLE_HINT, _gl.GL_TRUE)
+    for name in sorted(attributes or {}):
+        _gl.glBindAttribLocation(program, attributes[name], name)
+    _gl.glLinkProgram(program)
+    return program
+
+
+def _check_program(program, vertex, fragment):
+    """
+    Wait for a submitted program and check its link status, the shaders are released
+    and the program is deleted if it failed.
+
+    :param program: Program object
+    :param vertex: Vertex shader
+    :param fragment: Fragment shader
+    :type program: int
+    :type vertex: Shader
+    :type fragment: Shader
+    :return: Log entries of the failed stages, empty if the program was linked
+    :rtype: list
+    """
+    errors = []
+    if not _is_linked(program):
+        for shader in (vertex, fragment):
+            if not shader.get_compile_status():
+                errors += shader.get_errors()
+        if not errors:  # Compiled, but the interface of the stages does not match
+            errors = _parse_log(_get_program_log(program), 'program')
+    _gl.glDeleteShader(fragment.get_compiled())
+    _gl.glDeleteShader(vertex.get_compiled())
+    if errors:
+        _gl.glDeleteProgram(program)
+    return errors
+
+
+def _link_program(vertex, fragment, retrievable=False, attributes=None):
+    """
+    Compile two shaders and link them, raises an exception with the info log if the
+    program cannot be linked.
+
+    :param vertex: Vertex shader
+    :param fragment: Fragment shader
+    :param retrievable: Allow glGetProgramBinary
+    :param attributes: Attribute locations, name: location, bound before linking
+    :type vertex: Shader
+    :type fragment: Shader
+    :type retrievable: bool
+    :type attributes: dict, None
+    :return: Program object
+    :rtype: int
+    """
+    program = _submit_program(vertex, fragment, retrievable, attributes)
+    errors = _check_program(program, vertex, fragment)
+    if errors:
+        raise Exception('Error linking program {0}, {1}:\n{2}'.format(vertex.get_path(), fragment.get_path(),
+                                                                       _format_errors(errors)))
+    return program
+
+
+class ShaderCache(object):
+    """
+    Cache of linked programs. Programs are keyed by the hash of their sources and the
+    OpenGL vendor, renderer and version, and reused inside the process. If cache_dir is
+    defined the program binaries are stored with glGetProgramBinary and restored with
+    glProgramBinary on later runs; binaries rejected by the driver (updates, other GPU)
+    are removed and the program is compiled again.
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Constructor.
+
+        :param cache_dir: Program binary folder, None keeps the programs only in memory
+        :type cache_dir: basestring, None
+        """
+        self._cache_dir = cache_dir
+        self._programs = {}
+        self._stats = {'compiled': 0, 'disk': 0, 'memory': 0}
+
+    @staticmethod
+    def get_key(sources):
+        """
+        Return the key of a list of sources in the current context.
+
+        :param sources: Shader sources
+        :type sources: list
+        :return: Key
+        :rtype: basestring
+        """
+        digest = _hashlib.sha1()
+        for name in (_gl.GL_VENDOR, _gl.GL_RENDERER, _gl.GL_VERSION):
+            digest.update(_gl.glGetString(name) or b'')
+            digest.update(b'\0')
+        for source in sources:
+            digest.update(source.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get_program(self, vertex, fragment, attributes=None):
+        """
+        Return the linked program of a vertex and fragment shader, the shaders are only
+        compiled if the program is not cached.
+
+        :param vertex: Vertex shader
+        :param fragment: Fragment shader
+        :param attributes: Attribute locations, name: location, bound before linking
+        :type vertex: Shader
+        :type fragment: Shader
+        :type attributes: dict, None
+        :return: Program object
+        :rtype: int
+        """
+        key = self.get_key([vertex.get_source(), fragment.get_source()] + _get_attribute_sources(attributes))
+        program = self._find(key)
+        if program is None:
+            program = self._link(vertex, fragment, attributes)
+            self._add(key, program)
+        return program
+
+    def _find(self, key):
+        """
+        Return a cached program, from memory or from its stored binary.
+
+        :param key: Program key
+        :type key: basestring
+        :return: Program object, None if it is not cached
+        :rtype: int, None
+        """
+        if key in self._programs:
+            self._stats['memory'] += 1
+            return self._programs[key]
+        program = self._load_binary(key)
+        if program is not None:
+            self._stats['disk'] += 1
+            self._programs[key] = program
+        return program
+
+    def _add(self, key, program):
+        """
+        Add a linked program to the cache.
+
+        :param key: Program key
+        :param program: Program object
+        :type key: basestring
+        :type program: int
+        """
+        self._save_binary(key, program)
+        self._stats['compiled'] += 1
+        self._programs[key] = program
+
+    def _get_path(self, key):
+        """
+        Return the binary file of a key.
+
+        :param key: Program key
+        :type key: basestring
+        :return: File path
+        :rtype: basestring
+        """
+        return _os.path.join(self._cache_dir, key + _SHADER_CACHE_EXT)
+
+    def _load_binary(self, key):
+        """
+        Create a program from its stored binary.
+
+        :param key: Program key
+        :type key: basestring
+        :return: Program object, None if there is no valid binary
+        :rtype: int, None
+        """
+        if self._cache_dir is None or not bool(_gl.glProgramBinary):
+            return None
+        path = self._get_path(key)
+        if not _os.path.isfile(path):
+            return None
+        program = _gl.glCreateProgram()
+        # noinspection PyBroadException
+        try:
+            arrays, meta = _load_arrays(path, mmap=False)
+            binary = arrays['binary']
+            _gl.glProgramBinary(program, meta['format'], binary, binary.size)
+            if _is_linked(program):
+                return program
+        except Exception:
+            pass
+        _gl.glDeleteProgram(program)
+        _os.remove(path)
+        return None
+
+    def _link(self, vertex, fragment, attributes=None):
+        """
+        Compile the shaders and link them.
+
+        :param vertex: Vertex shader
+        :param fragment: Fragment shader
+        :param attributes: Attribute locations, name: location, bound before linking
+        :type vertex: Shader
+        :type fragment: Shader
+        :type attributes: dict, None
+        :return: Program object
+        :rtype: int
+        """
+        return _link_program(vertex, fragment, self._cache_dir is not None, attributes)
+
+    def _save_binary(self, key, program):
+        """
+        Store the binary of a program.
+
+        :param key: Program key
+        :param program: Program object
+        :type key: basestring
+        :type program: int
+        """
+        if self._cache_dir is None or not bool(_gl.glGetProgramBinary):
+            return
+        size = int(_np.ravel(_gl.glGetProgramiv(program, _gl.GL_PROGRAM_BINARY_LENGTH))[0])
+        if size == 0:  # The driver does not support program binaries
+            return
+        binary = _np.empty(size, dtype=_np.uint8)
+        length = _np.zeros(1, dtype=_np.int32)
+        binary_format = _np.zeros(1, dtype=_np.uint32)
+        _gl.glGetProgramBinary(program, size, length, binary_format, binary)
+        _save_arrays(self._get_path(key), {'binary': binary[0:int(length[0])]}, {'format': int(binary_format[0])})
+
+    def get_stats(self):
+        """
+        Return the number of programs taken from memory, from disk and compiled.
+
+        :return: Statistics
+        :rtype: dict
+        """
+        return dict(self._stats)
+
+    def __len__(self):
+        """
+        Return the number of programs in memory.
+
+        :return: Number of programs
+        :rtype: int
+        """
+        return len(self._programs)
+
+
+def get_shader_cache():
+    """
+    Return the shared shader cache, by default it keeps the programs only in memory.
+
+    :return: Shader cache
+    :rtype: ShaderCache
+    """
+    if _SHADER_CACHE[0] is None:
+        _SHADER_CACHE[0] = ShaderCache()
+    return _SHADER_CACHE[0]
+
+
+def set_shader_cache(cache):
+    """
+    Set the shared shader cache, e.g. ShaderCache(cache_dir) to store program binaries.
+
+    :param cache: Shader cache
+    :type cache: ShaderCache
+    """
+    _SHADER_CACHE[0] = cache
+
+
+def load_shader(shaderpath, shadername, vertex_format_list=None, fragment_formatlist=None, cache=None, defines=None,
+                include_dirs=None, attributes=None):
+    """
+    Loads an shader. Programs with the same sources are compiled once, see ShaderCache.
 
     :param shaderpath: Shader path
     :param shadername: Shader name
     :param vertex_format_list: Vertex format list
     :param fragment_formatlist: Fragment format list
+    :param cache: Shader cache, None uses the shared one
+    :param defines: Defines of both shaders, see preprocess
+    :param include_dirs: Include folders, see preprocess
+    :param attributes: Attribute locations, name: location, bound before linking
     :type shaderpath: basestring
     :type shadername: basestring
     :type vertex_format_list: list
     :type fragment_formatlist: list
+    :type cache: ShaderCache, None
+    :type defines: dict, None
+    :type include_dirs: list, None
+    :type attributes: dict, None
     :return: ShaderProgram object
     :rtype: ShaderProgram
     """
     shadername = shadername.replace('.fsh', '').replace('.vsh', '')
-    fragment = Shader(shaderpath + shadername + '.fsh', _SHADER_FRAGMENT, True, fragment_formatlist)
-    vertex = Shader(shaderpath + shadername + '.vsh', _SHADER_VERTEX, True, vertex_format_list)
-    return ShaderProgram(vertex, fragment, True)
+    fragment = Shader(shaderpath + shadername + '.fsh', _SHADER_FRAGMENT, False, fragment_formatlist, defines,
+                      include_dirs)
+    vertex = Shader(shaderpath + shadername + '.vsh', _SHADER_VERTEX, False, vertex_format_list, defines, include_dirs)
+    if cache is None:
+        cache = get_shader_cache()
+    return ShaderProgram(vertex, fragment, True, cache, attributes)
+
+
+def compile_programs(programs, wait=True):
+    """
+    Compile many programs. All the shaders are compiled and linked before any status is
+    queried, so drivers with parallel_shader_compile compile them at the same time. If
+    wait is False it returns at once; poll ShaderProgram.is_ready (e.g. from a loading
+    screen) and the status is checked when the program is first used.
+
+    :param programs: Shader programs
+    :param wait: Wait for all the programs and check them
+    :type programs: list
+    :type wait: bool
+    :return: Failed programs, program: log entries (see Shader.get_errors)
+    :rtype: dict
+    """
+    _has_parallel_compile()
+    for program in programs:
+        if not program.is_compiled():
+            program._submit()
+    failed = {}
+    if wait:
+        for program in programs:
+            # noinspection PyBroadException
+            try:
+                program._finish()
+            except Exception:
+                failed[program] = program.get_errors()
+    return failed
+
+
+class ShaderVariantCache(object):
+    """
+    Permutations of the shaders of a folder. A variant is keyed by the program name and
+    its defines; it is preprocessed and compiled lazily the first time it is requested
+    and reused afterwards. Variants whose preprocessed sources are equal share the
+    program.
+    """
+
+    def __init__(self, shaderpath, cache=None, include_dirs=None, defines=None):
+        """
+        Constructor.
+
+        :param shaderpath: Shader path
+        :param cache: Shader cache, None uses the shared one
+        :param include_dirs: Include folders, see preprocess
+        :param defines: Defines of every variant
+        :type shaderpath: basestring
+        :type cache: ShaderCache, None
+        :type include_dirs: list, None
+        :type defines: dict, None
+        """
+        self._cache = cache
+        self._defines = dict(defines or {})
+        self._include_dirs = include_dirs
+        self._programs = {}
+        self._shaderpath = shaderpath
+        self._variants = {}
+
+    @staticmethod
+    def get_key(shadername, defines):
+        """
+        Return the key of a variant.
+
+        :param shadername: Shader name
+        :param defines: Defines
+        :type shadername: basestring
+        :type defines: dict
+        :return: Key
+        :rtype: tuple
+        """
+        return shadername, tuple(sorted((k, _format_define(v)) for k, v in defines.items()))
+
+    def get(self, shadername, **defines):
+        """
+        Return the program of a variant, e.g. get('normalMapShader', NUM_LIGHTS=3).
+
+        :param shadername: Shader name
+        :param defines: Defines
+        :type shadername: basestring
+        :return: ShaderProgram object
+        :rtype: ShaderProgram
+        """
+        merged = dict(self._defines)
+        merged.update(defines)
+        key = self.get_key(shadername, merged)
+        if key not in self._variants:
+            name = shadername.replace('.fsh', '').replace('.vsh', '')
+            fragment = Shader(self._shaderpath + name + '.fsh', _SHADER_FRAGMENT, defines=merged,
+                              include_dirs=self._include_dirs)
+            vertex = Shader(self._shaderpath + name + '.vsh', _SHADER_VERTEX, defines=merged,
+                            include_dirs=self._include_dirs)
+            sources = (vertex.get_hash(), fragment.get_hash())
+            if sources not in self._programs:
+                program = ShaderProgram(vertex, fragment, True,
+                                        get_shader_cache() if self._cache is None else self._cache)
+                program.set_name('{0} {1}'.format(name, ' '.join('{0}={1}'.format(*d) for d in key[1])).strip())
+                self._programs[sources] = program
+            self._variants[key] = self._programs[sources]
+        return self._variants[key]
+
+    def get_variants(self):
+        """
+        Return the keys of the compiled variants.
+
+        :return: Keys
+        :rtype: list
+        """
+        return list(self._variants.keys())
+
+    def clear(self):
+        """
+        Forget the variants, the programs remain in the shader cache.
+        """
+        self._programs.clear()
+        self._variants.clear()
+
+    def __contains__(self, key):
+        """
+        Return true if a variant has been compiled.
+
+        :param key: Variant key, see get_key
+        :type key: tuple
+        :return: Boolean
+        :rtype: bool
+        """
+        return key in self._variants
+
+    def __len__(self):
+        """
+        Return the number of distinct programs.
+
+        :return: Number of programs
+        :rtype: int
+        """
+        return len(self._programs)
+
+
+class ShaderWatcher(object):
+    """
+    Reloads shader programs when their files (or the files they include) are modified.
+    A background thread polls the modification times and reads and preprocesses the
+    changed sources; update() compiles them and swaps the programs, it must be called
+    once per frame from the OpenGL context thread. Programs keep running if the new
+    sources cannot be linked.
+    """
+
+    def __init__(self, interval=_SHADER_WATCH_INTERVAL, verbose=True):
+        """
+        Constructor.
+
+        :param interval: Polling interval in seconds
+        :param verbose: Print reloads and errors
+        :type interval: float
+        :type verbose: bool
+        """
+        self._errors = {}
+        self._interval = interval
+        self._lock = _threading.Lock()
+        self._programs = {}
+        self._queue = _queue.Queue()
+        self._running = _threading.Event()
+        self._thread = None
+        self._verbose = verbose
+
+    @staticmethod
+    def _get_mtimes(files):
+        """
+        Return the modification times of a list of files.
+
+        :param files: Files
+        :type files: list
+        :return: Modification times, None for missing files
+        :rtype: tuple
+        """
+        mtimes = []
+        for f in files:
+            try:
+                mtimes.append(_os.path.getmtime(f))
+            except OSError:  # Editors may replace the file while saving
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def watch(self, program):
+        """
+        Start watching a program, the polling thread starts with the first program.
+
+        :param program: Shader program
+        :type program: ShaderProgram
+        """
+        shaders = (program.get_vertex_shader(), program.get_fragment_shader())
+        files = shaders[0].get_dependencies() + shaders[1].get_dependencies()
+        with self._lock:
+            self._programs[id(program)] = (program, shaders, files, self._get_mtimes(files))
+        if self._thread is None:
+            self._running.set()
+            self._thread = _threading.Thread(target=self._run, name='ShaderWatcher')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def unwatch(self, program):
+        """
+        Stop watching a program.
+
+        :param program: Shader program
+        :type program: ShaderProgram
+        """
+        with self._lock:
+            self._programs.pop(id(program), None)
+
+    def _run(self):
+        """
+        Polling thread.
+        """
+        while self._running.is_set():
+            self.poll()
+            _time.sleep(self._interval)
+
+    def poll(self):
+        """
+        Check the files once and prepare the changed programs, called by the polling thread.
+
+        :return: Number of changed programs
+        :rtype: int
+        """
+        with self._lock:
+            watched = list(self._programs.items())
+        total = 0
+        for key, (program, shaders, files, mtimes) in watched:
+            current = self._get_mtimes(files)
+            if current == mtimes or None in current:
+                continue
+            # noinspection PyBroadException
+            try:
+                new = (shaders[0].copy(), shaders[1].copy())
+            except Exception as e:  # Missing include, etc.
+                new = e
+            else:
+                files = new[0].get_dependencies() + new[1].get_dependencies()
+                current = self._get_mtimes(files)
+            with self._lock:
+                if key not in self._programs:
+                    continue
+                if isinstance(new, Exception):
+                    self._programs[key] = (program, shaders, files, current)
+                else:
+                    self._programs[key] = (program, new, files, current)
+            self._queue.put((program, new))
+            total += 1
+        return total
+
+    def update(self):
+        """
+        Swap the programs whose sources have changed, must be called from the OpenGL
+        context thread at a frame boundary.
+
+        :return: Number of swapped programs
+        :rtype: int
+        """
+        total = 0
+        while True:
+            try:
+                program, new = self._queue.get_nowait()
+            except _queue.Empty:
+                break
+            error = str(new) if isinstance(new, Exception) else program.reload(*new)
+            if error is None:
+                self._errors.pop(id(program), None)
+                total += 1
+                if self._verbose:
+                    print('Reloaded shader program {0}'.format(program.get_name()))
+            else:
+                self._errors[id(program)] = error
+                if self._verbose:
+                    print('Error reloading shader program {0}, keeping the previous one:\n{1}'.format(
+                        program.get_name(), error))
+        return total
+
+    def get_error(self, program):
+        """
+        Return the error of the last reload of a program.
+
+        :param program: Shader program
+        :type program: ShaderProgram
+        :return: Error, None if the last reload succeeded
+        :rtype: basestring, None
+        """
+        return self._errors.get(id(program))
+
+    def stop(self):
+        """
+        Stop the polling thread.
+        """
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __len__(self):
+        """
+        Return the number of watched programs.
+
+        :return: Number of programs
+        :rtype: int
+        """
+        return len(self._programs)
+
+
+def get_shader_watcher():
+    """
+    Return the shared shader watcher.
+
+    :return: Shader watcher
+    :rtype: ShaderWatcher
+    """
+    if _SHADER_WATCHER[0] is None:
+        _SHADER_WATCHER[0] = ShaderWatcher()
+    return _SHADER_WATCHER[0]
+
+
+def reload_shaders():
+    """
+    Swap the programs changed since the last call, for programs watched with the shared
+    watcher. Must be called once per frame from the OpenGL context thread.
+
+    :return: Number of swapped programs
+    :rtype: int
+    """
+    if _SHADER_WATCHER[0] is None:
+        return 0
+    return _SHADER_WATCHER[0].update()
@@ -0,0 +1,124 @@
+# coding=utf-8
+"""
+PYOPENGL-TOOLBOX TEXCONV
+Offline conversion of images to DDS textures, usage:
+
+    python -m PyOpenGLtoolbox.texconv SOURCE DEST [--compression bc1] [--mipmap box] [--workers 4]
+
+MIT License
+Copyright (c) 2015-2019 Pablo Pizarro R.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+# Library imports
+from __future__ import print_function
+from PyOpenGLtoolbox.textures import convert_texture, TEXTURES_COMPRESSION_BC1, TEXTURES_COMPRESSION_BC3, \
+    TEXTURES_COMPRESSION_NONE, TEXTURES_MIPMAP_BOX, TEXTURES_MIPMAP_LANCZOS, TEXTURES_MIPMAP_NONE
+import argparse as _argparse
+import concurrent.futures as _futures
+import os as _os
+
+# Constants
+_TEXCONV_COMPRESSION = {
+    'bc1': TEXTURES_COMPRESSION_BC1,
+    'bc3': TEXTURES_COMPRESSION_BC3,
+    'none': TEXTURES_COMPRESSION_NONE
+}
+_TEXCONV_EXTENSIONS = ('.bmp', '.gif', '.jpeg', '.jpg', '.png', '.tga', '.tif', '.tiff')
+_TEXCONV_MIPMAP = {
+    'box': TEXTURES_MIPMAP_BOX,
+    'lanczos': TEXTURES_MIPMAP_LANCZOS,
+    'none': TEXTURES_MIPMAP_NONE
+}
+
+
+def convert_directory(source, dest, compression=TEXTURES_COMPRESSION_NONE, mipmap=TEXTURES_MIPMAP_BOX, workers=None,
+                      force=False):
+    """
+    Convert the images of a directory tree to DDS files with the same relative paths,
+    in a process pool. Files newer than their image are skipped.
+
+    :param source: Image directory
+    :param dest: DDS directory
+    :param compression: Compression
+    :param mipmap: Mipmap generation
+    :param workers: Number of processes, None uses the number of CPUs
+    :param force: Convert the up to date files too
+    :type source: basestring
+    :type dest: basestring
+    :type compression: int
+    :type mipmap: int
+    :type workers: int, None
+    :type force: bool
+    :return: List of written files
+    :rtype: list
+    """
+    jobs = []
+    for root, _, files in _os.walk(source):
+        for name in sorted(files):
+            if _os.path.splitext(name)[1].lower() not in _TEXCONV_EXTENSIONS:
+                continue
+            image_file = _os.path.join(root, name)
+            texture_file = _os.path.join(dest, _os.path.splitext(_os.path.relpath(image_file, source))[0] + '.dds')
+            if not force and _os.path.isfile(texture_file) and \
+                    _os.path.getmtime(texture_file) >= _os.path.getmtime(image_file):
+                continue
+            if not _os.path.isdir(_os.path.dirname(texture_file)):
+                _os.makedirs(_os.path.dirname(texture_file))
+            jobs.append((image_file, texture_file))
+    if len(jobs) == 0:
+        return []
+    written = []
+    with _futures.ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(convert_texture, image_file, texture_file, compression, mipmap)
+                   for image_file, texture_file in jobs]
+        for (image_file, texture_file), future in zip(jobs, futures):
+            # noinspection PyBroadException
+            try:
+                written.append(future.result())
+                print('{0} -> {1}'.format(image_file, texture_file))
+            except Exception as e:
+                print('[ERR] Error converting {0}: {1}'.format(image_file, e))
+    return written
+
+
+def main(args=None):
+    """
+    Command line entry point.
+
+    :param args: Arguments, sys.argv if None
+    :type args: list, None
+    """
+    parser = _argparse.ArgumentParser(description='Convert a directory of images to DDS textures')
+    parser.add_argument('source', help='Image directory')
+    parser.add_argument('dest', help='DDS directory')
+    parser.add_argument('--compression', choices=sorted(_TEXCONV_COMPRESSION.keys()), default='none',
+                        help='Block compression, bc1 for RGB and bc3 for RGBA')
+    parser.add_argument('--mipmap', choices=sorted(_TEXCONV_MIPMAP.keys()), default='box', help='Mipmap filter')
+    parser.add_argument('--workers', type=int, default=None, help='Number of processes')
+    parser.add_argument('--force', action='store_true', help='Convert the up to date files too')
+    args = parser.parse_args(args)
+    convert_directory(args.source, args.dest, _TEXCONV_COMPRESSION[args.compression], _TEXCONV_MIPMAP[args.mipmap],
+                      args.workers, args.force)
+
+
+if __name__ == '__main__':
+    main()
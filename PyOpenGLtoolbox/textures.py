@@ -27,7 +27,21 @@ SOFTWARE.
 
 # Library imports
 from __future__ import print_function
+from collections import OrderedDict as _OrderedDict
+from PyOpenGLtoolbox.mathlib import Point2
+from PyOpenGLtoolbox.utils import _get_cache_path, _load_arrays, _save_arrays
+import concurrent.futures as _futures
+import ctypes as _ctypes
+import hashlib as _hashlib
 import numpy as _np
+import os as _os
+import time as _time
+
+try:
+    import queue as _queue
+except ImportError:
+    # noinspection PyUnresolvedReferences,PyPep8Naming
+    import Queue as _queue
 
 # noinspection PyPep8Naming
 import OpenGL.GL as _gl
@@ -45,21 +59,289 @@ except ImportError:
         exit()
 
 
-def load_texture(image_file, repeat=False):
+# Constants
+TEXTURES_COMPRESSION_BC1 = 0x0e31
+TEXTURES_COMPRESSION_BC3 = 0x0e32
+TEXTURES_COMPRESSION_NONE = 0x0e30
+TEXTURES_FILTER_ANISOTROPIC = 0x0e13
+TEXTURES_FILTER_BILINEAR = 0x0e11
+TEXTURES_FILTER_LINEAR = 0x0e10
+TEXTURES_FILTER_TRILINEAR = 0x0e12
+TEXTURES_MIPMAP_BOX = 0x0e21
+TEXTURES_MIPMAP_GPU = 0x0e23
+TEXTURES_MIPMAP_LANCZOS = 0x0e22
+TEXTURES_MIPMAP_NONE = 0x0e20
+_TEXTURES_CACHE_VERSION = 1
+_TEXTURES_COMPRESSED_FORMATS = {
+    TEXTURES_COMPRESSION_BC1: 0x83f0,  # GL_COMPRESSED_RGB_S3TC_DXT1_EXT
+    TEXTURES_COMPRESSION_BC3: 0x83f3  # GL_COMPRESSED_RGBA_S3TC_DXT5_EXT
+}
+_TEXTURES_DDS_ALPHAPIXELS = 0x1
+_TEXTURES_DDS_CAPS = 0x1
+_TEXTURES_DDS_COMPLEX = 0x8
+_TEXTURES_DDS_FOURCC = 0x4
+_TEXTURES_DDS_FOURCCS = {
+    b'DXT1': TEXTURES_COMPRESSION_BC1,
+    b'DXT5': TEXTURES_COMPRESSION_BC3
+}
+_TEXTURES_DDS_HEIGHT = 0x2
+_TEXTURES_DDS_LINEARSIZE = 0x80000
+_TEXTURES_DDS_LUMINANCE = 0x20000
+_TEXTURES_DDS_MIPMAP = 0x400000
+_TEXTURES_DDS_MIPMAPCOUNT = 0x20000
+_TEXTURES_DDS_PITCH = 0x8
+_TEXTURES_DDS_PIXELFORMAT = 0x1000
+_TEXTURES_DDS_RGB = 0x40
+_TEXTURES_DDS_TEXTURE = 0x1000
+_TEXTURES_DDS_WIDTH = 0x4
+_TEXTURES_DEFAULT_ANISOTROPY = 16.0
+_TEXTURES_FILTERS = {
+    # filtering: min filter with mipmaps
+    TEXTURES_FILTER_ANISOTROPIC: _gl.GL_LINEAR_MIPMAP_LINEAR,
+    TEXTURES_FILTER_BILINEAR: _gl.GL_LINEAR_MIPMAP_NEAREST,
+    TEXTURES_FILTER_LINEAR: _gl.GL_LINEAR,
+    TEXTURES_FILTER_TRILINEAR: _gl.GL_LINEAR_MIPMAP_LINEAR
+}
+_TEXTURES_FORMATS = {
+    # (channels, bytes per channel): (internal format, format, type)
+    (1, 1): (_gl.GL_LUMINANCE8, _gl.GL_LUMINANCE, _gl.GL_UNSIGNED_BYTE),
+    (1, 2): (_gl.GL_LUMINANCE16, _gl.GL_LUMINANCE, _gl.GL_UNSIGNED_SHORT),
+    (2, 1): (_gl.GL_LUMINANCE8_ALPHA8, _gl.GL_LUMINANCE_ALPHA, _gl.GL_UNSIGNED_BYTE),
+    (2, 2): (_gl.GL_LUMINANCE16_ALPHA16, _gl.GL_LUMINANCE_ALPHA, _gl.GL_UNSIGNED_SHORT),
+    (3, 1): (_gl.GL_RGB8, _gl.GL_RGB, _gl.GL_UNSIGNED_BYTE),
+    (3, 2): (_gl.GL_RGB16, _gl.GL_RGB, _gl.GL_UNSIGNED_SHORT),
+    (4, 1): (_gl.GL_RGBA8, _gl.GL_RGBA, _gl.GL_UNSIGNED_BYTE),
+    (4, 2): (_gl.GL_RGBA16, _gl.GL_RGBA, _gl.GL_UNSIGNED_SHORT)
+}
+_TEXTURES_HASH_CHUNK_SIZE = 1 << 20
+_TEXTURES_LANCZOS_SIZE = 3
+_TEXTURES_LOADER = [None]
+_TEXTURES_MAX_ANISOTROPY = 0x84fe  # GL_TEXTURE_MAX_ANISOTROPY_EXT
+_TEXTURES_MAX_ANISOTROPY_LIMIT = 0x84ff  # GL_MAX_TEXTURE_MAX_ANISOTROPY_EXT
+_TEXTURES_PIL_MODES = {
+    # PIL modes that are converted before the upload
+    '1': 'L',
+    'CMYK': 'RGB',
+    'HSV': 'RGB',
+    'LAB': 'RGB',
+    'La': 'LA',
+    'PA': 'RGBA',
+    'RGBX': 'RGB',
+    'RGBa': 'RGBA',
+    'YCbCr': 'RGB'
+}
+_TEXTURES_S3TC = [None]
+_TEXTURES_UPLOAD_BUDGET = 0.004
+
+
+def _get_image_data(img):
     """
-    Loads an texture from a image file.
+    Return the pixels of an image as a contiguous (h,w) or (h,w,channels) uint8 or
+    uint16 array, without building intermediate Python objects.
 
-    :param image_file: Image file
+    :param img: Image
+    :type img: PIL.Image.Image
+    :return: Pixel array
+    :rtype: numpy.ndarray
+    """
+    mode = img.mode
+    if mode == 'P':
+        mode = 'RGBA' if 'transparency' in img.info else 'RGB'
+        img = img.convert(mode)
+    elif mode == 'F':
+        img = img.convert('L')
+    elif mode in _TEXTURES_PIL_MODES:
+        img = img.convert(_TEXTURES_PIL_MODES[mode])
+    data = _np.asarray(img)
+    if data.dtype.kind == 'i' or data.dtype.itemsize > 2:  # 32-bit integer images, mode I
+        data = _np.clip(data, 0, 0xffff).astype(_np.uint16)
+    elif not data.dtype.isnative:  # Big endian 16-bit images, mode I;16B
+        data = data.astype(data.dtype.newbyteorder('='))
+    return _np.ascontiguousarray(data)
+
+
+def _get_texture_format(data):
+    """
+    Return the OpenGL formats of a pixel array.
+
+    :param data: Pixel array (h,w) or (h,w,channels)
+    :type data: numpy.ndarray
+    :return: (internal format, format, type)
+    :rtype: tuple
+    """
+    channels = 1 if data.ndim == 2 else data.shape[2]
+    key = (channels, data.dtype.itemsize)
+    if key not in _TEXTURES_FORMATS:
+        raise Exception('Unsupported texture format, {0} channels of {1}'.format(channels, data.dtype))
+    return _TEXTURES_FORMATS[key]
+
+
+def _get_unpack_alignment(data):
+    """
+    Return the largest OpenGL unpack alignment that matches the rows of a tightly packed
+    pixel array.
+
+    :param data: Pixel array (h,w) or (h,w,channels)
+    :type data: numpy.ndarray
+    :return: Alignment (1, 2, 4, 8)
+    :rtype: int
+    """
+    row = data.strides[0]
+    for alignment in (8, 4, 2):
+        if row % alignment == 0:
+            return alignment
+    return 1
+
+
+def _downsample_box(data, axis):
+    """
+    Halve an axis of a float array averaging pairs of pixels. If the size is odd the
+    last output pixel averages the last three.
+
+    :param data: Float array
+    :param axis: Axis
+    :type data: numpy.ndarray
+    :type axis: int
+    :return: Downsampled array
+    :rtype: numpy.ndarray
+    """
+    n = data.shape[axis]
+    if n == 1:
+        return data
+    data = _np.moveaxis(data, axis, 0)
+    m = n // 2
+    out = data[0:2 * m:2] + data[1:2 * m:2]
+    if n % 2 == 1:
+        out[-1] = (out[-1] + data[-1]) * (2.0 / 3.0)
+    out *= 0.5
+    return _np.moveaxis(out, 0, axis)
+
+
+def _downsample_lanczos(data, axis):
+    """
+    Halve an axis of a float array with a Lanczos-3 filter, pixels outside the image
+    are clamped to the border.
+
+    :param data: Float array
+    :param axis: Axis
+    :type data: numpy.ndarray
+    :type axis: int
+    :return: Downsampled array
+    :rtype: numpy.ndarray
+    """
+    n = data.shape[axis]
+    if n == 1:
+        return data
+    data = _np.moveaxis(data, axis, 0)
+    m = n // 2
+    scale = float(n) / m
+    support = _TEXTURES_LANCZOS_SIZE * scale
+
+    # Input pixels and weights of each output pixel, (m, taps)
+    center = (_np.arange(m) + 0.5) * scale
+    first = _np.floor(center - support).astype(_np.int64)
+    taps = int(_np.ceil(2 * support)) + 1
+    index = first[:, None] + _np.arange(taps)[None, :]
+    x = (index + 0.5 - center[:, None]) / scale
+    weight = _np.sinc(x) * _np.sinc(x / _TEXTURES_LANCZOS_SIZE)
+    weight[_np.abs(x) >= _TEXTURES_LANCZOS_SIZE] = 0.0
+    weight /= weight.sum(axis=1)[:, None]
+    index = _np.clip(index, 0, n - 1)
+
+    shape = (m,) + (1,) * (data.ndim - 1)
+    out = _np.zeros((m,) + data.shape[1:], dtype=_np.float32)
+    for t in range(taps):
+        out += weight[:, t].reshape(shape).astype(_np.float32) * data[index[:, t]]
+    return _np.moveaxis(out, 0, axis)
+
+
+def create_mipmaps(data, method=TEXTURES_MIPMAP_BOX):
+    """
+    Create the mipmap chain of a pixel array, each level halves the previous one down to
+    a 1x1 level. Computed with vectorized box or Lanczos filters.
+
+    :param data: Pixel array (h,w) or (h,w,channels), uint8 or uint16
+    :param method: Filter, TEXTURES_MIPMAP_BOX or TEXTURES_MIPMAP_LANCZOS
+    :type data: numpy.ndarray
+    :type method: int
+    :return: List of levels, the first is data
+    :rtype: list
+    """
+    if method == TEXTURES_MIPMAP_LANCZOS:
+        downsample = _downsample_lanczos
+    elif method == TEXTURES_MIPMAP_BOX:
+        downsample = _downsample_box
+    else:
+        raise Exception('Invalid mipmap method')
+    limit = _np.iinfo(data.dtype).max
+    levels = [data]
+    level = data.astype(_np.float32)
+    while level.shape[0] > 1 or level.shape[1] > 1:
+        level = downsample(downsample(level, 0), 1)
+        levels.append(_np.ascontiguousarray(_np.clip(_np.rint(level), 0, limit).astype(data.dtype)))
+    return levels
+
+
+def _set_texture_filter(filtering, mipmaps, anisotropy):
+    """
+    Set the filters of the bound texture.
+
+    :param filtering: Texture filtering
+    :param mipmaps: Texture has mipmaps
+    :param anisotropy: Maximum anisotropy
+    :type filtering: int
+    :type mipmaps: bool
+    :type anisotropy: float
+    """
+    if filtering not in _TEXTURES_FILTERS:
+        raise Exception('Invalid texture filtering')
+    min_filter = _TEXTURES_FILTERS[filtering] if mipmaps else _gl.GL_LINEAR
+    _gl.glTexParameterf(_gl.GL_TEXTURE_2D, _gl.GL_TEXTURE_MAG_FILTER, _gl.GL_LINEAR)
+    _gl.glTexParameterf(_gl.GL_TEXTURE_2D, _gl.GL_TEXTURE_MIN_FILTER, min_filter)
+    if filtering == TEXTURES_FILTER_ANISOTROPIC:
+        # noinspection PyBroadException
+        try:
+            limit = float(_np.ravel(_gl.glGetFloatv(_TEXTURES_MAX_ANISOTROPY_LIMIT))[0])
+            _gl.glTexParameterf(_gl.GL_TEXTURE_2D, _TEXTURES_MAX_ANISOTROPY, min(anisotropy, limit))
+        except Exception:  # EXT_texture_filter_anisotropic not supported, trilinear filtering is used
+            pass
+
+
+def _upload_texture(levels, repeat=False, mipmap=TEXTURES_MIPMAP_NONE, filtering=None,
+                    anisotropy=_TEXTURES_DEFAULT_ANISOTROPY):
+    """
+    Creates an OpenGL texture from a pixel array or a mipmap chain.
+
+    :param levels: Contiguous pixel array (h,w) or (h,w,channels), uint8 or uint16, compressed level, or list of
+        mipmap levels; compressed levels are decompressed if the context does not support S3TC
     :param repeat: Repeat image (OPENGL)
-    :type image_file: basestring:
+    :param mipmap: Mipmap generation, if TEXTURES_MIPMAP_GPU uses glGenerateMipmap
+    :param filtering: Texture filtering, trilinear if None and the texture has mipmaps, else linear
+    :param anisotropy: Maximum anisotropy of TEXTURES_FILTER_ANISOTROPIC
+    :type levels: numpy.ndarray, _CompressedLevel, list
     :type repeat: bool
+    :type mipmap: int
+    :type filtering: int, None
+    :type anisotropy: float
     :return: Image OpenGL object
     """
-    img = _Image.open(image_file)
-    data = _np.array(list(img.getdata()), _np.int8)
+    if isinstance(levels, (_np.ndarray, _CompressedLevel)):
+        levels = [levels]
+    compressed = isinstance(levels[0], _CompressedLevel)
+    if compressed and not _has_s3tc():  # Decompress on the CPU
+        levels = [level.decode() for level in levels]
+        compressed = False
+    generate = mipmap == TEXTURES_MIPMAP_GPU and len(levels) == 1 and not compressed
+    if generate and not bool(_gl.glGenerateMipmap):  # Old context, create them on the CPU
+        levels = create_mipmaps(levels[0], TEXTURES_MIPMAP_BOX)
+        generate = False
+    mipmaps = generate or len(levels) > 1
+    if filtering is None:
+        filtering = TEXTURES_FILTER_TRILINEAR if mipmaps else TEXTURES_FILTER_LINEAR
+    if not compressed:
+        internal_format, data_format, data_type = _get_texture_format(levels[0])
 
     tex = _gl.glGenTextures(1)
-    _gl.glPixelStorei(_gl.GL_UNPACK_ALIGNMENT, 1)
     _gl.glBindTexture(_gl.GL_TEXTURE_2D, tex)
 
     if repeat:
@@ -69,9 +351,1488 @@ def load_texture(image_file, repeat=False):
         _gl.glTexParameterf(_gl.GL_TEXTURE_2D, _gl.GL_TEXTURE_WRAP_S, _gl.GL_CLAMP)
         _gl.glTexParameterf(_gl.GL_TEXTURE_2D, _gl.GL_TEXTURE_WRAP_T, _gl.GL_CLAMP)
 
-    _gl.glTexParameterf(_gl.GL_TEXTURE_2D, _gl.GL_TEXTURE_MAG_FILTER, _gl.GL_LINEAR)
-    _gl.glTexParameterf(_gl.GL_TEXTURE_2D, _gl.GL_TEXTURE_MIN_FILTER, _gl.GL_LINEAR)
-    _gl.glTexImage2D(_gl.GL_TEXTURE_2D, 0, _gl.GL_RGB, img.size[0], img.size[1], 0, _gl.GL_RGB,
-                     _gl.GL_UNSIGNED_BYTE, data)
+    _set_texture_filter(filtering, mipmaps, anisotropy)
+    for i in range(len(levels)):
+        data = levels[i]
+        if compressed:
+            _gl.glCompressedTexImage2D(_gl.GL_TEXTURE_2D, i, _TEXTURES_COMPRESSED_FORMATS[data.compression],
+                                       data.width, data.height, 0, data.nbytes, data.data)
+            continue
+        _gl.glPixelStorei(_gl.GL_UNPACK_ALIGNMENT, _get_unpack_alignment(data))
+        _gl.glTexImage2D(_gl.GL_TEXTURE_2D, i, internal_format, data.shape[1], data.shape[0], 0, data_format,
+                         data_type, data)
+    if generate:
+        _gl.glGenerateMipmap(_gl.GL_TEXTURE_2D)
+    else:
+        _gl.glTexParameteri(_gl.GL_TEXTURE_2D, _gl.GL_TEXTURE_MAX_LEVEL, len(levels) - 1)
     _gl.glTexEnvf(_gl.GL_TEXTURE_ENV, _gl.GL_TEXTURE_ENV_MODE, _gl.GL_MODULATE)
     return tex
+
+
+def _get_blocks(data):
+    """
+    Split a pixel array in 4x4 blocks, the edges are replicated to fill the last blocks.
+
+    :param data: Pixel array (h,w,channels)
+    :type data: numpy.ndarray
+    :return: Blocks (n,16,channels) in row-major order
+    :rtype: numpy.ndarray
+    """
+    h, w, c = data.shape
+    data = _np.pad(data, ((0, -h % 4), (0, -w % 4), (0, 0)), mode='edge')
+    bh, bw = data.shape[0] // 4, data.shape[1] // 4
+    return data.reshape(bh, 4, bw, 4, c).transpose(0, 2, 1, 3, 4).reshape(bh * bw, 16, c)
+
+
+def _join_blocks(blocks, width, height):
+    """
+    Join 4x4 blocks into a pixel array.
+
+    :param blocks: Blocks (n,16,channels) in row-major order
+    :param width: Image width
+    :param height: Image height
+    :type blocks: numpy.ndarray
+    :type width: int
+    :type height: int
+    :return: Pixel array (height,width,channels)
+    :rtype: numpy.ndarray
+    """
+    bh, bw, c = (height + 3) // 4, (width + 3) // 4, blocks.shape[2]
+    data = blocks.reshape(bh, bw, 4, 4, c).transpose(0, 2, 1, 3, 4).reshape(bh * 4, bw * 4, c)
+    return _np.ascontiguousarray(data[0:height, 0:width])
+
+
+def _decode_565(color):
+    """
+    Expand RGB565 colors to 8-bit channels.
+
+    :param color: Colors
+    :type color: numpy.ndarray
+    :return: Colors (...,3)
+    :rtype: numpy.ndarray
+    """
+    color = color.astype(_np.int32)
+    r, g, b = color >> 11 & 0x1f, color >> 5 & 0x3f, color & 0x1f
+    return _np.stack(((r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)), axis=-1).astype(_np.float32)
+
+
+def _encode_bc1_blocks(blocks):
+    """
+    Encode RGB blocks in BC1, the endpoints are the extremes of the block colors along
+    their principal axis.
+
+    :param blocks: Blocks (n,16,3)
+    :type blocks: numpy.ndarray
+    :return: Encoded blocks (n,8)
+    :rtype: numpy.ndarray
+    """
+    n = blocks.shape[0]
+    blocks = blocks.astype(_np.float32)
+    mean = blocks.mean(axis=1)
+    centered = blocks - mean[:, None, :]
+    cov = _np.einsum('npi,npj->nij', centered, centered)
+    axis = _np.ones((n, 3), dtype=_np.float32)
+    for _ in range(8):  # Power iteration
+        axis = _np.einsum('nij,nj->ni', cov, axis)
+        norm = _np.sqrt((axis * axis).sum(axis=1, keepdims=True))
+        axis = _np.where(norm > 1e-6, axis / _np.maximum(norm, 1e-6), 0.57735027)
+    proj = _np.einsum('npi,ni->np', centered, axis)
+    ends = _np.clip(_np.stack((mean + axis * proj.max(axis=1)[:, None], mean + axis * proj.min(axis=1)[:, None]),
+                              axis=1), 0, 255)
+    ends = _np.rint(ends * (_np.array([31, 63, 31], dtype=_np.float32) / 255.0)).astype(_np.uint16)
+    c = ends[:, :, 0] << 11 | ends[:, :, 1] << 5 | ends[:, :, 2]
+    swap = c[:, 0] < c[:, 1]  # Four colors mode requires c0 > c1
+    c[swap] = c[swap][:, ::-1]
+    p0, p1 = _decode_565(c[:, 0]), _decode_565(c[:, 1])
+    palette = _np.stack((p0, p1, (2 * p0 + p1) / 3.0, (p0 + 2 * p1) / 3.0), axis=1)
+    dist = ((blocks[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=3)
+    index = dist.argmin(axis=2).astype(_np.uint32)
+    index[c[:, 0] == c[:, 1]] = 0
+    out = _np.empty(n, dtype=[('c0', '<u2'), ('c1', '<u2'), ('index', '<u4')])
+    out['c0'], out['c1'] = c[:, 0], c[:, 1]
+    out['index'] = (index << (2 * _np.arange(16, dtype=_np.uint32))).sum(axis=1, dtype=_np.uint32)
+    return out.view(_np.uint8).reshape(n, 8)
+
+
+def _decode_bc1_blocks(data):
+    """
+    Decode BC1 blocks.
+
+    :param data: Encoded blocks (n,8)
+    :type data: numpy.ndarray
+    :return: RGB blocks (n,16,3)
+    :rtype: numpy.ndarray
+    """
+    blocks = data.view([('c0', '<u2'), ('c1', '<u2'), ('index', '<u4')]).reshape(-1)
+    p0, p1 = _decode_565(blocks['c0']), _decode_565(blocks['c1'])
+    four = (blocks['c0'] > blocks['c1'])[:, None]
+    palette = _np.stack((p0, p1, _np.where(four, (2 * p0 + p1) / 3.0, (p0 + p1) / 2.0),
+                         _np.where(four, (p0 + 2 * p1) / 3.0, 0.0)), axis=1)
+    index = blocks['index'][:, None] >> (2 * _np.arange(16, dtype=_np.uint32)) & 0x3
+    return _np.rint(_np.take_along_axis(palette, index[:, :, None].astype(_np.intp), axis=1)).astype(_np.uint8)
+
+
+def _get_bc3_palette(a0, a1):
+    """
+    Return the 8 alpha values of BC3 blocks.
+
+    :param a0: First endpoint, larger than a1
+    :param a1: Second endpoint
+    :type a0: numpy.ndarray
+    :type a1: numpy.ndarray
+    :return: Palette (n,8)
+    :rtype: numpy.ndarray
+    """
+    a0, a1 = a0.astype(_np.float32)[:, None], a1.astype(_np.float32)[:, None]
+    j = _np.arange(2, 8, dtype=_np.float32)[None, :]
+    return _np.concatenate((a0, a1, ((8 - j) * a0 + (j - 1) * a1) / 7.0), axis=1)
+
+
+def _encode_bc3_blocks(blocks):
+    """
+    Encode RGBA blocks in BC3, interpolated alpha followed by a BC1 color block.
+
+    :param blocks: Blocks (n,16,4)
+    :type blocks: numpy.ndarray
+    :return: Encoded blocks (n,16)
+    :rtype: numpy.ndarray
+    """
+    n = blocks.shape[0]
+    alpha = blocks[:, :, 3].astype(_np.float32)
+    a0, a1 = alpha.max(axis=1).astype(_np.uint8), alpha.min(axis=1).astype(_np.uint8)
+    palette = _get_bc3_palette(a0, a1)
+    index = _np.abs(alpha[:, :, None] - palette[:, None, :]).argmin(axis=2).astype(_np.uint64)
+    index[a0 == a1] = 0
+    bits = (index << (3 * _np.arange(16, dtype=_np.uint64))).sum(axis=1, dtype=_np.uint64)
+    out = _np.empty((n, 16), dtype=_np.uint8)
+    out[:, 0], out[:, 1] = a0, a1
+    out[:, 2:8] = bits.astype('<u8').view(_np.uint8).reshape(n, 8)[:, 0:6]
+    out[:, 8:16] = _encode_bc1_blocks(blocks[:, :, 0:3])
+    return out
+
+
+def _decode_bc3_blocks(data):
+    """
+    Decode BC3 blocks.
+
+    :param data: Encoded blocks (n,16)
+    :type data: numpy.ndarray
+    :return: RGBA blocks (n,16,4)
+    :rtype: numpy.ndarray
+    """
+    data = data.reshape(-1, 16)
+    n = data.shape[0]
+    a0, a1 = data[:, 0], data[:, 1]
+    palette = _get_bc3_palette(a0, a1)
+    six = a0 <= a1  # Six alpha values mode, 0 and 255 are explicit
+    if _np.any(six):
+        j = _np.arange(2, 6, dtype=_np.float32)[None, :]
+        f0, f1 = a0[six].astype(_np.float32)[:, None], a1[six].astype(_np.float32)[:, None]
+        palette[six, 2:6] = ((6 - j) * f0 + (j - 1) * f1) / 5.0
+        palette[six, 6], palette[six, 7] = 0, 255
+    bits = _np.zeros((n, 8), dtype=_np.uint8)
+    bits[:, 0:6] = data[:, 2:8]
+    bits = _np.ascontiguousarray(bits).view('<u8').reshape(n)
+    index = bits[:, None] >> (3 * _np.arange(16, dtype=_np.uint64)) & 0x7
+    alpha = _np.rint(_np.take_along_axis(palette, index.astype(_np.intp), axis=1)).astype(_np.uint8)
+    return _np.concatenate((_decode_bc1_blocks(_np.ascontiguousarray(data[:, 8:16])), alpha[:, :, None]), axis=2)
+
+
+class _CompressedLevel(object):
+    """
+    Mipmap level of a block compressed texture.
+    """
+
+    def __init__(self, compression, width, height, data):
+        """
+        Constructor.
+
+        :param compression: Compression, TEXTURES_COMPRESSION_BC1 or TEXTURES_COMPRESSION_BC3
+        :param width: Level width
+        :param height: Level height
+        :param data: Encoded blocks
+        :type compression: int
+        :type width: int
+        :type height: int
+        :type data: numpy.ndarray
+        """
+        self.compression = compression
+        self.data = data
+        self.height = height
+        self.nbytes = int(data.nbytes)
+        self.width = width
+
+    @staticmethod
+    def encode(data, compression):
+        """
+        Compress a pixel array, gray images are expanded to RGB. BC1 discards alpha.
+
+        :param data: Pixel array (h,w) or (h,w,channels), uint8
+        :param compression: Compression
+        :type data: numpy.ndarray
+        :type compression: int
+        :return: Compressed level
+        :rtype: _CompressedLevel
+        """
+        if data.dtype != _np.uint8:
+            raise Exception('Only 8-bit images can be block compressed')
+        if data.ndim == 2:
+            data = data[:, :, None]
+        if data.shape[2] <= 2:
+            data = _np.concatenate((_np.repeat(data[:, :, 0:1], 3, axis=2), data[:, :, 1:]), axis=2)
+        h, w = data.shape[0:2]
+        if compression == TEXTURES_COMPRESSION_BC1:
+            blocks = _encode_bc1_blocks(_get_blocks(data[:, :, 0:3]))
+        elif compression == TEXTURES_COMPRESSION_BC3:
+            if data.shape[2] == 3:
+                data = _np.concatenate((data, _np.full((h, w, 1), 255, dtype=_np.uint8)), axis=2)
+            blocks = _encode_bc3_blocks(_get_blocks(data))
+        else:
+            raise Exception('Invalid texture compression')
+        return _CompressedLevel(compression, w, h, blocks.reshape(-1))
+
+    def decode(self):
+        """
+        Decompress the level.
+
+        :return: Pixel array (h,w,3) for BC1, (h,w,4) for BC3
+        :rtype: numpy.ndarray
+        """
+        if self.compression == TEXTURES_COMPRESSION_BC1:
+            blocks = _decode_bc1_blocks(self.data.reshape(-1, 8))
+        else:
+            blocks = _decode_bc3_blocks(self.data.reshape(-1, 16))
+        return _join_blocks(blocks, self.width, self.height)
+
+
+def _has_s3tc():
+    """
+    Return true if the context supports S3TC compressed textures.
+
+    :return: Boolean
+    :rtype: bool
+    """
+    if _TEXTURES_S3TC[0] is None:
+        extensions = []
+        # noinspection PyBroadException
+        try:
+            extensions = (_gl.glGetString(_gl.GL_EXTENSIONS) or b'').split()
+        except Exception:  # Core profile, extensions are listed one by one
+            # noinspection PyBroadException
+            try:
+                total = int(_np.ravel(_gl.glGetIntegerv(_gl.GL_NUM_EXTENSIONS))[0])
+                extensions = [_gl.glGetStringi(_gl.GL_EXTENSIONS, i) for i in range(total)]
+            except Exception:
+                pass
+        _TEXTURES_S3TC[0] = bool(_gl.glCompressedTexImage2D) and b'GL_EXT_texture_compression_s3tc' in extensions
+    return _TEXTURES_S3TC[0]
+
+
+def _read_dds(texture_file):
+    """
+    Read a DDS file, the levels of uncompressed files are views of a single read buffer.
+
+    :param texture_file: DDS file
+    :type texture_file: basestring
+    :return: List of pixel arrays or compressed levels
+    :rtype: list
+    """
+    data = _np.fromfile(texture_file, dtype=_np.uint8)
+    if data.size < 128 or data[0:4].tobytes() != b'DDS ':
+        raise Exception('File {0} is not a DDS texture'.format(texture_file))
+    header = data[4:128].view('<u4')
+    height, width = int(header[2]), int(header[3])
+    total = max(1, int(header[6])) if header[1] & _TEXTURES_DDS_MIPMAPCOUNT else 1
+    pf_flags, fourcc, bits = int(header[19]), data[84:88].tobytes(), int(header[21])
+    masks = [int(m) for m in header[22:26]]
+    compression = None
+    order = None
+    if pf_flags & _TEXTURES_DDS_FOURCC:
+        if fourcc not in _TEXTURES_DDS_FOURCCS:
+            raise Exception('Unsupported DDS compression {0}'.format(fourcc))
+        compression = _TEXTURES_DDS_FOURCCS[fourcc]
+    else:
+        if bits not in (8, 16, 24, 32) or not pf_flags & (_TEXTURES_DDS_RGB | _TEXTURES_DDS_LUMINANCE):
+            raise Exception('Unsupported DDS pixel format')
+        # Byte of each channel, from the channel masks
+        used = masks[0:1] if pf_flags & _TEXTURES_DDS_LUMINANCE else masks[0:3]
+        if pf_flags & _TEXTURES_DDS_ALPHAPIXELS:
+            used.append(masks[3])
+        if any(m not in (0xff, 0xff00, 0xff0000, 0xff000000) for m in used):
+            raise Exception('Unsupported DDS pixel format, channels must be 8-bit')
+        order = [(m.bit_length() - 1) // 8 for m in used]
+    offset = 128
+    levels = []
+    for i in range(total):
+        w, h = max(1, width >> i), max(1, height >> i)
+        if compression is not None:
+            size = ((w + 3) // 4) * ((h + 3) // 4) * (8 if compression == TEXTURES_COMPRESSION_BC1 else 16)
+        else:
+            size = w * h * bits // 8
+        if offset + size > data.size:
+            raise Exception('DDS file {0} is truncated'.format(texture_file))
+        if compression is not None:
+            levels.append(_CompressedLevel(compression, w, h, data[offset:offset + size]))
+        else:
+            level = data[offset:offset + size].reshape(h, w, bits // 8)
+            if order != list(range(bits // 8)):
+                level = _np.ascontiguousarray(level[:, :, order])
+            levels.append(level[:, :, 0] if level.shape[2] == 1 else level)
+        offset += size
+    return levels
+
+
+def save_texture(texture_file, levels, compression=TEXTURES_COMPRESSION_NONE):
+    """
+    Save a pixel array or a mipmap chain as a DDS file, uncompressed or block compressed
+    (BC1/DXT1 for RGB, BC3/DXT5 for RGBA). load_texture reads these files without
+    decoding images, compressed ones are uploaded with glCompressedTexImage2D.
+
+    :param texture_file: DDS file
+    :param levels: Pixel array (h,w) or (h,w,channels), uint8, or list of mipmap levels
+    :param compression: Compression
+    :type texture_file: basestring
+    :type levels: numpy.ndarray, list
+    :type compression: int
+    """
+    if isinstance(levels, _np.ndarray):
+        levels = [levels]
+    base = levels[0]
+    height, width = base.shape[0:2]
+    channels = 1 if base.ndim == 2 else base.shape[2]
+    flags = _TEXTURES_DDS_CAPS | _TEXTURES_DDS_HEIGHT | _TEXTURES_DDS_WIDTH | _TEXTURES_DDS_PIXELFORMAT
+    caps = _TEXTURES_DDS_TEXTURE
+    if len(levels) > 1:
+        flags |= _TEXTURES_DDS_MIPMAPCOUNT
+        caps |= _TEXTURES_DDS_COMPLEX | _TEXTURES_DDS_MIPMAP
+    pixel_format = [32, 0, 0, 0, 0, 0, 0, 0]
+    if compression == TEXTURES_COMPRESSION_NONE:
+        if base.dtype != _np.uint8:
+            raise Exception('DDS textures must be 8-bit images')
+        levels = [_np.ascontiguousarray(level) for level in levels]
+        flags |= _TEXTURES_DDS_PITCH
+        pitch = width * channels
+        pixel_format[1] = _TEXTURES_DDS_LUMINANCE if channels <= 2 else _TEXTURES_DDS_RGB
+        if channels in (2, 4):
+            pixel_format[1] |= _TEXTURES_DDS_ALPHAPIXELS
+        pixel_format[3] = 8 * channels
+        for i in range(channels):  # Channels are stored in array order
+            pixel_format[4 + (3 if i == channels - 1 and channels in (2, 4) else i)] = 0xff << (8 * i)
+    else:
+        levels = [_CompressedLevel.encode(level, compression) for level in levels]
+        flags |= _TEXTURES_DDS_LINEARSIZE
+        pitch = levels[0].nbytes
+        pixel_format[1] = _TEXTURES_DDS_FOURCC
+        fourcc = dict((v, k) for k, v in _TEXTURES_DDS_FOURCCS.items())[compression]
+        pixel_format[2] = _np.frombuffer(fourcc, dtype='<u4')[0]
+    header = _np.zeros(31, dtype='<u4')
+    header[0:7] = [124, flags, height, width, pitch, 0, len(levels)]
+    header[18:26] = pixel_format
+    header[26] = caps
+    with open(texture_file, 'wb') as f:
+        f.write(b'DDS ')
+        f.write(header.tobytes())
+        for level in levels:
+            f.write((level.data if isinstance(level, _CompressedLevel) else level).tobytes())
+
+
+def convert_texture(image_file, texture_file, compression=TEXTURES_COMPRESSION_NONE, mipmap=TEXTURES_MIPMAP_BOX):
+    """
+    Decode an image, create its mipmap chain and save it as a DDS file.
+
+    :param image_file: Image file
+    :param texture_file: DDS file
+    :param compression: Compression
+    :param mipmap: Mipmap generation, TEXTURES_MIPMAP_BOX, TEXTURES_MIPMAP_LANCZOS or TEXTURES_MIPMAP_NONE
+    :type image_file: basestring
+    :type texture_file: basestring
+    :type compression: int
+    :type mipmap: int
+    :return: DDS file
+    :rtype: basestring
+    """
+    levels = _load_texture_levels(image_file, mipmap)
+    if levels[0].dtype == _np.uint16:  # DDS files store 8-bit channels
+        levels = [(level >> 8).astype(_np.uint8) for level in levels]
+    save_texture(texture_file, levels, compression)
+    return texture_file
+
+
+def _load_texture_levels(image_file, mipmap=TEXTURES_MIPMAP_NONE, cache_dir=None):
+    """
+    Decode an image file and create its mipmaps on the CPU if mipmap is
+    TEXTURES_MIPMAP_BOX or TEXTURES_MIPMAP_LANCZOS. DDS files are read as stored.
+
+    :param image_file: Image file
+    :param mipmap: Mipmap generation
+    :param cache_dir: Binary cache folder of the decoded levels
+    :type image_file: basestring
+    :type mipmap: int
+    :type cache_dir: basestring, None
+    :return: List of levels
+    :rtype: list
+    """
+    cpu = mipmap in (TEXTURES_MIPMAP_BOX, TEXTURES_MIPMAP_LANCZOS)
+    if _os.path.splitext(image_file)[1].lower() == '.dds':
+        levels = _read_dds(image_file)
+        if cpu and len(levels) == 1 and isinstance(levels[0], _np.ndarray):
+            levels = create_mipmaps(levels[0], mipmap)
+        return levels
+    cache = None
+    if cache_dir is not None:
+        cache = _get_cache_path(cache_dir, image_file, {'format': _TEXTURES_CACHE_VERSION,
+                                                        'mipmap': mipmap if cpu else None}, '.mip')
+        if _os.path.isfile(cache):
+            arrays, meta = _load_arrays(cache)
+            return [arrays['level{0:02d}'.format(i)] for i in range(meta['levels'])]
+
+    levels = [_get_image_data(_Image.open(image_file))]
+    if cpu:
+        levels = create_mipmaps(levels[0], mipmap)
+    if cache is not None:
+        _save_arrays(cache, dict(('level{0:02d}'.format(i), levels[i]) for i in range(len(levels))),
+                     {'levels': len(levels)})
+    return levels
+
+
+def load_texture(image_file, repeat=False, mipmap=TEXTURES_MIPMAP_NONE, filtering=None,
+                 anisotropy=_TEXTURES_DEFAULT_ANISOTROPY, cache_dir=None):
+    """
+    Loads an texture from a image file. L, LA, RGB, RGBA and 16-bit images are uploaded
+    with their own format, other modes are converted.
+
+    Mipmaps are created with glGenerateMipmap (TEXTURES_MIPMAP_GPU) or on the CPU with a
+    box or Lanczos filter (TEXTURES_MIPMAP_BOX, TEXTURES_MIPMAP_LANCZOS). If cache_dir is
+    defined the decoded image and its CPU mipmap chain are stored there in binary format,
+    so the next loads skip decoding and filtering.
+
+    DDS files written by save_texture or convert_texture are read without decoding, with
+    their stored mipmap chain; block compressed ones are uploaded as they are with
+    glCompressedTexImage2D.
+
+    :param image_file: Image file
+    :param repeat: Repeat image (OPENGL)
+    :param mipmap: Mipmap generation
+    :param filtering: Texture filtering, trilinear if None and the texture has mipmaps, else linear
+    :param anisotropy: Maximum anisotropy of TEXTURES_FILTER_ANISOTROPIC
+    :param cache_dir: Binary cache folder
+    :type image_file: basestring:
+    :type repeat: bool
+    :type mipmap: int
+    :type filtering: int, None
+    :type anisotropy: float
+    :type cache_dir: basestring, None
+    :return: Image OpenGL object
+    """
+    return _upload_texture(_load_texture_levels(image_file, mipmap, cache_dir), repeat, mipmap, filtering,
+                           anisotropy)
+
+
+def _get_texture_memory(levels, mipmap=TEXTURES_MIPMAP_NONE):
+    """
+    Estimate the video memory used by a texture.
+
+    :param levels: List of mipmap levels
+    :param mipmap: Mipmap generation
+    :type levels: list
+    :type mipmap: int
+    :return: Size in bytes
+    :rtype: int
+    """
+    size = sum(int(level.nbytes) for level in levels)
+    if mipmap == TEXTURES_MIPMAP_GPU and len(levels) == 1:  # The chain adds a third of the base level
+        size += size // 3
+    return size
+
+
+class TextureHandle(object):
+    """
+    Reference to a texture shared by a TextureManager, the texture is released when all
+    its handles are released.
+    """
+
+    def __init__(self, manager, key, tex):
+        """
+        Constructor.
+
+        :param manager: Texture manager
+        :param key: Texture key
+        :param tex: Image OpenGL object
+        :type manager: TextureManager
+        :type key: tuple
+        :type tex: int
+        """
+        self._key = key
+        self._manager = manager
+        self._tex = tex
+
+    def get_id(self):
+        """
+        Return the OpenGL texture object.
+
+        :return: Image OpenGL object
+        :rtype: int
+        """
+        if self._manager is None:
+            raise Exception('Texture handle has been released')
+        return self._tex
+
+    def bind(self):
+        """
+        Bind the texture to the current texture unit.
+        """
+        _gl.glBindTexture(_gl.GL_TEXTURE_2D, self.get_id())
+
+    def clone(self):
+        """
+        Return a new handle to the same texture.
+
+        :return: Texture handle
+        :rtype: TextureHandle
+        """
+        if self._manager is None:
+            raise Exception('Texture handle has been released')
+        return self._manager._acquire(self._key)
+
+    def is_released(self):
+        """
+        Return true if the handle has been released.
+
+        :return: Boolean
+        :rtype: bool
+        """
+        return self._manager is None
+
+    def release(self):
+        """
+        Release the handle, it cannot be used afterwards. Releasing twice does nothing.
+        """
+        if self._manager is not None:
+            self._manager._release(self._key)
+            self._manager = None
+
+
+class TextureManager(object):
+    """
+    Loads textures once and shares them through reference counted handles. Textures are
+    deduplicated by path and load parameters, or by file content if content_hash is
+    enabled.
+
+    Without a budget a texture is deleted when its last handle is released. With a video
+    memory budget (in bytes) unused textures are kept, so loading them again is free,
+    and the least recently used ones are deleted while the budget is exceeded.
+    """
+
+    def __init__(self, budget=None, content_hash=False):
+        """
+        Constructor.
+
+        :param budget: Video memory budget in bytes, None keeps no unused textures
+        :param content_hash: Deduplicate textures by file content instead of path
+        :type budget: int, None
+        :type content_hash: bool
+        """
+        self._budget = budget
+        self._content_hash = content_hash
+        self._memory = 0
+        self._textures = {}  # key: [tex, size, references]
+        self._unused = _OrderedDict()  # Unused keys, least recently used first
+
+    def _get_key(self, image_file, params):
+        """
+        Return the key of a texture.
+
+        :param image_file: Image file
+        :param params: Load parameters
+        :type image_file: basestring
+        :type params: tuple
+        :return: Key
+        :rtype: tuple
+        """
+        if self._content_hash:
+            digest = _hashlib.sha1()
+            with open(image_file, 'rb') as f:
+                for chunk in iter(lambda: f.read(_TEXTURES_HASH_CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            return (digest.hexdigest(),) + params
+        return (_os.path.abspath(image_file),) + params
+
+    def load(self, image_file, repeat=False, mipmap=TEXTURES_MIPMAP_NONE, filtering=None,
+             anisotropy=_TEXTURES_DEFAULT_ANISOTROPY, cache_dir=None):
+        """
+        Return a handle to a texture, the image is only loaded if the texture is not
+        already in the manager. Parameters are the same as load_texture.
+
+        :param image_file: Image file
+        :param repeat: Repeat image (OPENGL)
+        :param mipmap: Mipmap generation
+        :param filtering: Texture filtering
+        :param anisotropy: Maximum anisotropy of TEXTURES_FILTER_ANISOTROPIC
+        :param cache_dir: Binary cache folder
+        :type image_file: basestring
+        :type repeat: bool
+        :type mipmap: int
+        :type filtering: int, None
+        :type anisotropy: float
+        :type cache_dir: basestring, None
+        :return: Texture handle
+        :rtype: TextureHandle
+        """
+        key = self._get_key(image_file, (repeat, mipmap, filtering, anisotropy))
+        if key in self._textures:
+            return self._acquire(key)
+        levels = _load_texture_levels(image_file, mipmap, cache_dir)
+        tex = _upload_texture(levels, repeat, mipmap, filtering, anisotropy)
+        return self._add(key, tex, _get_texture_memory(levels, mipmap))
+
+    def _add(self, key, tex, size):
+        """
+        Add a new texture and return its first handle.
+
+        :param key: Texture key
+        :param tex: Image OpenGL object
+        :param size: Video memory used by the texture
+        :type key: tuple
+        :type tex: int
+        :type size: int
+        :return: Texture handle
+        :rtype: TextureHandle
+        """
+        self._textures[key] = [tex, size, 1]
+        self._memory += size
+        self._evict()
+        return TextureHandle(self, key, tex)
+
+    def _acquire(self, key):
+        """
+        Return a new handle of a texture.
+
+        :param key: Texture key
+        :type key: tuple
+        :return: Texture handle
+        :rtype: TextureHandle
+        """
+        texture = self._textures[key]
+        if texture[2] == 0:
+            del self._unused[key]
+        texture[2] += 1
+        return TextureHandle(self, key, texture[0])
+
+    def _release(self, key):
+        """
+        Release a handle of a texture.
+
+        :param key: Texture key
+        :type key: tuple
+        """
+        texture = self._textures[key]
+        texture[2] -= 1
+        if texture[2] == 0:
+            if self._budget is None:
+                self._delete(key)
+            else:
+                self._unused[key] = None
+                self._evict()
+
+    def _delete(self, key):
+        """
+        Delete a texture.
+
+        :param key: Texture key
+        :type key: tuple
+        """
+        tex, size = self._textures.pop(key)[0:2]
+        self._memory -= size
+        _gl.glDeleteTextures([tex])
+
+    def _evict(self):
+        """
+        Delete the least recently used unused textures until the budget is met.
+        """
+        if self._budget is None:
+            return
+        while self._memory > self._budget and len(self._unused) > 0:
+            self._delete(self._unused.popitem(last=False)[0])
+
+    def collect(self):
+        """
+        Delete all the unused textures.
+        """
+        while len(self._unused) > 0:
+            self._delete(self._unused.popitem(last=False)[0])
+
+    def get_budget(self):
+        """
+        Return the video memory budget.
+
+        :return: Budget in bytes
+        :rtype: int, None
+        """
+        return self._budget
+
+    def set_budget(self, budget):
+        """
+        Set the video memory budget, unused textures are deleted if needed.
+
+        :param budget: Budget in bytes, None keeps no unused textures
+        :type budget: int, None
+        """
+        self._budget = budget
+        if budget is None:
+            self.collect()
+        else:
+            self._evict()
+
+    def get_memory(self):
+        """
+        Return the estimated video memory used by the textures of the manager.
+
+        :return: Size in bytes
+        :rtype: int
+        """
+        return self._memory
+
+    def get_references(self, handle):
+        """
+        Return the number of handles of the texture of a handle.
+
+        :param handle: Texture handle
+        :type handle: TextureHandle
+        :return: Number of handles
+        :rtype: int
+        """
+        texture = self._textures.get(handle._key)
+        return 0 if texture is None else texture[2]
+
+    def __len__(self):
+        """
+        Return the number of textures, used or not.
+
+        :return: Number of textures
+        :rtype: int
+        """
+        return len(self._textures)
+
+
+class TextureLoader(object):
+    """
+    Loads textures in the background. Images are decoded (and their CPU mipmaps created)
+    in a thread or process pool; as OpenGL calls must be done in the context thread, the
+    decoded pixels are queued and uploaded by upload(), which must be called once per
+    frame and stops when its time budget is spent.
+    """
+
+    def __init__(self, workers=None, processes=False, budget=_TEXTURES_UPLOAD_BUDGET, manager=None):
+        """
+        Constructor.
+
+        :param workers: Number of workers, None uses the number of CPUs
+        :param processes: Decode in a process pool instead of a thread pool
+        :param budget: Upload time budget per frame in seconds
+        :param manager: Texture manager, futures resolve to texture handles instead of ids
+        :type workers: int, None
+        :type processes: bool
+        :type budget: float
+        :type manager: TextureManager, None
+        """
+        if processes:
+            self._executor = _futures.ProcessPoolExecutor(workers)
+        else:
+            self._executor = _futures.ThreadPoolExecutor(workers or _os.cpu_count())
+        self._budget = budget
+        self._manager = manager
+        self._queue = _queue.Queue()
+
+    def load(self, image_file, repeat=False, mipmap=TEXTURES_MIPMAP_NONE, filtering=None,
+             anisotropy=_TEXTURES_DEFAULT_ANISOTROPY, cache_dir=None):
+        """
+        Start loading a texture, parameters are the same as load_texture.
+
+        :param image_file: Image file
+        :param repeat: Repeat image (OPENGL)
+        :param mipmap: Mipmap generation
+        :param filtering: Texture filtering
+        :param anisotropy: Maximum anisotropy of TEXTURES_FILTER_ANISOTROPIC
+        :param cache_dir: Binary cache folder
+        :type image_file: basestring
+        :type repeat: bool
+        :type mipmap: int
+        :type filtering: int, None
+        :type anisotropy: float
+        :type cache_dir: basestring, None
+        :return: Future that resolves to the Image OpenGL object, or a TextureHandle if the loader has a manager
+        :rtype: concurrent.futures.Future
+        """
+        result = _futures.Future()
+        params = (repeat, mipmap, filtering, anisotropy)
+
+        def _decoded(decode):
+            # Called from a worker thread, uploads are queued for the context thread
+            if decode.exception() is not None:
+                if result.set_running_or_notify_cancel():
+                    result.set_exception(decode.exception())
+            elif not result.cancelled():
+                self._queue.put((image_file, params, decode.result(), result))
+
+        self._executor.submit(_load_texture_levels, image_file, mipmap, cache_dir).add_done_callback(_decoded)
+        return result
+
+    def upload(self, budget=None):
+        """
+        Upload the decoded textures, must be called from the OpenGL context thread. At
+        least one texture is uploaded if any is ready, then it stops when the time budget
+        is spent. Textures whose futures were cancelled are skipped.
+
+        :param budget: Time budget in seconds, None uses the loader budget
+        :type budget: float, None
+        :return: Number of uploaded textures
+        :rtype: int
+        """
+        if budget is None:
+            budget = self._budget
+        start = _time.time()
+        total = 0
+        while total == 0 or _time.time() - start < budget:
+            try:
+                image_file, params, levels, result = self._queue.get_nowait()
+            except _queue.Empty:
+                break
+            if not result.set_running_or_notify_cancel():  # Cancelled by the caller, nothing to upload
+                continue
+            # noinspection PyBroadException
+            try:
+                if self._manager is None:
+                    result.set_result(_upload_texture(levels, *params))
+                else:
+                    key = self._manager._get_key(image_file, params)
+                    if key in self._manager._textures:
+                        result.set_result(self._manager._acquire(key))
+                    else:
+                        tex = _upload_texture(levels, *params)
+                        result.set_result(self._manager._add(key, tex, _get_texture_memory(levels, params[1])))
+            except Exception as e:
+                result.set_exception(e)
+            total += 1
+        return total
+
+    def wait(self, futures):
+        """
+        Upload textures until all the futures are done, blocks the context thread.
+
+        :param futures: Futures returned by load
+        :type futures: list
+        :return: Results of the futures
+        :rtype: list
+        """
+        while not all(f.done() for f in futures):
+            if self.upload() == 0:
+                _time.sleep(0.001)
+        return [f.result() for f in futures]
+
+    def shutdown(self, wait=True):
+        """
+        Stop the workers.
+
+        :param wait: Wait for the pending decodes
+        :type wait: bool
+        """
+        self._executor.shutdown(wait)
+
+
+def load_textures_async(paths, loader=None, **kwargs):
+    """
+    Start loading many textures in the background, see TextureLoader. If loader is
+    None a shared thread pool loader is used, whose uploads are done by
+    upload_textures().
+
+    :param paths: Image files
+    :param loader: Texture loader
+    :param kwargs: load_texture parameters
+    :type paths: list
+    :type loader: TextureLoader, None
+    :type kwargs: object
+    :return: List of futures that resolve to the Image OpenGL objects
+    :rtype: list
+    """
+    if loader is None:
+        loader = get_texture_loader()
+    return [loader.load(path, **kwargs) for path in paths]
+
+
+def get_texture_loader():
+    """
+    Return the shared texture loader.
+
+    :return: Texture loader
+    :rtype: TextureLoader
+    """
+    if _TEXTURES_LOADER[0] is None:
+        _TEXTURES_LOADER[0] = TextureLoader()
+    return _TEXTURES_LOADER[0]
+
+
+def upload_textures(budget=None):
+    """
+    Upload the textures decoded by the shared loader, must be called once per frame from
+    the OpenGL context thread.
+
+    :param budget: Time budget in seconds, None uses the loader budget
+    :type budget: float, None
+    :return: Number of uploaded textures
+    :rtype: int
+    """
+    if _TEXTURES_LOADER[0] is None:
+        return 0
+    return _TEXTURES_LOADER[0].upload(budget)
+
+
+class StreamingTexture(object):
+    """
+    Texture whose pixels are replaced often, like video or simulation frames. Storage is
+    allocated once with glTexImage2D and each update is copied into one of a ring of
+    pixel buffer objects (PBO), then transferred to the texture with glTexSubImage2D;
+    the transfer is done by the driver while the CPU keeps rendering, and the ring avoids
+    waiting for a buffer still in use. If PBOs are not supported the pixels are uploaded
+    directly.
+    """
+
+    def __init__(self, width, height, channels=3, dtype=_np.uint8, buffers=2, repeat=False,
+                 filtering=TEXTURES_FILTER_LINEAR):
+        """
+        Constructor.
+
+        :param width: Texture width
+        :param height: Texture height
+        :param channels: Number of channels (1 to 4)
+        :param dtype: Channel type, uint8 or uint16
+        :param buffers: Number of PBOs, 2 (double buffering) or 3 (triple buffering)
+        :param repeat: Repeat image (OPENGL)
+        :param filtering: Texture filtering
+        :type width: int
+        :type height: int
+        :type channels: int
+        :type dtype: type
+        :type buffers: int
+        :type repeat: bool
+        :type filtering: int
+        """
+        data = _np.zeros((height, width, channels), dtype=dtype)
+        self._format = _get_texture_format(data)
+        self._height = height
+        self._index = 0
+        self._nbytes = data.nbytes
+        self._width = width
+        self._tex = _upload_texture(data, repeat, TEXTURES_MIPMAP_NONE, filtering)
+        if bool(_gl.glGenBuffers) and bool(_gl.glBufferSubData):
+            self._pbo = [int(pbo) for pbo in _np.ravel(_gl.glGenBuffers(buffers))]
+            for pbo in self._pbo:
+                _gl.glBindBuffer(_gl.GL_PIXEL_UNPACK_BUFFER, pbo)
+                _gl.glBufferData(_gl.GL_PIXEL_UNPACK_BUFFER, self._nbytes, None, _gl.GL_STREAM_DRAW)
+            _gl.glBindBuffer(_gl.GL_PIXEL_UNPACK_BUFFER, 0)
+        else:
+            self._pbo = []
+
+    def update(self, data, x=0, y=0):
+        """
+        Replace the pixels of the texture, or of the region starting at (x,y).
+
+        :param data: Pixel array (h,w) or (h,w,channels) with the texture channels and type
+        :param x: Region x-offset
+        :param y: Region y-offset
+        :type data: numpy.ndarray
+        :type x: int
+        :type y: int
+        """
+        data = _np.ascontiguousarray(data)
+        if _get_texture_format(data) != self._format:
+            raise Exception('Pixel array format does not match the texture')
+        if data.nbytes > self._nbytes:
+            raise Exception('Pixel array is larger than the texture')
+        _gl.glBindTexture(_gl.GL_TEXTURE_2D, self._tex)
+        _gl.glPixelStorei(_gl.GL_UNPACK_ALIGNMENT, _get_unpack_alignment(data))
+        if len(self._pbo) == 0:
+            _gl.glTexSubImage2D(_gl.GL_TEXTURE_2D, 0, x, y, data.shape[1], data.shape[0], self._format[1],
+                                self._format[2], data)
+            return
+
+        # Orphan the buffer so the driver does not wait for a pending transfer, then copy the pixels
+        _gl.glBindBuffer(_gl.GL_PIXEL_UNPACK_BUFFER, self._pbo[self._index])
+        _gl.glBufferData(_gl.GL_PIXEL_UNPACK_BUFFER, self._nbytes, None, _gl.GL_STREAM_DRAW)
+        _gl.glBufferSubData(_gl.GL_PIXEL_UNPACK_BUFFER, 0, data.nbytes, data)
+        _gl.glTexSubImage2D(_gl.GL_TEXTURE_2D, 0, x, y, data.shape[1], data.shape[0], self._format[1],
+                            self._format[2], _ctypes.c_void_p(0))
+        _gl.glBindBuffer(_gl.GL_PIXEL_UNPACK_BUFFER, 0)
+        self._index = (self._index + 1) % len(self._pbo)
+
+    def bind(self):
+        """
+        Bind the texture to the current texture unit.
+        """
+        _gl.glBindTexture(_gl.GL_TEXTURE_2D, self._tex)
+
+    def get_id(self):
+        """
+        Return the OpenGL texture object.
+
+        :return: Image OpenGL object
+        :rtype: int
+        """
+        return self._tex
+
+    def get_size(self):
+        """
+        Return the texture size.
+
+        :return: (width, height)
+        :rtype: tuple
+        """
+        return self._width, self._height
+
+    def is_buffered(self):
+        """
+        Return true if updates use pixel buffer objects.
+
+        :return: Boolean
+        :rtype: bool
+        """
+        return len(self._pbo) > 0
+
+    def delete(self):
+        """
+        Delete the texture and its buffers.
+        """
+        if len(self._pbo) > 0:
+            _gl.glDeleteBuffers(len(self._pbo), self._pbo)
+            self._pbo = []
+        _gl.glDeleteTextures([self._tex])
+
+
+class _MaxRectsPacker(object):
+    """
+    MaxRects bin packer, keeps the maximal free rectangles of a page and places each
+    rectangle in the free one that leaves the shortest side left over (best short side fit).
+    """
+
+    def __init__(self, width, height):
+        """
+        Constructor.
+
+        :param width: Page width
+        :param height: Page height
+        :type width: int
+        :type height: int
+        """
+        self._free = [(0, 0, width, height)]
+
+    def insert(self, w, h):
+        """
+        Place a rectangle.
+
+        :param w: Rectangle width
+        :param h: Rectangle height
+        :type w: int
+        :type h: int
+        :return: (x,y) position, None if it does not fit
+        :rtype: tuple, None
+        """
+        best = None
+        best_fit = None
+        for fx, fy, fw, fh in self._free:
+            if fw >= w and fh >= h:
+                fit = (min(fw - w, fh - h), max(fw - w, fh - h))
+                if best_fit is None or fit < best_fit:
+                    best, best_fit = (fx, fy), fit
+        if best is None:
+            return None
+        x, y = best
+
+        # Split the free rectangles that intersect the new one
+        free = []
+        for fx, fy, fw, fh in self._free:
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                free.append((fx, fy, fw, fh))
+                continue
+            if x > fx:
+                free.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                free.append((x + w, fy, fx + fw - x - w, fh))
+            if y > fy:
+                free.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                free.append((fx, y + h, fw, fy + fh - y - h))
+
+        # Remove the free rectangles contained in another one
+        self._free = []
+        for i in range(len(free)):
+            fx, fy, fw, fh = free[i]
+            contained = False
+            for j in range(len(free)):
+                gx, gy, gw, gh = free[j]
+                if i != j and gx <= fx and gy <= fy and fx + fw <= gx + gw and fy + fh <= gy + gh and \
+                        (free[i] != free[j] or j < i):
+                    contained = True
+                    break
+            if not contained:
+                self._free.append(free[i])
+        return x, y
+
+
+class AtlasRegion(object):
+    """
+    Region of an image inside a texture atlas.
+    """
+
+    def __init__(self, atlas, page, x, y, w, h):
+        """
+        Constructor.
+
+        :param atlas: Texture atlas
+        :param page: Atlas page
+        :param x: Image x-position in pixels
+        :param y: Image y-position in pixels
+        :param w: Image width in pixels
+        :param h: Image height in pixels
+        :type atlas: TextureAtlas
+        :type page: int
+        :type x: int
+        :type y: int
+        :type w: int
+        :type h: int
+        """
+        width, height = atlas.get_size()
+        self._atlas = atlas
+        self._page = page
+        self._pixels = (x, y, w, h)
+        self._rect = (float(x) / width, float(y) / height, float(x + w) / width, float(y + h) / height)
+
+    def get_page(self):
+        """
+        Return the atlas page of the region.
+
+        :return: Page index
+        :rtype: int
+        """
+        return self._page
+
+    def get_texture(self):
+        """
+        Return the OpenGL texture of the region page.
+
+        :return: Image OpenGL object
+        :rtype: int
+        """
+        return self._atlas.get_textures()[self._page]
+
+    def get_pixel_rect(self):
+        """
+        Return the region in pixels.
+
+        :return: (x, y, width, height)
+        :rtype: tuple
+        """
+        return self._pixels
+
+    def get_rect(self):
+        """
+        Return the region in texture coordinates.
+
+        :return: (u0, v0, u1, v1)
+        :rtype: tuple
+        """
+        return self._rect
+
+    def remap(self, t_list):
+        """
+        Map a list of texture coordinates in [0,1] to the region.
+
+        :param t_list: Texture vertex list
+        :type t_list: list
+        :return: New texture vertex list
+        :rtype: list
+        """
+        u0, v0, u1, v1 = self._rect
+        return [Point2(u0 + t.get_x() * (u1 - u0), v0 + t.get_y() * (v1 - v0)) for t in t_list]
+
+    def remap_array(self, uv):
+        """
+        Map an array of texture coordinates in [0,1] to the region.
+
+        :param uv: Texture coordinates (n,2)
+        :type uv: numpy.ndarray
+        :return: New texture coordinates
+        :rtype: numpy.ndarray
+        """
+        u0, v0, u1, v1 = self._rect
+        uv = _np.array(uv, dtype=_np.float32)
+        uv[..., 0] = u0 + uv[..., 0] * (u1 - u0)
+        uv[..., 1] = v0 + uv[..., 1] * (v1 - v0)
+        return uv
+
+    def bind(self):
+        """
+        Bind the region page to the current texture unit.
+        """
+        _gl.glBindTexture(_gl.GL_TEXTURE_2D, self.get_texture())
+
+
+class TextureAtlas(object):
+    """
+    Packs many small images into one or more large textures (pages), so objects that use
+    different images can be drawn with a single bind. Images are placed with a MaxRects
+    packer; each one is surrounded by a gutter that replicates its edge pixels, so linear
+    filtering does not bleed the neighbour images. If mip_levels is defined the regions
+    are aligned to 2^mip_levels pixels and the gutter grows to match, keeping the first
+    mip_levels mipmaps free of bleeding too.
+    """
+
+    def __init__(self, width=2048, height=None, padding=0, gutter=None, mip_levels=0):
+        """
+        Constructor.
+
+        :param width: Page width
+        :param height: Page height, equal to width if None
+        :param padding: Empty pixels between images
+        :param gutter: Edge pixels replicated around each image, 2^mip_levels if None
+        :param mip_levels: Number of mipmap levels without bleeding
+        :type width: int
+        :type height: int, None
+        :type padding: int
+        :type gutter: int, None
+        :type mip_levels: int
+        """
+        if height is None:
+            height = width
+        self._alignment = 1 << mip_levels
+        if width % self._alignment != 0 or height % self._alignment != 0:
+            raise Exception('Atlas size must be a multiple of 2^mip_levels')
+        if gutter is None:
+            gutter = self._alignment
+        self._gutter = gutter
+        self._height = height
+        self._images = _OrderedDict()
+        self._mip_levels = mip_levels
+        self._padding = padding
+        self._pages = []
+        self._regions = {}
+        self._textures = []
+        self._width = width
+
+    def add(self, name, image):
+        """
+        Add an image to the atlas, the atlas must be packed again.
+
+        :param name: Image name
+        :param image: Image file, PIL image or pixel array (h,w) or (h,w,channels)
+        :type name: object
+        :type image: basestring, numpy.ndarray, PIL.Image.Image
+        """
+        if name in self._images:
+            raise Exception('Image {0} already exists in the atlas'.format(name))
+        if isinstance(image, _np.ndarray):
+            data = _np.ascontiguousarray(image)
+        elif isinstance(image, _Image.Image):
+            data = _get_image_data(image)
+        else:
+            data = _get_image_data(_Image.open(image))
+        _get_texture_format(data)
+        self._images[name] = data
+        self._pages = []
+        self._regions = {}
+
+    def _get_format(self):
+        """
+        Return the common channels and type of the images, gray images are expanded when
+        mixed with color ones and alpha is added when any image has it.
+
+        :return: (channels, dtype)
+        :rtype: tuple
+        """
+        channels = set()
+        dtypes = set()
+        for data in self._images.values():
+            channels.add(1 if data.ndim == 2 else data.shape[2])
+            dtypes.add(data.dtype)
+        if len(dtypes) > 1:
+            raise Exception('Atlas images must have the same type')
+        if len(channels) == 1:
+            return channels.pop(), dtypes.pop()
+        alpha = 2 in channels or 4 in channels
+        color = 3 in channels or 4 in channels
+        return (4 if alpha else 3) if color else 2, dtypes.pop()
+
+    @staticmethod
+    def _convert(data, channels):
+        """
+        Convert a pixel array to the given number of channels.
+
+        :param data: Pixel array
+        :param channels: Number of channels
+        :type data: numpy.ndarray
+        :type channels: int
+        :return: Pixel array (h,w,channels)
+        :rtype: numpy.ndarray
+        """
+        if data.ndim == 2:
+            data = data[:, :, None]
+        if data.shape[2] == channels:
+            return data
+        gray = data.shape[2] <= 2
+        alpha = data[:, :, -1:] if data.shape[2] in (2, 4) else \
+            _np.full(data.shape[0:2] + (1,), _np.iinfo(data.dtype).max, dtype=data.dtype)
+        color = _np.repeat(data[:, :, 0:1], 3, axis=2) if gray and channels >= 3 else data[:, :, 0:channels - 1]
+        if channels % 2 == 0:
+            return _np.concatenate((color, alpha), axis=2)
+        return color
+
+    def pack(self):
+        """
+        Pack the images into pages, larger images are placed first.
+
+        :return: Dictionary of regions by image name
+        :rtype: dict
+        """
+        if len(self._images) == 0:
+            raise Exception('Atlas has no images')
+        align = self._alignment
+        channels, dtype = self._get_format()
+        names = sorted(self._images.keys(), key=lambda n: (-max(self._images[n].shape[0:2]),
+                                                           -self._images[n].shape[0] * self._images[n].shape[1]))
+        packers = []
+        self._pages = []
+        self._regions = {}
+        for name in names:
+            data = self._convert(self._images[name], channels)
+            h, w = data.shape[0:2]
+            g = self._gutter
+            cw = -(-(w + 2 * g + self._padding) // align) * align
+            ch = -(-(h + 2 * g + self._padding) // align) * align
+            if cw > self._width or ch > self._height:
+                raise Exception('Image {0} does not fit in the atlas'.format(name))
+            pos = None
+            page = 0
+            for page in range(len(packers)):
+                pos = packers[page].insert(cw, ch)
+                if pos is not None:
+                    break
+            if pos is None:
+                packers.append(_MaxRectsPacker(self._width, self._height))
+                self._pages.append(_np.zeros((self._height, self._width, channels), dtype=dtype))
+                page = len(packers) - 1
+                pos = packers[page].insert(cw, ch)
+            x, y = pos
+            if g > 0:
+                data = _np.pad(data, ((g, g), (g, g), (0, 0)), mode='edge')
+            self._pages[page][y:y + h + 2 * g, x:x + w + 2 * g] = data
+            self._regions[name] = AtlasRegion(self, page, x + g, y + g, w, h)
+        return dict(self._regions)
+
+    def build(self, mipmap=TEXTURES_MIPMAP_NONE, filtering=None, anisotropy=_TEXTURES_DEFAULT_ANISOTROPY):
+        """
+        Pack the images if needed and upload the pages, the mipmap chain is limited to
+        mip_levels.
+
+        :param mipmap: Mipmap generation
+        :param filtering: Texture filtering, trilinear if None and the pages have mipmaps, else linear
+        :param anisotropy: Maximum anisotropy of TEXTURES_FILTER_ANISOTROPIC
+        :type mipmap: int
+        :type filtering: int, None
+        :type anisotropy: float
+        :return: List of OpenGL textures, one per page
+        :rtype: list
+        """
+        if len(self._pages) == 0:
+            self.pack()
+        self.delete()
+        if self._mip_levels == 0:
+            mipmap = TEXTURES_MIPMAP_NONE
+        for page in self._pages:
+            levels = page
+            if mipmap in (TEXTURES_MIPMAP_BOX, TEXTURES_MIPMAP_LANCZOS):
+                levels = create_mipmaps(page, mipmap)[0:self._mip_levels + 1]
+            tex = _upload_texture(levels, False, mipmap, filtering, anisotropy)
+            if mipmap == TEXTURES_MIPMAP_GPU:
+                _gl.glTexParameteri(_gl.GL_TEXTURE_2D, _gl.GL_TEXTURE_MAX_LEVEL, self._mip_levels)
+            self._textures.append(tex)
+        return list(self._textures)
+
+    def bind(self, page=0):
+        """
+        Enable texturing and bind a page to the current texture unit.
+
+        :param page: Page index
+        :type page: int
+        """
+        _gl.glEnable(_gl.GL_TEXTURE_2D)
+        _gl.glBindTexture(_gl.GL_TEXTURE_2D, self.get_textures()[page])
+
+    def get_pages(self):
+        """
+        Return the pixels of the packed pages.
+
+        :return: List of pixel arrays
+        :rtype: list
+        """
+        return list(self._pages)
+
+    def get_region(self, name):
+        """
+        Return the region of an image, the atlas must be packed.
+
+        :param name: Image name
+        :type name: object
+        :return: Atlas region
+        :rtype: AtlasRegion
+        """
+        if name not in self._regions:
+            if name in self._images:
+                raise Exception('Atlas has not been packed')
+            raise Exception('Image {0} does not exist in the atlas'.format(name))
+        return self._regions[name]
+
+    def get_size(self):
+        """
+        Return the page size.
+
+        :return: (width, height)
+        :rtype: tuple
+        """
+        return self._width, self._height
+
+    def get_textures(self):
+        """
+        Return the OpenGL textures of the pages.
+
+        :return: List of OpenGL textures
+        :rtype: list
+        """
+        if len(self._textures) == 0:
+            raise Exception('Atlas has not been built')
+        return self._textures
+
+    def delete(self):
+        """
+        Delete the page textures.
+        """
+        if len(self._textures) > 0:
+            _gl.glDeleteTextures(self._textures)
+            self._textures = []
+
+    def __contains__(self, name):
+        """
+        Return true if the atlas has the image.
+
+        :param name: Image name
+        :type name: object
+        :return: Boolean
+        :rtype: bool
+        """
+        return name in self._images
+
+    def __len__(self):
+        """
+        Return the number of images.
+
+        :return: Number of images
+        :rtype: int
+        """
+        return len(self._images)
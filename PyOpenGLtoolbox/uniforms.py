@@ -0,0 +1,553 @@
+# coding=utf-8
+"""
+PYOPENGL-TOOLBOX UNIFORMS
+Uniform buffer objects with std140 layout.
+
+MIT License
+Copyright (c) 2015-2019 Pablo Pizarro R.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+
+# Library imports
+from __future__ import print_function
+from PyOpenGLtoolbox.materials import get_material
+from PyOpenGLtoolbox.mathlib import Matrix4 as _Matrix4
+from PyOpenGLtoolbox.opengl import _OPENGL_DEFAULT_AMBIENT_COLOR, _OPENGL_DEFAULT_CONSTANT_ATTENUATION, \
+    _OPENGL_DEFAULT_DIFFUSE_COLOR, _OPENGL_DEFAULT_LINEAR_ATTENUATION, _OPENGL_DEFAULT_QUADRATIC_ATTENUATION, \
+    _OPENGL_DEFAULT_SPECULAR_COLOR, _OPENGL_DEFAULT_SPOT_CUTOFF, _OPENGL_DEFAULT_SPOT_DIRECTION, \
+    _OPENGL_DEFAULT_SPOT_EXPONENT
+import numpy as _np
+
+# noinspection PyPep8Naming
+import OpenGL.GL as _gl
+
+# Constants
+_UNIFORMS_CAMERA_FIELDS = [
+    ('view', 'mat4'),
+    ('projection', 'mat4'),
+    ('view_projection', 'mat4'),
+    ('position', 'vec4')
+]
+_UNIFORMS_DEFAULT_LIGHT_POSITION = [0.0, 0.0, 1.0, 0.0]
+_UNIFORMS_INVALID_INDEX = 0xffffffff
+_UNIFORMS_LIGHT_FIELDS = [
+    ('position', 'vec4'),
+    ('ambient', 'vec4'),
+    ('diffuse', 'vec4'),
+    ('specular', 'vec4'),
+    ('spot_direction', 'vec4'),
+    ('spot_cutoff', 'float'),
+    ('spot_exponent', 'float'),
+    ('constant_att', 'float'),
+    ('linear_att', 'float'),
+    ('quad_att', 'float')
+]
+_UNIFORMS_MATERIAL_FIELDS = [
+    ('ambient', 'vec4'),
+    ('diffuse', 'vec4'),
+    ('specular', 'vec4'),
+    ('emission', 'vec4'),
+    ('shininess', 'float')
+]
+_UNIFORMS_MAX_LIGHTS = 8
+_UNIFORMS_TYPES = {
+    # GLSL type: (dtype, components or (columns, rows))
+    'bool': ('<i4', 1),
+    'bvec2': ('<i4', 2),
+    'bvec3': ('<i4', 3),
+    'bvec4': ('<i4', 4),
+    'float': ('<f4', 1),
+    'int': ('<i4', 1),
+    'ivec2': ('<i4', 2),
+    'ivec3': ('<i4', 3),
+    'ivec4': ('<i4', 4),
+    'mat2': ('<f4', (2, 2)),
+    'mat2x3': ('<f4', (2, 3)),
+    'mat2x4': ('<f4', (2, 4)),
+    'mat3': ('<f4', (3, 3)),
+    'mat3x2': ('<f4', (3, 2)),
+    'mat3x4': ('<f4', (3, 4)),
+    'mat4': ('<f4', (4, 4)),
+    'mat4x2': ('<f4', (4, 2)),
+    'mat4x3': ('<f4', (4, 3)),
+    'uint': ('<u4', 1),
+    'uvec2': ('<u4', 2),
+    'uvec3': ('<u4', 3),
+    'uvec4': ('<u4', 4),
+    'vec2': ('<f4', 2),
+    'vec3': ('<f4', 3),
+    'vec4': ('<f4', 4)
+}
+
+
+def _round_up(value, alignment):
+    """
+    Round a value up to a multiple of the alignment.
+
+    :param value: Value
+    :param alignment: Alignment
+    :type value: int
+    :type alignment: int
+    :return: Rounded value
+    :rtype: int
+    """
+    return -(-value // alignment) * alignment
+
+
+def std140_dtype(fields):
+    """
+    Create the NumPy structured type of an uniform block with std140 layout.
+
+    Fields are (name, type) or (name, type, count) tuples, the type is a GLSL type name
+    or a (struct name, fields) tuple. std140 pads some values, the array shapes are:
+    vec3 (3,); arrays of scalars and vectors (count, 4); matrices (columns, 4) stored
+    column-major; arrays of matrices (count, columns, 4).
+
+    :param fields: Block fields
+    :type fields: list
+    :return: Structured type, its size is a multiple of 16 bytes
+    :rtype: numpy.dtype
+    """
+    names, formats, offsets = [], [], []
+    offset = 0
+    for field in fields:
+        name, glsl_type = field[0], field[1]
+        count = field[2] if len(field) > 2 else None
+        if isinstance(glsl_type, tuple):  # Structure
+            base = std140_dtype(glsl_type[1])
+            fmt, align, size = base, 16, base.itemsize
+            if count is not None:
+                fmt, size = (base, (count,)), size * count
+        elif glsl_type in _UNIFORMS_TYPES:
+            dtype, shape = _UNIFORMS_TYPES[glsl_type]
+            if isinstance(shape, tuple):  # Matrix, an array of column vectors
+                fmt, align, size = (dtype, (shape[0], 4)), 16, 16 * shape[0]
+                if count is not None:
+                    fmt, size = (dtype, (count, shape[0], 4)), size * count
+            elif count is not None:  # Each element is aligned as a vec4
+                fmt, align, size = (dtype, (count, 4)), 16, 16 * count
+            else:
+                fmt, align, size = (dtype, (shape,)) if shape > 1 else dtype, {1: 4, 2: 8}.get(shape, 16), 4 * shape
+        else:
+            raise Exception('Invalid uniform type {0}'.format(glsl_type))
+        offset = _round_up(offset, align)
+        names.append(name)
+        formats.append(fmt)
+        offsets.append(offset)
+        offset += size
+    return _np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': _round_up(offset, 16)})
+
+
+def std140_glsl(name, fields, instance=None):
+    """
+    Return the GLSL declaration of an uniform block, with its structures.
+
+    :param name: Block name
+    :param fields: Block fields, see std140_dtype
+    :param instance: Block instance name
+    :type name: basestring
+    :type fields: list
+    :type instance: basestring, None
+    :return: GLSL code
+    :rtype: basestring
+    """
+    structs = []
+
+    def _members(members):
+        lines = []
+        for field in members:
+            glsl_type = field[1]
+            if isinstance(glsl_type, tuple):
+                if glsl_type[0] not in [s[0] for s in structs]:
+                    structs.append((glsl_type[0], _members(glsl_type[1])))
+                glsl_type = glsl_type[0]
+            count = '[{0}]'.format(field[2]) if len(field) > 2 else ''
+            lines.append('    {0} {1}{2};'.format(glsl_type, field[0], count))
+        return lines
+
+    block = _members(fields)
+    code = ['struct {0} {{\n{1}\n}};\n'.format(s[0], '\n'.join(s[1])) for s in structs]
+    code.append('layout(std140) uniform {0} {{\n{1}\n}}{2};\n'.format(name, '\n'.join(block),
+                                                                      '' if instance is None else ' ' + instance))
+    return '\n'.join(code)
+
+
+def _assign(target, value, glsl_type):
+    """
+    Write a value into a std140 field, padding included.
+
+    :param target: Field view
+    :param value: Value, matrices with (rows, columns) shape or Matrix4 are row-major
+    :param glsl_type: GLSL type of the field
+    :type target: numpy.ndarray
+    :type value: object
+    :type glsl_type: basestring, tuple
+    """
+    if isinstance(value, _Matrix4):
+        value = value.get_array()
+    value = _np.asarray(value, dtype=target.dtype)
+    shape = _UNIFORMS_TYPES[glsl_type][1] if glsl_type in _UNIFORMS_TYPES else None
+    if isinstance(shape, tuple) and value.ndim >= 2 and value.shape[-2:] == (shape[1], shape[0]):
+        value = value.swapaxes(-1, -2)
+    elif value.ndim == target.ndim - 1 and target.ndim > 0 and target.shape[-1] == 4 and shape == 1:
+        value = value[..., None]  # Array of scalars
+    if value.ndim != target.ndim:
+        raise Exception('Invalid value shape {0} for field shape {1}'.format(value.shape, target.shape))
+    target[tuple(slice(0, n) for n in value.shape)] = value
+
+
+class UniformBuffer(object):
+    """
+    Uniform buffer object with std140 layout. The block is kept in a NumPy structured
+    array, written fields mark it dirty and upload sends it once with glBufferSubData;
+    bind connects the block of any program to the buffer binding point.
+    """
+
+    def __init__(self, name, fields, binding):
+        """
+        Constructor.
+
+        :param name: Block name in GLSL
+        :param fields: Block fields, see std140_dtype
+        :param binding: Binding point
+        :type name: basestring
+        :type fields: list
+        :type binding: int
+        """
+        self._binding = binding
+        self._buffer = None
+        self._data = _np.zeros(1, dtype=std140_dtype(fields))
+        self._dirty = True
+        self._fields = fields
+        self._name = name
+        self._types = dict((f[0], f[1]) for f in fields)
+
+    def get_name(self):
+        """
+        Return the block name.
+
+        :return: Name
+        :rtype: basestring
+        """
+        return self._name
+
+    def get_binding(self):
+        """
+        Return the binding point.
+
+        :return: Binding point
+        :rtype: int
+        """
+        return self._binding
+
+    def get_data(self):
+        """
+        Return the block data, call set_dirty after writing it directly.
+
+        :return: Structured array of one element
+        :rtype: numpy.ndarray
+        """
+        return self._data
+
+    def get_glsl(self, instance=None):
+        """
+        Return the GLSL declaration of the block.
+
+        :param instance: Block instance name
+        :type instance: basestring, None
+        :return: GLSL code
+        :rtype: basestring
+        """
+        return std140_glsl(self._name, self._fields, instance)
+
+    def get(self, name):
+        """
+        Return a field, with std140 padding.
+
+        :param name: Field name
+        :type name: basestring
+        :return: Field view
+        :rtype: numpy.ndarray
+        """
+        return self._data[name][0]
+
+    def set(self, name, value):
+        """
+        Write a field.
+
+        :param name: Field name
+        :param value: Value, matrices with (rows, columns) shape or Matrix4 are row-major
+        :type name: basestring
+        :type value: object
+        """
+        if name not in self._types:
+            raise Exception('Block {0} has no field {1}'.format(self._name, name))
+        if _np.ndim(self._data[name][0]) == 0:
+            self._data[name][0] = value
+        else:
+            _assign(self._data[name][0], value, self._types[name])
+        self._dirty = True
+
+    def set_dirty(self):
+        """
+        Mark the block to be uploaded.
+        """
+        self._dirty = True
+
+    def is_dirty(self):
+        """
+        Return true if the block has changed since the last upload.
+
+        :return: Boolean
+        :rtype: bool
+        """
+        return self._dirty
+
+    def upload(self):
+        """
+        Upload the block if it has changed, the buffer is created on the first call.
+
+        :return: True if the block was uploaded
+        :rtype: bool
+        """
+        if self._buffer is None:
+            self._buffer = int(_np.ravel(_gl.glGenBuffers(1))[0])
+            _gl.glBindBuffer(_gl.GL_UNIFORM_BUFFER, self._buffer)
+            _gl.glBufferData(_gl.GL_UNIFORM_BUFFER, self._data.nbytes, self._data, _gl.GL_DYNAMIC_DRAW)
+            _gl.glBindBuffer(_gl.GL_UNIFORM_BUFFER, 0)
+            self.use()
+        elif self._dirty:
+            _gl.glBindBuffer(_gl.GL_UNIFORM_BUFFER, self._buffer)
+            _gl.glBufferSubData(_gl.GL_UNIFORM_BUFFER, 0, self._data.nbytes, self._data)
+            _gl.glBindBuffer(_gl.GL_UNIFORM_BUFFER, 0)
+        else:
+            return False
+        self._dirty = False
+        return True
+
+    def use(self):
+        """
+        Attach the buffer to its binding point, buffers that share a binding point (e.g.
+        materials) are switched with this.
+        """
+        if self._buffer is None:
+            self.upload()
+        else:
+            _gl.glBindBufferBase(_gl.GL_UNIFORM_BUFFER, self._binding, self._buffer)
+
+    def bind(self, program):
+        """
+        Connect the block of a program to the binding point.
+
+        :param program: Shader program or program object
+        :type program: PyOpenGLtoolbox.shader.ShaderProgram, int
+        :return: False if the program does not use the block
+        :rtype: bool
+        """
+        if hasattr(program, 'get_compiled'):
+            program = program.get_compiled()
+        index = _gl.glGetUniformBlockIndex(program, self._name)
+        if index == _UNIFORMS_INVALID_INDEX:
+            return False
+        _gl.glUniformBlockBinding(program, index, self._binding)
+        return True
+
+    def delete(self):
+        """
+        Delete the buffer.
+        """
+        if self._buffer is not None:
+            _gl.glDeleteBuffers(1, [self._buffer])
+            self._buffer = None
+            self._dirty = True
+
+
+class CameraBuffer(UniformBuffer):
+    """
+    Per-frame camera block: view, projection and view_projection matrices and the camera
+    position. It is only written when the camera or projection version changes.
+    """
+
+    def __init__(self, name='Camera', binding=0):
+        """
+        Constructor.
+
+        :param name: Block name in GLSL
+        :param binding: Binding point
+        :type name: basestring
+        :type binding: int
+        """
+        UniformBuffer.__init__(self, name, _UNIFORMS_CAMERA_FIELDS, binding)
+        self._versions = None
+
+    def update(self, camera, projection=None):
+        """
+        Write the camera and projection matrices and upload the block if they have changed.
+
+        :param camera: Camera
+        :param projection: Projection, None uses the camera projection
+        :type camera: PyOpenGLtoolbox.camera._Camera
+        :type projection: PyOpenGLtoolbox.opengl.Projection, None
+        :return: True if the block was uploaded
+        :rtype: bool
+        """
+        if projection is None:
+            projection = camera.get_projection()
+            if projection is None:
+                raise Exception('Camera has no projection, use set_projection')
+        versions = (id(camera), camera.get_version(), id(projection), projection.get_version())
+        if versions != self._versions:
+            view = camera.get_view_matrix()
+            proj = projection.get_projection_matrix()
+            self.set('view', view)
+            self.set('projection', proj)
+            self.set('view_projection', _np.dot(proj, view))
+            self.set('position', list(camera.convert_to_xyz())[0:3] + [1.0])
+            self._versions = versions
+        return self.upload()
+
+
+class LightBuffer(UniformBuffer):
+    """
+    Lights block, an array of lights with the parameters of init_light and the number of
+    lights in use.
+    """
+
+    def __init__(self, name='Lights', binding=1, max_lights=_UNIFORMS_MAX_LIGHTS):
+        """
+        Constructor.
+
+        :param name: Block name in GLSL
+        :param binding: Binding point
+        :param max_lights: Size of the lights array
+        :type name: basestring
+        :type binding: int
+        :type max_lights: int
+        """
+        UniformBuffer.__init__(self, name, [('count', 'int'), ('lights', ('Light', _UNIFORMS_LIGHT_FIELDS),
+                                                                          max_lights)], binding)
+        self._max_lights = max_lights
+
+    def set_light(self, index, position=None, ambient=None, constant_att=_OPENGL_DEFAULT_CONSTANT_ATTENUATION,
+                  diffuse=None, linear_att=_OPENGL_DEFAULT_LINEAR_ATTENUATION,
+                  quad_att=_OPENGL_DEFAULT_QUADRATIC_ATTENUATION, specular=None,
+                  spot_cutoff=_OPENGL_DEFAULT_SPOT_CUTOFF, spot_direction=None,
+                  spot_exponent=_OPENGL_DEFAULT_SPOT_EXPONENT):
+        """
+        Set a light, parameters and defaults are the same as init_light. The number of
+        lights grows to include it.
+
+        :param index: Light index
+        :param position: Light position, w=0 for directional lights
+        :param ambient: Ambient color
+        :param constant_att: Constant attenuation
+        :param diffuse: Diffuse color
+        :param linear_att: Linear attenuation
+        :param quad_att: Quadratic attenuation
+        :param specular: Specular color
+        :param spot_cutoff: Spot cutoff value
+        :param spot_direction: Spot direction value
+        :param spot_exponent: Spot exponent value
+        :type index: int
+        :type position: list, None
+        :type ambient: list, None
+        :type constant_att: float, int
+        :type diffuse: list, None
+        :type linear_att: float, int
+        :type quad_att: float, int
+        :type specular: list, None
+        :type spot_cutoff: float, int
+        :type spot_direction: list, None
+        :type spot_exponent: float, int
+        """
+        if not 0 <= index < self._max_lights:
+            raise Exception('Light index must be between 0 and {0}'.format(self._max_lights - 1))
+        light = self.get('lights')[index]
+        light['position'] = position if position is not None else _UNIFORMS_DEFAULT_LIGHT_POSITION
+        light['ambient'] = ambient if ambient is not None else _OPENGL_DEFAULT_AMBIENT_COLOR
+        light['diffuse'] = diffuse if diffuse is not None else _OPENGL_DEFAULT_DIFFUSE_COLOR
+        light['specular'] = specular if specular is not None else _OPENGL_DEFAULT_SPECULAR_COLOR
+        light['spot_direction'] = spot_direction if spot_direction is not None else _OPENGL_DEFAULT_SPOT_DIRECTION
+        light['spot_cutoff'] = spot_cutoff
+        light['spot_exponent'] = spot_exponent
+        light['constant_att'] = constant_att
+        light['linear_att'] = linear_att
+        light['quad_att'] = quad_att
+        self.set('count', max(int(self.get('count')), index + 1))
+
+    def set_position(self, index, position):
+        """
+        Move a light.
+
+        :param index: Light index
+        :param position: Light position, w=0 for directional lights
+        :type index: int
+        :type position: list, tuple
+        """
+        self.get('lights')[index]['position'] = position
+        self.set_dirty()
+
+    def set_count(self, count):
+        """
+        Set the number of lights in use.
+
+        :param count: Number of lights
+        :type count: int
+        """
+        self.set('count', count)
+
+
+class MaterialBuffer(UniformBuffer):
+    """
+    Material block of a preset from the materials module. Materials share a binding
+    point, the block is uploaded once and selected with use.
+    """
+
+    def __init__(self, material, emission=None, name='Material', binding=2):
+        """
+        Constructor.
+
+        :param material: Material function (e.g. material_gold) or preset name
+        :param emission: Material emission constant
+        :param name: Block name in GLSL
+        :param binding: Binding point
+        :type material: callable, basestring
+        :type emission: list, None
+        :type name: basestring
+        :type binding: int
+        """
+        UniformBuffer.__init__(self, name, _UNIFORMS_MATERIAL_FIELDS, binding)
+        for key, value in get_material(material, emission).items():
+            self.set(key, value)
+
+
+def bind_uniform_buffers(program, buffers):
+    """
+    Connect the blocks of a program to the binding points of the buffers.
+
+    :param program: Shader program or program object
+    :param buffers: Uniform buffers
+    :type program: PyOpenGLtoolbox.shader.ShaderProgram, int
+    :type buffers: list
+    :return: Number of blocks used by the program
+    :rtype: int
+    """
+    return sum(1 for b in buffers if b.bind(program))
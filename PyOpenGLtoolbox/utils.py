@@ -29,6 +29,11 @@ SOFTWARE.
 from __future__ import print_function
 from PyOpenGLtoolbox.geometry import draw_vertex_list
 from PyOpenGLtoolbox.mathlib import Point3
+import hashlib as _hashlib
+import json as _json
+import numpy as _np
+import os as _os
+import struct as _struct
 import sys as _sys
 
 # noinspection PyPep8Naming
@@ -41,6 +46,8 @@ import OpenGL.GLUT as _glut
 _UTILS_COLOR_BLACK = [0, 0, 0]
 _UTILS_COLOR_WHITE = [1, 1, 1]
 _UTILS_ERRS = [False]
+_UTILS_ARRAYS_ALIGN = 64
+_UTILS_ARRAYS_MAGIC = b'PYGLTBX1'
 
 
 def print_gl_error(err_msg):
@@ -168,3 +175,103 @@ def get_rgb_normalized(r, g, b, a=1.0):
     if r <= 1 and g <= 1 and b <= 1:
         return r, g, b, a
     return r / 255.0, g / 255.0, b / 255.0, a
+
+
+def _get_cache_path(cache_dir, source, params, ext):
+    """
+    Return the cache file of a source file. The file name is keyed by the source path,
+    modification time and size, and the parameters used to process it, so any change
+    creates a new entry.
+
+    :param cache_dir: Cache folder
+    :param source: Source file
+    :param params: Processing parameters
+    :param ext: Cache file extension
+    :type cache_dir: basestring
+    :type source: basestring
+    :type params: dict
+    :type ext: basestring
+    :return: Cache file path
+    :rtype: basestring
+    """
+    stat = _os.stat(source)
+    key = _json.dumps([_os.path.abspath(source), stat.st_mtime, stat.st_size, params], sort_keys=True)
+    digest = _hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return _os.path.join(cache_dir, '{0}.{1}{2}'.format(_os.path.basename(source), digest, ext))
+
+
+def _save_arrays(path, arrays, meta=None):
+    """
+    Save arrays to a binary file: a magic string, a JSON header describing each array
+    and the raw buffers aligned to 64 bytes, so they can be memory-mapped by _load_arrays.
+    The file is written to a temporal file and then renamed.
+
+    :param path: File path
+    :param arrays: Arrays by name
+    :param meta: Extra JSON-serializable data
+    :type path: basestring
+    :type arrays: dict
+    :type meta: dict, None
+    """
+    names = sorted(arrays.keys())
+    arrays = [_np.ascontiguousarray(arrays[name]) for name in names]
+
+    # The header size depends on the offsets, offsets are computed from a padded header size
+    header = {'arrays': [], 'meta': meta}
+    offset = 0
+    for name, array in zip(names, arrays):
+        header['arrays'].append({'name': name, 'dtype': array.dtype.str, 'shape': array.shape, 'offset': offset})
+        offset += -(-array.nbytes // _UTILS_ARRAYS_ALIGN) * _UTILS_ARRAYS_ALIGN
+    start = len(_UTILS_ARRAYS_MAGIC) + 4 + len(_json.dumps(header)) + 16 * len(names)
+    start = -(-start // _UTILS_ARRAYS_ALIGN) * _UTILS_ARRAYS_ALIGN
+    for desc in header['arrays']:
+        desc['offset'] += start
+    data = _json.dumps(header).encode('utf-8')
+    data += b' ' * (start - len(_UTILS_ARRAYS_MAGIC) - 4 - len(data))
+
+    folder = _os.path.dirname(path)
+    if folder and not _os.path.isdir(folder):
+        _os.makedirs(folder)
+    tmp = '{0}.{1}.tmp'.format(path, _os.getpid())
+    with open(tmp, 'wb') as f:
+        f.write(_UTILS_ARRAYS_MAGIC)
+        f.write(_struct.pack('<I', len(data)))
+        f.write(data)
+        for desc, array in zip(header['arrays'], arrays):
+            f.seek(desc['offset'])
+            f.write(array.tobytes())
+    if hasattr(_os, 'replace'):
+        _os.replace(tmp, path)
+    else:
+        if _os.path.isfile(path):
+            _os.remove(path)
+        _os.rename(tmp, path)
+
+
+def _load_arrays(path, mmap=True):
+    """
+    Load arrays saved with _save_arrays.
+
+    :param path: File path
+    :param mmap: Memory-map (copy-on-write) the arrays instead of reading them
+    :type path: basestring
+    :type mmap: bool
+    :return: Arrays by name and meta data
+    :rtype: tuple
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(_UTILS_ARRAYS_MAGIC)) != _UTILS_ARRAYS_MAGIC:
+            raise Exception('File {0} is not a valid array file'.format(path))
+        size = _struct.unpack('<I', f.read(4))[0]
+        header = _json.loads(f.read(size).decode('utf-8'))
+        arrays = {}
+        for desc in header['arrays']:
+            dtype = _np.dtype(desc['dtype'])
+            shape = tuple(desc['shape'])
+            if mmap and dtype.itemsize * int(_np.prod(shape)) > 0:
+                arrays[desc['name']] = _np.memmap(path, dtype=dtype, mode='c', offset=desc['offset'], shape=shape)
+            else:
+                f.seek(desc['offset'])
+                arrays[desc['name']] = _np.frombuffer(f.read(dtype.itemsize * int(_np.prod(shape))),
+                                                      dtype=dtype).reshape(shape)
+    return arrays, header['meta']
@@ -0,0 +1,369 @@
+# coding=utf-8
+"""
+Benchmark mathlib
+Measure operations per second of the hot Vector3, Point3 and Point2 operators, using
+the previous implementation (Point3 wrapping a Vector3, operators through the get_*
+methods) and the current slotted classes.
+
+MIT License
+Copyright (c) 2018 Pablo Pizarro R.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Library imports
+from __future__ import print_function
+from PyOpenGLtoolbox.mathlib import Point2, Point3, Vector3
+import contextlib
+import math
+import os
+import sys
+import timeit
+
+# Constants
+NUMBER = 200000
+REPEAT = 5
+
+# Operations to measure, a and b are instances of the given class
+OPERATIONS = [
+    ('Vector3()', 'Vector3(1.0, 2.0, 3.0)', 'Vector3'),
+    ('Vector3.get_x', 'a.get_x()', 'Vector3'),
+    ('Vector3.set_x', 'a.set_x(1.0)', 'Vector3'),
+    ('Vector3 + Vector3', 'a + b', 'Vector3'),
+    ('Vector3 * float', 'a * 1.0', 'Vector3'),
+    ('Vector3 += Vector3', 'a += b', 'Vector3'),
+    ('Vector3 *= float', 'a *= 1.0', 'Vector3'),
+    ('Vector3.get_module', 'a.get_module()', 'Vector3'),
+    ('Point3()', 'Point3(1.0, 2.0, 3.0)', 'Point3'),
+    ('Point3.get_x', 'a.get_x()', 'Point3'),
+    ('Point3.set_x', 'a.set_x(1.0)', 'Point3'),
+    ('Point3 + Point3', 'a + b', 'Point3'),
+    ('Point3 * float', 'a * 1.0', 'Point3'),
+    ('Point3 += Point3', 'a += b', 'Point3'),
+    ('Point3 *= float', 'a *= 1.0', 'Point3'),
+    ('Point2 + Point2', 'a + b', 'Point2'),
+    ('Point2 += Point2', 'a += b', 'Point2'),
+]
+
+
+class BaselineVector3(object):
+    """
+    Previous Vector3, only the measured methods.
+    """
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        """
+        Constructor.
+        """
+        self.x = x
+        self.y = y
+        self.z = z
+
+    def get_module(self):
+        """
+        Returns vector module.
+        """
+        return self.distance_with(BaselineVector3(0, 0, 0))
+
+    def set_x(self, x):
+        """
+        Set x-coordinate.
+        """
+        self.x = x
+
+    def get_x(self):
+        """
+        Get x-coordinate.
+        """
+        return self.x
+
+    def get_y(self):
+        """
+        Get y-coordinate.
+        """
+        return self.y
+
+    def get_z(self):
+        """
+        Get z-coordinate.
+        """
+        return self.z
+
+    def __add__(self, other):
+        """
+        Adds with another.
+        """
+        if isinstance(other, BaselineVector3):
+            return BaselineVector3(self.x + other.get_x(), self.y + other.get_y(),
+                                   self.z + other.get_z())
+        elif type(other) is tuple or type(other) is list:
+            if len(other) == 3:
+                return BaselineVector3(self.x + other[0], self.y + other[1],
+                                       self.z + other[2])
+        else:
+            self.throw_error(2, '__add__')
+            return self
+
+    def __mul__(self, other):
+        """
+        Multiply with another.
+        """
+        if isinstance(other, BaselineVector3):
+            return BaselineVector3(self.x * other.get_x(), self.y * other.get_y(),
+                                   self.z * other.get_z())
+        else:
+            if type(other) is list or type(other) is tuple:
+                return BaselineVector3(self.x * other[0], self.y * other[1],
+                                       self.z * other[2])
+            elif type(other) is int or type(other) is float:
+                return BaselineVector3(self.x * other, self.y * other, self.z * other)
+            else:
+                self.throw_error(2, '__mul__')
+                return self
+
+    def __iadd__(self, other):
+        """
+        Add with another.
+        """
+        if isinstance(other, BaselineVector3):
+            self.x += other.get_x()
+            self.y += other.get_y()
+            self.z += other.get_z()
+            return self
+        elif type(other) is tuple or type(other) is list:
+            if len(other) == 3:
+                self.x += other[0]
+                self.y += other[1]
+                self.z += other[2]
+                return self
+        else:
+            self.throw_error(2, '__iadd__')
+            return self
+
+    def __imul__(self, other):
+        """
+        Multiplication with another.
+        """
+        if isinstance(other, BaselineVector3):
+            self.x *= other.get_x()
+            self.y *= other.get_y()
+            self.z *= other.get_z()
+            return self
+        else:
+            if type(other) is list or type(other) is tuple:
+                self.x *= other[0]
+                self.y *= other[1]
+                self.z *= other[2]
+                return self
+            elif type(other) is int or type(other) is float:
+                self.x *= other
+                self.y *= other
+                self.z *= other
+                return self
+            else:
+                self.throw_error(2, '__imul__')
+                return self
+
+    @staticmethod
+    def throw_error(err_num, err_func):
+        """
+        Print error to console.
+        """
+        def _print_error(error):
+            print('{0} ~ {1}'.format(error, err_func), file=sys.stderr)
+
+        if err_num == 1:
+            _print_error('Mantise less than 1')
+        elif err_num == 2:
+            _print_error('Invalid type')
+
+    def distance_with(self, other):
+        """
+        Return distance from another vector.
+        """
+        if isinstance(other, BaselineVector3):
+            return math.sqrt(
+                (self.x - other.get_x()) ** 2 + (self.y - other.get_y()) ** 2 + (self.z - other.get_y()) ** 2)
+        elif type(other) is list or type(other) is tuple:
+            return self.distance_with(BaselineVector3(*other))
+        else:
+            self.throw_error(2, 'distance')
+            return 0.0
+
+
+class BaselinePoint3(object):
+    """
+    Previous Point3, only the measured methods.
+    """
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        """
+        Constructor.
+        """
+        self._point = BaselineVector3(x, y, z)
+        self._type = 'util-point-3'
+
+    def get_x(self):
+        """
+        Get x-coordinate.
+        """
+        return self._point.get_x()
+
+    def get_y(self):
+        """
+        Get y-coordinate.
+        """
+        return self._point.get_y()
+
+    def get_z(self):
+        """
+        Get z-coordinate.
+        """
+        return self._point.get_z()
+
+    def set_x(self, value):
+        """
+        Set x-coordinate.
+        """
+        self._point.set_x(value)
+
+    def __add__(self, other):
+        """
+        Adds with another.
+        """
+        return self._vec_to_point(self._point.__add__(self._point_to_vec(other)))
+
+    def __mul__(self, other):
+        """
+        Multiply with another.
+        """
+        return self._vec_to_point(self._point.__mul__(self._point_to_vec(other)))
+
+    # noinspection PyMethodFirstArgAssignment
+    def __iadd__(self, other):
+        """
+        Add with another.
+        """
+        self = self._vec_to_point(self._point.__iadd__(other))
+        return self
+
+    # noinspection PyMethodFirstArgAssignment
+    def __imul__(self, other):
+        """
+        Multiplication with another.
+        """
+        self = self._vec_to_point(self._point.__imul__(other))
+        return self
+
+    @staticmethod
+    def _point_to_vec(point):
+        """
+        Converts a point to a vector.
+        """
+        if isinstance(point, BaselinePoint3):
+            return BaselineVector3(point.get_x(), point.get_y(), point.get_z())
+        else:
+            return point
+
+    @staticmethod
+    def _vec_to_point(vec):
+        """
+        Converts a vector to point.
+        """
+        if isinstance(vec, BaselineVector3):
+            return BaselinePoint3(vec.get_x(), vec.get_y(), vec.get_z())
+        else:
+            return vec
+
+
+class BaselinePoint2(BaselinePoint3):
+    """
+    Previous Point2, only the measured methods.
+    """
+
+    def __init__(self, x=0.0, y=0.0):
+        """
+        Constructor.
+        """
+        BaselinePoint3.__init__(self, x, y)
+        self._point = BaselineVector3(x, y)
+        self._type = 'util-point-2'
+
+    @staticmethod
+    def _point_to_vec(point):
+        """
+        Converts a point to a vector.
+        """
+        if isinstance(point, BaselinePoint2):
+            return BaselineVector3(point.get_x(), point.get_y())
+        else:
+            return point
+
+    @staticmethod
+    def _vec_to_point(vec):
+        """
+        Converts a vector to point.
+        """
+        if isinstance(vec, BaselineVector3):
+            return BaselinePoint2(vec.get_x(), vec.get_y())
+        else:
+            return vec
+
+
+def measure(stmt, classes, cls, number, repeat):
+    """
+    Return the operations per second of a statement. The previous in-place Point
+    operators print an invalid type error on every call, stderr is discarded.
+
+    :param stmt: Statement
+    :param classes: Classes used by the statement, name: class
+    :param cls: Class of a and b
+    :param number: Number of executions per measure
+    :param repeat: Number of measures, the best one is kept
+    :return: Operations per second
+    :rtype: float
+    """
+    env = dict(classes)
+    env['cls'] = classes[cls]
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+        best = min(timeit.repeat(stmt, setup='a = cls(1.0, 2.0); b = cls(0.0, 0.0)', globals=env,
+                                 number=number, repeat=repeat))
+    return number / best
+
+
+def run_benchmark(number=NUMBER, repeat=REPEAT):
+    """
+    Run the benchmark and print operations per second before and after.
+
+    :param number: Number of executions per measure
+    :param repeat: Number of measures, the best one is kept
+    :type number: int
+    :type repeat: int
+    """
+    before = {'Point2': BaselinePoint2, 'Point3': BaselinePoint3, 'Vector3': BaselineVector3}
+    after = {'Point2': Point2, 'Point3': Point3, 'Vector3': Vector3}
+    print('{0:<24}{1:>16}{2:>16}{3:>10}'.format('Operation', 'before ops/sec', 'after ops/sec', 'speedup'))
+    for name, stmt, cls in OPERATIONS:
+        old = measure(stmt, before, cls, number, repeat)
+        new = measure(stmt, after, cls, number, repeat)
+        print('{0:<24}{1:>16,.0f}{2:>16,.0f}{3:>9.2f}x'.format(name, old, new, new / old))
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,93 @@
+# coding=utf-8
+"""
+Benchmark OBJ
+Measure the time and peak memory of load_obj_model on a large OBJ file whose vertices
+come in a single block, and check that the peak memory stays proportional to the
+output arrays and not to the file text.
+
+MIT License
+Copyright (c) 2018 Pablo Pizarro R.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Library imports
+from __future__ import print_function
+from PyOpenGLtoolbox.figures import load_obj_model
+import numpy as np
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Constants
+CHUNK_SIZE = 65536
+MAX_PEAK_RATIO = 3.0  # Peak memory allowed, relative to the size of the output arrays
+VERTEX_COUNT = 1000000
+
+
+def write_obj(obj_file, n=VERTEX_COUNT):
+    """
+    Write an OBJ file with a single block of n vertex and a triangle fan.
+
+    :param obj_file: OBJ file
+    :param n: Number of vertex
+    :type obj_file: basestring
+    :type n: int
+    """
+    vertex = np.random.random((n, 3))
+    with open(obj_file, 'w') as f:
+        np.savetxt(f, vertex, fmt='v %.6f %.6f %.6f')
+        faces = np.arange(1, n - 1)
+        np.savetxt(f, np.stack((np.ones_like(faces), faces + 1, faces + 2), axis=1), fmt='f %d %d %d')
+
+
+def run_benchmark(obj_file, chunk_size=CHUNK_SIZE):
+    """
+    Run the benchmark, print the results and check the peak memory.
+
+    :param obj_file: OBJ file
+    :param chunk_size: Read chunk size (bytes)
+    :type obj_file: basestring
+    :type chunk_size: int
+    """
+    tracemalloc.start()
+    t0 = time.time()
+    model = load_obj_model(obj_file, chunk_size=chunk_size)
+    t = time.time() - t0
+    peak = tracemalloc.get_traced_memory()[1] / 1048576.0
+    tracemalloc.stop()
+    output = sum(a.nbytes for a in model) / 1048576.0
+    print('File: {0} {1:.1f} MB'.format(obj_file, os.path.getsize(obj_file) / 1048576.0))
+    print('{0:<16}{1:>12}'.format('Time (s)', '{0:.3f}'.format(t)))
+    print('{0:<16}{1:>12}'.format('Output (MB)', '{0:.1f}'.format(output)))
+    print('{0:<16}{1:>12}'.format('Peak mem (MB)', '{0:.1f}'.format(peak)))
+    if peak > MAX_PEAK_RATIO * output:
+        raise Exception('Peak memory is not bounded by the output arrays')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run_benchmark(sys.argv[1])
+    else:
+        path = os.path.join(tempfile.mkdtemp(), 'benchmark.obj')
+        write_obj(path)
+        run_benchmark(path)
+        os.remove(path)
@@ -0,0 +1,92 @@
+# coding=utf-8
+"""
+Benchmark particles
+Measure particle updates per second of Particle objects against a ParticleSystem.
+
+MIT License
+Copyright (c) 2018 Pablo Pizarro R.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Library imports
+from __future__ import print_function
+from PyOpenGLtoolbox.particles import Particle, ParticleSystem
+import numpy as np
+import time
+
+# Constants
+FRAMES = 30
+SIZES = (1000, 10000, 100000)
+
+
+def measure(name, update, particles, frames):
+    """
+    Measure and print particle updates per second of a frame update function.
+
+    :param name: Method name
+    :param update: Function called each frame
+    :param particles: Number of particles
+    :param frames: Number of frames
+    :type name: str
+    :type update: callable
+    :type particles: int
+    :type frames: int
+    """
+    t0 = time.time()
+    for _ in range(frames):
+        update()
+    t = time.time() - t0
+    print('{0:<16}{1:>10}{2:>16,.0f}{3:>12.1f}'.format(name, particles, particles * frames / t, frames / t))
+
+
+def run_benchmark(sizes=SIZES, frames=FRAMES):
+    """
+    Run the benchmark, particles move and rotate in all axes.
+
+    :param sizes: Number of particles
+    :param frames: Number of frames
+    :type sizes: tuple
+    :type frames: int
+    """
+    print('{0:<16}{1:>10}{2:>16}{3:>12}'.format('Method', 'Particles', 'Updates/s', 'FPS'))
+    for n in sizes:
+        position = np.random.uniform(-1, 1, (n, 3))
+        velocity = np.random.uniform(-1, 1, (n, 3))
+        if n <= 10000:
+            particles = []
+            for i in range(n):
+                p = Particle(*position[i])
+                p.set_vel(*velocity[i])
+                p.set_ang_vel(1.0, 2.0, 3.0)
+                p.start()
+                particles.append(p)
+
+            def update_objects():
+                for q in particles:
+                    q.update()
+
+            measure('Particle', update_objects, n, max(1, frames // 10))
+        system = ParticleSystem(n)
+        system.emit(n, position=position, velocity=velocity, ang_velocity=(1.0, 2.0, 3.0))
+        measure('ParticleSystem', system.update, n, frames)
+
+
+if __name__ == '__main__':
+    run_benchmark()
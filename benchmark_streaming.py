@@ -0,0 +1,184 @@
+# coding=utf-8
+"""
+Benchmark streaming
+Measure the throughput (MB/s) of replacing texture pixels every frame, creating a new
+texture per frame against a StreamingTexture updated through pixel buffer objects.
+
+Run with --mock to use a mock OpenGL module that only performs the memory copies a
+driver would do; otherwise a pygame OpenGL window is created. Software rendering can
+be forced with the LIBGL_ALWAYS_SOFTWARE=1 environment variable (Mesa).
+
+MIT License
+Copyright (c) 2018 Pablo Pizarro R.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Library imports
+from __future__ import print_function
+import PyOpenGLtoolbox.textures as textures
+import numpy as np
+import OpenGL.GL as gl
+import sys
+import time
+
+# Constants
+FRAMES = 120
+FRAME_SIZE = (1280, 720)
+
+
+class MockGL(object):
+    """
+    OpenGL module replacement, stores textures and buffers in numpy arrays so every call
+    costs the memory copy a driver would do.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self._bound = 0
+        self._buffers = {}
+        self._next = 0
+        self._textures = {}
+
+    def __getattr__(self, name):
+        """
+        Return OpenGL constants, and a no-op for the functions that are not mocked.
+
+        :param name: Attribute name
+        :type name: str
+        """
+        value = getattr(gl, name)
+        if callable(value) and name.startswith('gl'):
+            return lambda *args: None
+        return value
+
+    def _new_id(self):
+        """
+        Return a new object id.
+        """
+        self._next += 1
+        return self._next
+
+    def glGenTextures(self, n):
+        """
+        Return a new texture id.
+        """
+        return self._new_id()
+
+    def glGenBuffers(self, n):
+        """
+        Return an array of new buffer ids.
+        """
+        return np.array([self._new_id() for _ in range(n)])
+
+    def glBindBuffer(self, target, buffer):
+        """
+        Bind a buffer.
+        """
+        self._bound = buffer
+
+    def glBufferData(self, target, size, data, usage):
+        """
+        Allocate the bound buffer.
+        """
+        self._buffers[self._bound] = np.empty(size, dtype=np.uint8)
+
+    def glBufferSubData(self, target, offset, size, data):
+        """
+        Copy data into the bound buffer.
+        """
+        self._buffers[self._bound][offset:offset + size] = data.reshape(-1).view(np.uint8)
+
+    def glTexImage2D(self, target, level, internal, w, h, border, fmt, dtype, data):
+        """
+        Allocate a texture level with a copy of the data.
+        """
+        self._textures[level] = np.array(data)
+
+    def glTexSubImage2D(self, target, level, x, y, w, h, fmt, dtype, data):
+        """
+        Copy data, or the bound buffer, into a texture level.
+        """
+        texture = self._textures[level]
+        if not isinstance(data, np.ndarray):
+            data = self._buffers[self._bound][0:texture.nbytes].view(texture.dtype).reshape(texture.shape)
+        texture[y:y + h, x:x + w] = data
+
+    def glDeleteTextures(self, textures_list):
+        """
+        Delete the textures.
+        """
+        self._textures.clear()
+
+
+def measure(name, update, frames):
+    """
+    Measure and print the throughput of a frame update function.
+
+    :param name: Method name
+    :param update: Function called with each frame
+    :param frames: List of frames
+    :type name: str
+    :type update: callable
+    :type frames: list
+    """
+    t0 = time.time()
+    for frame in frames:
+        update(frame)
+    textures._gl.glFinish()
+    t = time.time() - t0
+    size = sum(f.nbytes for f in frames) / 1048576.0
+    print('{0:<24}{1:>12.1f}{2:>12.1f}'.format(name, size / t, len(frames) / t))
+
+
+def run_benchmark(frames=FRAMES, size=FRAME_SIZE):
+    """
+    Run the benchmark in the current context.
+
+    :param frames: Number of frames
+    :param size: Frame size
+    :type frames: int
+    :type size: tuple
+    """
+    images = [np.random.randint(0, 255, (size[1], size[0], 3)).astype(np.uint8) for _ in range(4)]
+    images = [images[i % len(images)] for i in range(frames)]
+    print('Frames: {0} of {1}x{2} RGB'.format(frames, size[0], size[1]))
+    print('{0:<24}{1:>12}{2:>12}'.format('Method', 'MB/s', 'FPS'))
+
+    def new_texture(frame):
+        textures._gl.glDeleteTextures([textures._upload_texture(frame)])
+
+    measure('glTexImage2D', new_texture, images)
+    for buffers in (2, 3):
+        tex = textures.StreamingTexture(size[0], size[1], buffers=buffers)
+        measure('PBO x{0}'.format(buffers) if tex.is_buffered() else 'glTexSubImage2D', tex.update, images)
+        tex.delete()
+
+
+if __name__ == '__main__':
+    if '--mock' in sys.argv:
+        textures._gl = MockGL()
+    else:
+        from PyOpenGLtoolbox.pyopengl import init_pygame
+
+        init_pygame(320, 240, 'Benchmark streaming')
+        print('Renderer: {0}'.format(gl.glGetString(gl.GL_RENDERER)))
+    run_benchmark()
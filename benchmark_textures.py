@@ -0,0 +1,107 @@
+# coding=utf-8
+"""
+Benchmark textures
+Compare the time and peak memory used to read the pixels of an image before uploading
+it as a texture, using the old per-pixel list conversion and the zero-copy path.
+
+MIT License
+Copyright (c) 2018 Pablo Pizarro R.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# Library imports
+from __future__ import print_function
+from PIL import Image
+from PyOpenGLtoolbox.textures import _get_image_data
+import numpy as np
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Constants
+IMAGE_SIZE = 2048
+
+
+def read_list(image_file):
+    """
+    Previous implementation, builds a list of per-pixel tuples. It used int8, which
+    recent numpy versions reject for values above 127, so uint8 is used instead.
+
+    :param image_file: Image file
+    :return: Pixel array
+    """
+    img = Image.open(image_file)
+    return np.array(list(img.getdata()), np.uint8)
+
+
+def read_array(image_file):
+    """
+    Zero-copy implementation used by load_texture.
+
+    :param image_file: Image file
+    :return: Pixel array
+    """
+    return _get_image_data(Image.open(image_file))
+
+
+def measure(func, image_file):
+    """
+    Return the time and peak memory of a function.
+
+    :param func: Function
+    :param image_file: Image file
+    :return: (seconds, peak MB)
+    :rtype: tuple
+    """
+    tracemalloc.start()
+    t0 = time.time()
+    func(image_file)
+    t = time.time() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return t, peak / 1048576.0
+
+
+def run_benchmark(image_file):
+    """
+    Run the benchmark and print the results.
+
+    :param image_file: Image file
+    :type image_file: basestring
+    """
+    img = Image.open(image_file)
+    print('Image: {0} {1}x{2} {3}'.format(image_file, img.size[0], img.size[1], img.mode))
+    print('{0:<12}{1:>12}{2:>16}'.format('Method', 'Time (s)', 'Peak mem (MB)'))
+    for name, func in (('list', read_list), ('array', read_array)):
+        t, peak = measure(func, image_file)
+        print('{0:<12}{1:>12.3f}{2:>16.1f}'.format(name, t, peak))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        run_benchmark(sys.argv[1])
+    else:
+        path = os.path.join(tempfile.mkdtemp(), 'benchmark.png')
+        pixels = np.random.randint(0, 255, (IMAGE_SIZE, IMAGE_SIZE, 3)).astype(np.uint8)
+        Image.fromarray(pixels).save(path)
+        run_benchmark(path)
+        os.remove(path)
@@ -40,7 +40,8 @@ WINDOW_SIZE = [800, 600]
 # Init window
 init_pygame(WINDOW_SIZE[0], WINDOW_SIZE[1], 'Example 2')
 init_gl(materialcolor=False, lighting=True, numlights=1, perspectivecorr=True, textures=True)
-reshape_window_perspective(WINDOW_SIZE[0], WINDOW_SIZE[1], near=10, far=10000)
+projection = Projection(WINDOW_SIZE[0], WINDOW_SIZE[1], near=10, far=10000)
+projection.apply()
 init_light(GL_LIGHT0)
 clock = pygame.time.Clock()
 
@@ -41,7 +41,8 @@ WINDOW_SIZE = [800, 600]
 # Init window
 init_pygame(WINDOW_SIZE[0], WINDOW_SIZE[1], 'Example 3')
 init_gl(materialcolor=False, lighting=True, numlights=NUM_LIGHTS, perspectivecorr=True, textures=True)
-reshape_window_perspective(WINDOW_SIZE[0], WINDOW_SIZE[1], near=10, far=10000)
+projection = Projection(WINDOW_SIZE[0], WINDOW_SIZE[1], near=10, far=10000)
+projection.apply()
 init_light(GL_LIGHT0)
 init_light(GL_LIGHT1, ambient=[0.403, 0.0, 0.0, 1.0], diffuse=[0.556, 0.0, 0.0, 1.0],
            specular=[0.858, 0.0, 0.0, 1.0])
@@ -53,16 +54,17 @@ print('Rotate PHI angle with W/S keys')
 print('Rotate THETA angle with A/D keys')
 print('Decrease radial distance with N/M keys')
 
-# Load textures
-textures = [
-    load_texture('example_data/metal-texture.jpg'),
-    load_texture('example_data/metal-normal.jpg'),
-    load_texture('example_data/metal-bump.jpg')
-]
+# Load textures, images are decoded in parallel
+textures = get_texture_loader().wait(load_textures_async([
+    'example_data/metal-texture.jpg',
+    'example_data/metal-normal.jpg',
+    'example_data/metal-bump.jpg'
+]))
 
 # Creates shader
-program = load_shader('example_data/', 'normalMapShader', [NUM_LIGHTS], [3, NUM_LIGHTS])
+program = load_shader('example_data/', 'normalMapShader', defines={'NUM_LIGHTS': NUM_LIGHTS})
 program.set_name('NormalMap Shader')
+program.watch()  # Reload when the shader files are modified
 
 # Create objects
 axis = create_axes(AXES_LENGTH)  # Axis
@@ -91,6 +93,7 @@ while True:
 
     # Creatos counter, clears buffer
     clock.tick(FPS)
+    reload_shaders()
     clear_buffer()
     camera.place()
 
@@ -133,12 +136,11 @@ while True:
 
     # Draw model
     program.start()
-    program.uniformi('toggletexture', True)
-    program.uniformi('togglebump', True)
-    program.uniformi('toggleparallax', True)
+    program.set_uniform('toggletexture', True)
+    program.set_uniform('togglebump', True)
+    program.set_uniform('toggleparallax', True)
     cube.get_property('MATERIAL')()
-    for i in range(3):
-        program.uniformi('texture[{0}]'.format(i), i)
+    program.set_uniform('texture', [0, 1, 2])
     # noinspection PyArgumentEqualDefault
     draw_list(cube.get_property('GLLIST'), cube.get_position_list(), 0, None,
               cube.get_property('SIZE'), None)
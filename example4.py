@@ -36,7 +36,8 @@ WINDOW_SIZE = [800, 600]
 # Init window
 init_pygame(WINDOW_SIZE[0], WINDOW_SIZE[1], 'Example 1')
 init_gl(perspectivecorr=True, verbose=True, version=True, lighting=True, numlights=1)
-reshape_window_perspective(WINDOW_SIZE[0], WINDOW_SIZE[1], near=1, far=1000)
+projection = Projection(WINDOW_SIZE[0], WINDOW_SIZE[1], near=1, far=1000)
+projection.apply()
 clock = pygame.time.Clock()
 init_light(GL_LIGHT0)
 